@@ -89,6 +89,10 @@ func update_game_state(game_state: Dictionary) -> void:
 	
 	for bullet_new_state in bullets_new_states:
 		update_bullet_from_server(bullet_new_state)
+	
+	# Kalan süre artık game_state frame'i içinde geliyor
+	if game_state["data"].get("remaining_time") != null:
+		update_clock(game_state["data"]["remaining_time"])
 
 func update_players_from_server(game_data: Dictionary):
 	var server_position = Vector2(
@@ -225,11 +229,12 @@ func game_end(message: Dictionary):
 	
 func get_remaining_time(message: Dictionary):
 	var data = message.get("data")
-	var remaining_time = "%.2f" % data.get("remaining_time")
-	
-	$"/root/Main/Game/UI/Clock/ClockDigit".text = remaining_time
-	$"/root/Main/Game/UI/Clock".visible = true
+	update_clock(data.get("remaining_time"))
 	print(data)
+
+func update_clock(remaining: float):
+	$"/root/Main/Game/UI/Clock/ClockDigit".text = "%.2f" % remaining
+	$"/root/Main/Game/UI/Clock".visible = true
 	
 func reset_self():
 	player_id_to_index.clear()
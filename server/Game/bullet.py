@@ -1,6 +1,19 @@
 import math
+from collision_map import segment_circle_toi
 
 class Bullet:
+    """
+    Single bullet with a fixed slot layout and scalar float fields.
+
+    Game state keeps its bullets column-wise in a BulletPool; Bullet is the
+    per-object form of one row, used by the scalar reference paths and tools.
+    Protocol.serialize_bullet() turns it into the same wire format as a pool row.
+
+    Collisions are swept like in BulletPool: update() stops the bullet at the
+    earliest platform it touches along its path, and check_collision() tests
+    the whole path of the last update (px, py -> x, y).
+    """
+    __slots__ = ("id", "owner_id", "x", "y", "px", "py", "dx", "dy", "speed", "damage", "radius", "alive")
     bullet_counter = 0
 
     def __init__(self, owner_id, pos, dir_vec, speed=600, damage=10.0, radius=2.0):
@@ -8,55 +21,42 @@ class Bullet:
         Bullet.bullet_counter += 1
 
         self.owner_id = owner_id
-        self.pos = {"x": float(pos[0]), "y": float(pos[1])}
-        self.dir = self._normalize({"x": float(dir_vec[0]), "y": float(dir_vec[1])})
+        self.x = float(pos[0])
+        self.y = float(pos[1])
+        self.px = self.x
+        self.py = self.y
+        self.dx, self.dy = self._normalize(float(dir_vec[0]), float(dir_vec[1]))
         self.speed = float(speed)
         self.damage = float(damage)
         self.radius = float(radius)
         self.alive = True
 
-    def _normalize(self, v):
-        length = math.hypot(v["x"], v["y"])
+    @staticmethod
+    def _normalize(dx, dy):
+        length = math.hypot(dx, dy)
         if length == 0.0:
-            return {"x": 0.0, "y": 0.0}
-        return {"x": v["x"]/length, "y": v["y"]/length}
+            return 0.0, 0.0
+        return dx/length, dy/length
 
     def update(self, delta_time, map_platforms=None):
         if not self.alive:
             return
 
         # pozisyonu güncelle
-        self.pos["x"] += self.dir["x"] * self.speed * delta_time
-        self.pos["y"] += self.dir["y"] * self.speed * delta_time
-
-        # platform çarpışma kontrolü
-        if map_platforms:
-            if self.check_collision_platforms(map_platforms):
-                self.alive = False
+        step = self.speed * delta_time
+        move_x, move_y = self.dx * step, self.dy * step
+        self.px, self.py = self.x, self.y
+
+        # platform çarpışma kontrolü, yol boyunca
+        t = map_platforms.circle_time_of_impact(self.x, self.y, move_x, move_y, self.radius) if map_platforms else None
+        if t is not None:
+            move_x, move_y = move_x * t, move_y * t
+            self.alive = False
+        self.x += move_x
+        self.y += move_y
 
     def check_collision(self, player_pos, player_radius=20):
-        dx = self.pos["x"] - float(player_pos[0])
-        dy = self.pos["y"] - float(player_pos[1])
-        distance_sq = dx*dx + dy*dy
-        return distance_sq <= (self.radius + float(player_radius)) ** 2
-
-    def check_collision_platforms(self, platforms):
-        """Platformlardan herhangi birine çarptıysa True döner."""
-        for rect in platforms:
-            if self._circle_rect_collision(rect):
-                return True
-        return False
-
-    def _circle_rect_collision(self, rect):
-        """Çember (mermi) - dikdörtgen (platform) çarpışması"""
-        cx, cy, r = self.pos["x"], self.pos["y"], self.radius
-        rx, ry = rect["x"], rect["y"]
-        rw, rh = rect["width"], rect["height"]
-
-        # Çembere en yakın noktayı bul
-        closest_x = max(rx, min(cx, rx + rw))
-        closest_y = max(ry, min(cy, ry + rh))
-
-        dx = cx - closest_x
-        dy = cy - closest_y
-        return (dx*dx + dy*dy) <= r*r
+        """True if the bullet touched the player anywhere along its last move."""
+        return segment_circle_toi(self.px, self.py, self.x - self.px, self.y - self.py,
+                                  float(player_pos[0]), float(player_pos[1]),
+                                  self.radius + float(player_radius)) is not None
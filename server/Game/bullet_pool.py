@@ -0,0 +1,450 @@
+import math
+import numpy as np
+from collision_map import sweep_circle_toi
+
+
+class BulletPool:
+    """
+    Struct-of-arrays storage for all bullets of a single game.
+
+    Every bullet attribute lives in its own NumPy column, so a whole tick of
+    bullet work (integration, platform collision and bounds culling) is a
+    handful of vectorized operations instead of a Python loop over Bullet
+    objects.
+
+    Rows are slots that get reused: rows [0, high) may be in use, the used
+    column marks the occupied ones and freed slots go on a free list that
+    spawn() takes from before growing the columns, so a sustained firefight
+    allocates nothing once the pool is big enough. A bullet whose alive flag
+    became False during a tick keeps its slot until the next step() so that
+    get_game_state() can report it once as dead to the clients.
+
+    When snapshots are sent less often than step() runs, a bullet can die
+    and be freed between two snapshots. With enable_tombstones() on, a dead
+    row that was last reported alive is copied to the tombstones list when
+    its slot is freed, and the next snapshot reports it as dead from there
+    (see snapshot_taken()). Tombstones are copies: slot reuse, and so bullet
+    ids and replays, do not depend on the snapshot rate.
+
+    Below SCALAR_BELOW rows, release_dead() and step() work on plain Python
+    lists instead: a 4 player match rarely has more than a few bullets in
+    flight, and there the fixed cost of a dozen NumPy calls per tick is far
+    more than the arithmetic they save.
+
+    Bullet ids are generation-tagged: (generation << SLOT_BITS) | slot, where
+    a slot's generation is bumped every time it is reused. An id therefore
+    finds its row in O(1) and a recycled slot never repeats the id of the
+    bullet that held it before (until the 16-bit generation wraps). Ids fit
+    the uint32 bullet id of the binary protocol.
+    """
+    SLOT_BITS = 16
+    SLOT_MASK = (1 << SLOT_BITS) - 1
+    # Binary GAME_STATE mermi sayısını uint16 taşır, havuz 65535'i geçemez
+    MAX_SLOTS = SLOT_MASK
+    GENERATION_MASK = (1 << 16) - 1
+    # Bu kadar satırın altında step() ve isabet testi düz Python döngüsüyle
+    # çalışır; birkaç mermide NumPy çağrı maliyeti işin kendisinden büyük
+    SCALAR_BELOW = 64
+
+    FIELDS = (
+        ("ids", np.int64),
+        ("x", np.float64),
+        ("y", np.float64),
+        ("dx", np.float64),
+        ("dy", np.float64),
+        ("speed", np.float64),
+        ("damage", np.float64),
+        ("radius", np.float64),
+        ("owner", np.int64),
+        ("alive", np.bool_),
+        ("used", np.bool_),
+        ("generation", np.int64),
+        # Son step()'te hareket eden satırlar ve başlangıç konumları
+        ("moved", np.bool_),
+        ("px", np.float64),
+        ("py", np.float64),
+        # Lag compensation: isabet testinde oyuncuların kaç tick geriye alınacağı
+        ("rewind", np.int64),
+        # Son snapshot'taki hali: NOT_REPORTED, REPORTED_ALIVE veya REPORTED_DEAD
+        ("reported", np.int8),
+    )
+    NOT_REPORTED = 0
+    REPORTED_ALIVE = 1
+    REPORTED_DEAD = 2
+
+    def __init__(self, capacity=64):
+        """
+        Parameters:
+            capacity (int): Initial number of slots, grown by doubling when
+                every slot is taken, up to MAX_SLOTS.
+        """
+        self.capacity = min(max(1, int(capacity)), self.MAX_SLOTS)
+        self.count = 0
+        self.high = 0
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        # Boş slotlar yığını, free[:free_count] geçerli
+        self.free = np.zeros(self.capacity, dtype=np.int64)
+        self.free_count = 0
+        self.spawned = 0
+        self.recycled = 0
+        self.dropped = 0
+        self.grows = 0
+        # (id, owner, x, y, dx, dy) tuple'ları; None iken kapalı
+        self.tombstones = None
+
+    def __len__(self):
+        """Number of occupied slots, live bullets plus the ones dying this tick."""
+        return self.count
+
+    def _grow(self):
+        new_capacity = min(self.capacity * 2, self.MAX_SLOTS)
+        for name, dtype in self.FIELDS:
+            column = np.zeros(new_capacity, dtype=dtype)
+            column[:self.high] = getattr(self, name)[:self.high]
+            setattr(self, name, column)
+        free = np.zeros(new_capacity, dtype=np.int64)
+        free[:self.free_count] = self.free[:self.free_count]
+        self.free = free
+        self.capacity = new_capacity
+        self.grows += 1
+
+    def spawn(self, owner_id, pos, dir_vec, speed=600, damage=10.0, radius=2.0, rewind=0):
+        """
+        Adds a bullet to the pool, in a freed slot if there is one.
+
+        Parameters:
+            owner_id (int): ID of the player who fired the bullet.
+            pos (tuple): Starting position (x, y).
+            dir_vec (tuple): Direction vector, normalized here.
+            rewind (int): Ticks the players are rewound by when this bullet
+                is hit tested (see hit_test).
+
+        Returns:
+            int: ID of the new bullet, None if all MAX_SLOTS slots are taken.
+
+        Raises:
+            TypeError, ValueError, IndexError: A value cannot be converted;
+                the pool is left unchanged.
+        """
+        # Önce tüm değerleri dönüştür: bozuk girdi slot almadan hata versin
+        x, y = float(pos[0]), float(pos[1])
+        dx, dy = float(dir_vec[0]), float(dir_vec[1])
+        speed, damage, radius = float(speed), float(damage), float(radius)
+        owner_id, rewind = int(owner_id), int(rewind)
+        length = math.hypot(dx, dy)
+        if length == 0.0:
+            dx, dy = 0.0, 0.0
+        else:
+            dx, dy = dx / length, dy / length
+
+        if self.free_count:
+            self.free_count -= 1
+            i = int(self.free[self.free_count])
+            generation = (int(self.generation[i]) + 1) & self.GENERATION_MASK
+            self.recycled += 1
+        else:
+            if self.high == self.capacity:
+                if self.capacity == self.MAX_SLOTS:
+                    self.dropped += 1
+                    return None
+                self._grow()
+            i = self.high
+            generation = 0
+        if i >= self.high:
+            self.high = i + 1
+
+        bullet_id = (generation << self.SLOT_BITS) | i
+        self.generation[i] = generation
+        self.ids[i] = bullet_id
+        self.x[i] = x
+        self.y[i] = y
+        self.dx[i] = dx
+        self.dy[i] = dy
+        self.speed[i] = speed
+        self.damage[i] = damage
+        self.radius[i] = radius
+        self.owner[i] = owner_id
+        self.alive[i] = True
+        self.used[i] = True
+        self.moved[i] = False
+        self.rewind[i] = rewind
+        self.reported[i] = self.NOT_REPORTED
+
+        self.spawned += 1
+        self.count += 1
+        return bullet_id
+
+    def row_of(self, bullet_id):
+        """
+        Returns the current row of a bullet, or None if it is not in the pool.
+
+        The slot is the low SLOT_BITS of the id; a stale id of a recycled
+        slot does not match the slot's current id.
+        """
+        row = bullet_id & self.SLOT_MASK
+        if row < self.high and self.used[row] and self.ids[row] == bullet_id:
+            return row
+        return None
+
+    def rows(self):
+        """
+        Index of the occupied slots, in slot order, usable on any column.
+
+        Returns:
+            slice or ndarray: A plain slice while [0, high) has no free slot
+                in it, otherwise the occupied row numbers.
+        """
+        if self.count == self.high:
+            return slice(0, self.high)
+        return np.flatnonzero(self.used[:self.high])
+
+    def release_dead(self):
+        """Puts the slots of bullets that died in the previous tick on the free list."""
+        n = self.high
+        if n < self.SCALAR_BELOW:
+            used = self.used[:n].tolist()
+            rows = [i for i, alive in enumerate(self.alive[:n].tolist()) if used[i] and not alive]
+            if not rows:
+                return
+        else:
+            dead = self.used[:n] & ~self.alive[:n]
+            if not dead.any():
+                return
+            rows = np.flatnonzero(dead)
+        if self.tombstones is not None:
+            self._bury(rows)
+        k = len(rows)
+        self.used[rows] = False
+        self.free[self.free_count:self.free_count + k] = rows
+        self.free_count += k
+        self.count -= k
+
+        # Sondaki boş slotlar high'ın dışına düşer; free listesinde kalırlar
+        if self.count == 0:
+            self.high = 0
+        else:
+            self.high = int(np.flatnonzero(self.used[:n])[-1]) + 1
+
+    def enable_tombstones(self):
+        """Starts keeping tombstones of freed bullets, see snapshot_taken()."""
+        if self.tombstones is None:
+            self.tombstones = []
+
+    def _bury(self, rows):
+        """Copies the freed rows whose death no snapshot has reported yet to tombstones."""
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[self.reported[rows] == self.REPORTED_ALIVE]
+        room = self.MAX_SLOTS - len(self.tombstones)
+        if room <= 0 or rows.size == 0:
+            return
+        rows = rows[:room]
+        self.tombstones.extend(zip(
+            self.ids[rows].tolist(), self.owner[rows].tolist(),
+            self.x[rows].tolist(), self.y[rows].tolist(),
+            self.dx[rows].tolist(), self.dy[rows].tolist()
+        ))
+
+    def snapshot_taken(self):
+        """
+        Marks the current rows and tombstones as sent to the clients.
+
+        Called by Game.get_game_state() after serializing the pool. Rows
+        remember whether they were reported alive or dead, so only a bullet
+        that was seen alive and died before the next snapshot gets a
+        tombstone. Does nothing while tombstones are off.
+        """
+        if self.tombstones is None:
+            return
+        self.tombstones.clear()
+        if self.count:
+            rows = self.rows()
+            self.reported[rows] = np.where(self.alive[rows], self.REPORTED_ALIVE, self.REPORTED_DEAD)
+
+    def step(self, delta_time, platforms, map_width, map_height):
+        """
+        Advances all bullets by one tick.
+
+        Movement is swept: a bullet that touches a platform anywhere along
+        its path stops at the earliest time of impact and dies there, so it
+        cannot tunnel through thin platforms at low tick rates. The path
+        each bullet took is kept (px, py -> x, y) for hit_test().
+
+        Parameters:
+            delta_time (float): Time elapsed since last tick (seconds).
+            platforms (CollisionMap): Compiled map geometry, or None.
+            map_width (float): Bullets leaving (0, map_width) die.
+            map_height (float): Bullets leaving (0, map_height) die.
+
+        Returns:
+            int: Number of rows that took part in this tick.
+        """
+        if self.count == 0:
+            return 0
+        self.release_dead()
+        n = self.high
+        if self.count == 0:
+            return 0
+        if n < self.SCALAR_BELOW:
+            self._step_rows(n, delta_time, platforms, map_width, map_height)
+            return n
+
+        live = self.live_rows(n)
+        x0 = self.x[live]
+        y0 = self.y[live]
+        step = self.speed[live] * delta_time
+        move_x = self.dx[live] * step
+        move_y = self.dy[live] * step
+
+        if platforms:
+            toi = platforms.sweep_circles(x0, y0, move_x, move_y, self.radius[live])
+            hit_platform = toi <= 1.0
+            t = np.where(hit_platform, toi, 1.0)
+            x = x0 + move_x * t
+            y = y0 + move_y * t
+        else:
+            hit_platform = False
+            x = x0 + move_x
+            y = y0 + move_y
+
+        self.moved[:n] = False
+        self.moved[live] = True
+        self.px[live] = x0
+        self.py[live] = y0
+        self.x[live] = x
+        self.y[live] = y
+
+        dead = hit_platform | (x <= 0) | (x >= map_width) | (y <= 0) | (y >= map_height)
+        self.alive[live] &= ~dead
+        return n
+
+    def _step_rows(self, n, delta_time, platforms, map_width, map_height):
+        """step() for the first n rows one bullet at a time, on Python lists."""
+        xs, ys = self.x[:n].tolist(), self.y[:n].tolist()
+        pxs, pys = self.px[:n].tolist(), self.py[:n].tolist()
+        dxs, dys = self.dx[:n].tolist(), self.dy[:n].tolist()
+        speeds, radii = self.speed[:n].tolist(), self.radius[:n].tolist()
+        alive = self.alive[:n].tolist()
+        moved = [False] * n
+        for i in range(n):
+            if not alive[i]:
+                continue
+            x0, y0 = xs[i], ys[i]
+            step = speeds[i] * delta_time
+            move_x, move_y = dxs[i] * step, dys[i] * step
+            t = platforms.circle_time_of_impact(x0, y0, move_x, move_y, radii[i]) if platforms else None
+            if t is None:
+                x, y = x0 + move_x, y0 + move_y
+            else:
+                x, y = x0 + move_x * t, y0 + move_y * t
+            moved[i] = True
+            pxs[i], pys[i] = x0, y0
+            xs[i], ys[i] = x, y
+            if t is not None or x <= 0 or x >= map_width or y <= 0 or y >= map_height:
+                alive[i] = False
+        self.x[:n], self.y[:n] = xs, ys
+        self.px[:n], self.py[:n] = pxs, pys
+        self.moved[:n] = moved
+        self.alive[:n] = alive
+
+    def live_rows(self, n=None):
+        """
+        Index of the alive bullets among the first n rows (defaults to high).
+
+        Returns:
+            slice or ndarray: A plain slice while every row is alive, so the
+                common dense case works on views instead of copies.
+        """
+        if n is None:
+            n = self.high
+        alive = self.alive[:n]
+        if alive.all():
+            return slice(0, n)
+        return np.flatnonzero(alive)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Pool size and occupancy for monitoring.
+        """
+        return {
+            "capacity": self.capacity,
+            "high_water": self.high,
+            "in_use": self.count,
+            "live": int(np.count_nonzero(self.alive[:self.high])),
+            "free": self.free_count,
+            "occupancy": self.count / self.capacity,
+            "spawned": self.spawned,
+            "recycled": self.recycled,
+            "dropped": self.dropped,
+            "grows": self.grows
+        }
+
+    def hit_test(self, player_ids, player_x, player_y, player_alive, player_radius=20.0, n=None, history=None):
+        """
+        Batched swept bullet-vs-player hit test on a bullets x players matrix.
+
+        Every bullet that moved in the last step() is tested along the path
+        it took, which already ends at the platform it stopped at, against
+        the players' current positions, or with a history against where they
+        were rewind ticks ago. A bullet never hits its owner, and players
+        that are dead when the test runs are skipped.
+
+        Parameters:
+            player_ids (list): Player IDs, in the order hits should be resolved.
+            player_x (list): Player x positions, same order.
+            player_y (list): Player y positions, same order.
+            player_alive (list): Player alive flags, same order.
+            player_radius (float): Hit radius of a player.
+            n (int): Only the first n rows are tested (defaults to high).
+            history (PositionHistory): Past player positions for bullets with
+                a rewind, None to test everything at the current positions.
+
+        Returns:
+            list: (row, bullet_id, owner_id, victim_ids) for every bullet that
+                touches at least one player, in row order. victim_ids holds all
+                touched players by time of impact (ties in player_ids order),
+                so the caller can fall back to the next one if the first was
+                killed earlier in the tick.
+        """
+        if n is None:
+            n = self.high
+        if n == 0 or not player_ids:
+            return []
+
+        moved = self.moved[:n]
+        rows = np.flatnonzero(moved)
+        if rows.size == 0:
+            return []
+        pids = np.asarray(player_ids, dtype=np.int64)
+        owner = self.owner[rows]
+        x0 = self.px[rows][:, None]
+        y0 = self.py[rows][:, None]
+        player_x = np.asarray(player_x, dtype=np.float64)
+        player_y = np.asarray(player_y, dtype=np.float64)
+        rewinds = self.rewind[rows]
+        if history is not None and rewinds.any():
+            player_x, player_y = history.positions(player_ids, rewinds, player_x, player_y)
+        else:
+            player_x, player_y = player_x[None, :], player_y[None, :]
+        toi = sweep_circle_toi(
+            x0, y0, self.x[rows][:, None] - x0, self.y[rows][:, None] - y0,
+            player_x, player_y,
+            self.radius[rows][:, None] + float(player_radius)
+        )
+
+        mask = toi <= 1.0
+        mask &= owner[:, None] != pids[None, :]
+        mask &= np.asarray(player_alive, dtype=np.bool_)[None, :]
+
+        hits = np.flatnonzero(mask.any(axis=1))
+        if hits.size == 0:
+            return []
+
+        ids = self.ids
+        candidates = []
+        for i, row in zip(hits.tolist(), rows[hits].tolist()):
+            victims = np.flatnonzero(mask[i])
+            victims = victims[np.argsort(toi[i, victims], kind="stable")]
+            candidates.append((row, int(ids[row]), int(owner[i]), pids[victims].tolist()))
+        return candidates
@@ -0,0 +1,402 @@
+import math
+from types import MappingProxyType
+import numpy as np
+
+
+def compile_platforms(platforms, min_size=8, tolerance=1e-6):
+    """
+    Merges platform rectangles into as few maximal rectangles as possible.
+
+    The extractor sends one 16 px high row per tile row, so a solid block is
+    received as a stack of identical rows. Rows with the same x/width that
+    touch vertically are merged, then rectangles with the same y/height that
+    touch horizontally, until nothing changes. The union of the rectangles is
+    preserved, so collision results stay the same: rectangles separated by
+    any real gap are never joined, only by float noise below tolerance.
+
+    Args:
+        platforms (list): Platform dicts with x, y, width and height.
+        min_size (float): Platforms thinner than this are dropped.
+        tolerance (float): Coordinates closer than this are considered
+            equal; meant for rounding noise, a larger value would close gaps.
+
+    Returns:
+        list: Merged platform dicts sorted by y, then x.
+    """
+    rects = []
+    for p in platforms:
+        width, height = float(p.get("width", 0)), float(p.get("height", 0))
+        if width < min_size or height < min_size:
+            continue
+        rects.append([float(p["x"]), float(p["y"]), width, height])
+
+    changed = True
+    while changed:
+        count = len(rects)
+        # x, width, y ekseninde birleştir; sonra y, height, x ekseninde
+        rects = _merge_runs(rects, 0, 2, 1, 3, tolerance)
+        rects = _merge_runs(rects, 1, 3, 0, 2, tolerance)
+        changed = len(rects) != count
+
+    rects.sort(key=lambda r: (r[1], r[0]))
+    return [{"x": x, "y": y, "width": w, "height": h} for x, y, w, h in rects]
+
+
+def _merge_runs(rects, pos, size, axis, extent, tolerance):
+    """
+    Merges rectangles that share the same span on one axis (pos/size) and
+    touch or overlap on the other axis (axis/extent).
+    """
+    rects = sorted(rects, key=lambda r: (r[pos], r[size], r[axis]))
+    merged = []
+    for rect in rects:
+        if merged:
+            last = merged[-1]
+            if (abs(last[pos] - rect[pos]) < tolerance and
+                abs(last[size] - rect[size]) < tolerance and
+                rect[axis] <= last[axis] + last[extent] + tolerance):
+                end = max(last[axis] + last[extent], rect[axis] + rect[extent])
+                last[extent] = end - last[axis]
+                continue
+        merged.append(list(rect))
+    return merged
+
+
+def segment_circle_toi(x0, y0, dx, dy, cx, cy, radius):
+    """
+    Earliest t in [0, 1] at which the point (x0, y0) + t * (dx, dy) is within
+    radius of (cx, cy), i.e. the time of impact of a circle moving along the
+    segment against a circle (sum of both radii) at rest.
+
+    Returns:
+        float: Time of impact, 0.0 if it starts overlapping, None if it misses.
+    """
+    mx, my = x0 - cx, y0 - cy
+    c = mx*mx + my*my - radius*radius
+    if c <= 0.0:
+        return 0.0
+    a = dx*dx + dy*dy
+    if a == 0.0:
+        return None
+    b = mx*dx + my*dy
+    disc = b*b - a*c
+    if b >= 0.0 or disc < 0.0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+
+def segment_rect_toi(x0, y0, dx, dy, rx, ry, rw, rh, radius):
+    """
+    Time of impact of a circle of the given radius moving from (x0, y0) by
+    (dx, dy) against the rectangle (rx, ry, rw, rh).
+
+    The circle touches the rectangle exactly when its center is inside the
+    rectangle grown by radius with rounded corners, so this is a segment test
+    against two crossed slabs and four corner circles.
+
+    Returns:
+        float: Time of impact in [0, 1], None if it misses.
+    """
+    best = None
+    for left, top, right, bottom in ((rx - radius, ry, rx + rw + radius, ry + rh),
+                                     (rx, ry - radius, rx + rw, ry + rh + radius)):
+        t_enter, t_exit = 0.0, 1.0
+        for p, d, low, high in ((x0, dx, left, right), (y0, dy, top, bottom)):
+            if d == 0.0:
+                if p < low or p > high:
+                    t_enter, t_exit = 1.0, 0.0
+                    break
+                continue
+            t1, t2 = (low - p) / d, (high - p) / d
+            if t1 > t2:
+                t1, t2 = t2, t1
+            t_enter, t_exit = max(t_enter, t1), min(t_exit, t2)
+        if t_enter <= t_exit and (best is None or t_enter < best):
+            best = t_enter
+    for cx, cy in ((rx, ry), (rx + rw, ry), (rx, ry + rh), (rx + rw, ry + rh)):
+        t = segment_circle_toi(x0, y0, dx, dy, cx, cy, radius)
+        if t is not None and (best is None or t < best):
+            best = t
+    return best
+
+
+class CollisionMap:
+    """
+    Compiled, read-only collision geometry of a map.
+
+    Holds the merged platform rectangles and a uniform grid that maps each
+    cell to the rectangles overlapping it (inflated by margin), so a query
+    only touches the platforms near the queried area instead of all of them.
+
+    It iterates like the old platform list, so code that loops over
+    platforms keeps working. Instances are never modified after __init__ and
+    may be shared by any number of games (see MapRegistry).
+    """
+    # Hücre anahtarı: (cx + OFFSET) * STRIDE + (cy + OFFSET)
+    KEY_OFFSET = 1 << 15
+    KEY_STRIDE = 1 << 16
+    # Bu kadar dikdörtgene kadar query() hepsini döner, taramak gridden ucuz
+    SCAN_BELOW = 8
+
+    def __init__(self, platforms, cell_size=64.0, margin=8.0):
+        """
+        Args:
+            platforms (list): Raw platform dicts as sent by platform_extractor.gd.
+            cell_size (float): Grid cell size in pixels.
+            margin (float): Rectangles are registered in every cell they reach
+                when grown by this much, so circles up to this radius can be
+                looked up by their center cell alone.
+        """
+        self.cell_size = float(cell_size)
+        self.margin = float(margin)
+        self.rects = tuple(MappingProxyType(r) for r in compile_platforms(platforms))
+
+        self.rx = np.array([r["x"] for r in self.rects], dtype=np.float64)
+        self.ry = np.array([r["y"] for r in self.rects], dtype=np.float64)
+        self.rw = np.array([r["width"] for r in self.rects], dtype=np.float64)
+        self.rh = np.array([r["height"] for r in self.rects], dtype=np.float64)
+        for column in (self.rx, self.ry, self.rw, self.rh):
+            column.flags.writeable = False
+
+        cells = {}
+        for i, rect in enumerate(self.rects):
+            for key in self._keys_in(rect["x"] - margin, rect["y"] - margin,
+                                     rect["x"] + rect["width"] + margin,
+                                     rect["y"] + rect["height"] + margin):
+                cells.setdefault(key, []).append(i)
+        self.cells = MappingProxyType({key: tuple(ids) for key, ids in cells.items()})
+        # Tek hücrelik sorgular için hücrenin platformları, hazır ve sıralı
+        self.cell_platforms = MappingProxyType({key: tuple(self.rects[i] for i in ids) for key, ids in cells.items()})
+
+        # Aynı tablo düz dizi olarak: hücre c'nin dikdörtgenleri cell_rects[cell_start[c]:cell_start[c + 1]]
+        coords = [(key // self.KEY_STRIDE - self.KEY_OFFSET, key % self.KEY_STRIDE - self.KEY_OFFSET)
+                  for key in cells]
+        self.grid_x0 = min((cx for cx, _ in coords), default=0)
+        self.grid_y0 = min((cy for _, cy in coords), default=0)
+        self.grid_width = max((cx for cx, _ in coords), default=0) - self.grid_x0 + 1
+        self.grid_height = max((cy for _, cy in coords), default=0) - self.grid_y0 + 1
+        flat = [(cx - self.grid_x0) * self.grid_height + cy - self.grid_y0 for cx, cy in coords]
+        counts = np.zeros(self.grid_width * self.grid_height + 1, dtype=np.int64)
+        for cell, ids in zip(flat, cells.values()):
+            counts[cell + 1] = len(ids)
+        self.cell_start = np.cumsum(counts)
+        self.cell_rects = np.zeros(int(self.cell_start[-1]), dtype=np.int64)
+        for cell, ids in zip(flat, cells.values()):
+            start = int(self.cell_start[cell])
+            self.cell_rects[start:start + len(ids)] = ids
+        for column in (self.cell_start, self.cell_rects):
+            column.flags.writeable = False
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __iter__(self):
+        return iter(self.rects)
+
+    def __bool__(self):
+        return bool(self.rects)
+
+    def _keys_in(self, left, top, right, bottom):
+        inv = 1.0 / self.cell_size
+        off, stride = self.KEY_OFFSET, self.KEY_STRIDE
+        for cx in range(math.floor(left * inv), math.floor(right * inv) + 1):
+            for cy in range(math.floor(top * inv), math.floor(bottom * inv) + 1):
+                yield (cx + off) * stride + (cy + off)
+
+    def query(self, left, top, right, bottom):
+        """
+        Returns the platforms whose grid cells overlap the given box.
+
+        The result is a superset of the platforms actually touching the box,
+        in the same top-to-bottom order as self.rects; callers still run
+        their exact test on it. When the covered cells that have platforms
+        all hold the same ones, the usual case for a player's feet or a
+        bullet's step, that cell's prepared tuple is returned as is. Maps
+        of fewer than SCAN_BELOW rectangles (the stock map compiles to 6)
+        skip the grid and return all of them.
+        """
+        if len(self.rects) < self.SCAN_BELOW:
+            return self.rects
+        floor = math.floor
+        inv = 1.0 / self.cell_size
+        off, stride = self.KEY_OFFSET, self.KEY_STRIDE
+        cy0, cy1 = floor(top * inv) + off, floor(bottom * inv) + off + 1
+        cells = self.cells
+        first = first_key = others = None
+        for cx in range(floor(left * inv) + off, floor(right * inv) + off + 1):
+            base = cx * stride
+            for key in range(base + cy0, base + cy1):
+                ids = cells.get(key)
+                if ids is None:
+                    continue
+                if first is None:
+                    first, first_key = ids, key
+                elif ids != first:
+                    if others is None:
+                        others = []
+                    others.append(ids)
+        if first is None:
+            return ()
+        if others is None:
+            return self.cell_platforms[first_key]
+        found = set(first)
+        for ids in others:
+            found.update(ids)
+        rects = self.rects
+        return [rects[i] for i in sorted(found)]
+
+    def circle_time_of_impact(self, x, y, dx, dy, radius):
+        """
+        Scalar form of sweep_circles() for one circle moving from (x, y) by
+        (dx, dy): only the platforms near its path are tested.
+
+        Returns:
+            float: Earliest time of impact in [0, 1], None if it touches none.
+        """
+        left, top = min(x, x + dx) - radius, min(y, y + dy) - radius
+        right, bottom = max(x, x + dx) + radius, max(y, y + dy) + radius
+        best = None
+        for rect in self.query(left, top, right, bottom):
+            rx, ry, rw, rh = rect["x"], rect["y"], rect["width"], rect["height"]
+            if rx > right or rx + rw < left or ry > bottom or ry + rh < top:
+                continue
+            t = segment_rect_toi(x, y, dx, dy, rx, ry, rw, rh, radius)
+            if t is not None and (best is None or t < best):
+                best = t
+        return best
+
+    def sweep_circles(self, xs, ys, dxs, dys, radii):
+        """
+        Vectorized swept circle-rectangle test: each circle moves from
+        (xs, ys) by (dxs, dys) during the step.
+
+        The path's center can only meet a rectangle inside a grid cell the
+        rectangle is registered in (rectangles are registered grown by
+        margin), so every circle is paired with the rectangles of each cell
+        its path's bounding box covers. The pairs are culled by bounding box
+        and the rest get the exact test in one vectorized pass.
+
+        Returns:
+            np.ndarray: Time of impact in [0, 1] per circle, np.inf where the
+                circle does not touch any platform during the step.
+        """
+        n = len(xs)
+        toi = np.full(n, np.inf)
+        if n == 0 or not self.rects:
+            return toi
+
+        x_end, y_end = xs + dxs, ys + dys
+        left, right = np.minimum(xs, x_end), np.maximum(xs, x_end)
+        top, bottom = np.minimum(ys, y_end), np.maximum(ys, y_end)
+
+        if float(radii.max()) > self.margin:
+            # Büyük çemberler için hücre yetmez, her şeyle eşleştir
+            rows = np.repeat(np.arange(n), len(self.rects))
+            rects = np.tile(np.arange(len(self.rects)), n)
+        else:
+            inv = 1.0 / self.cell_size
+            cx0 = np.floor(left * inv).astype(np.int64)
+            cy0 = np.floor(top * inv).astype(np.int64)
+            span_x = np.floor(right * inv).astype(np.int64) - cx0
+            span_y = np.floor(bottom * inv).astype(np.int64) - cy0
+            all_rows = np.arange(n)
+            row_parts, rect_parts = [], []
+            for ox in range(int(span_x.max()) + 1):
+                for oy in range(int(span_y.max()) + 1):
+                    if ox == 0 and oy == 0:
+                        covering = all_rows
+                    else:
+                        covering = np.flatnonzero((span_x >= ox) & (span_y >= oy))
+                    rows, rects = self._cell_pairs(cx0[covering] + ox, cy0[covering] + oy, covering)
+                    row_parts.append(rows)
+                    rect_parts.append(rects)
+            rows = np.concatenate(row_parts)
+            rects = np.concatenate(rect_parts)
+
+        r = radii[rows]
+        rx, ry, rw, rh = self.rx[rects], self.ry[rects], self.rw[rects], self.rh[rects]
+        near = ((left[rows] <= rx + rw + r) & (right[rows] >= rx - r) &
+                (top[rows] <= ry + rh + r) & (bottom[rows] >= ry - r))
+        if not near.any():
+            return toi
+        rows = rows[near]
+        pair_toi = sweep_rect_toi(xs[rows], ys[rows], dxs[rows], dys[rows],
+                                  rx[near], ry[near], rw[near], rh[near], r[near])
+        np.minimum.at(toi, rows, pair_toi)
+        return toi
+
+    def _cell_pairs(self, cell_x, cell_y, rows):
+        """
+        Pairs every item with the rectangles registered in its grid cell,
+        using the flat cell table built in __init__.
+
+        Returns:
+            tuple: (rows, rect_ids) arrays of equal length.
+        """
+        ix = cell_x - self.grid_x0
+        iy = cell_y - self.grid_y0
+        inside = (ix >= 0) & (ix < self.grid_width) & (iy >= 0) & (iy < self.grid_height)
+        if not inside.all():
+            ix, iy, rows = ix[inside], iy[inside], rows[inside]
+        cell = ix * self.grid_height + iy
+        start = self.cell_start[cell]
+        count = self.cell_start[cell + 1] - start
+        total = int(count.sum())
+        if total == 0:
+            return rows[:0], rows[:0]
+        # Her satırın [start, start + count) aralığını düz bir diziye aç
+        first = np.cumsum(count) - count
+        offsets = np.arange(total) - np.repeat(first - start, count)
+        return np.repeat(rows, count), self.cell_rects[offsets]
+
+
+def sweep_circle_toi(xs, ys, dxs, dys, cx, cy, radii):
+    """
+    Vectorized segment_circle_toi(): cx, cy and radii may be arrays or scalars
+    broadcasting against the moving points.
+
+    Returns:
+        np.ndarray: Time of impact in [0, 1], np.inf where it misses.
+    """
+    mx, my = xs - cx, ys - cy
+    c = mx*mx + my*my - radii*radii
+    a = dxs*dxs + dys*dys
+    b = mx*dxs + my*dys
+    disc = b*b - a*c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (-b - np.sqrt(np.maximum(disc, 0.0))) / a
+    hit = (b < 0.0) & (disc >= 0.0) & (a > 0.0) & (t <= 1.0)
+    return np.where(c <= 0.0, 0.0, np.where(hit, t, np.inf))
+
+
+def sweep_rect_toi(xs, ys, dxs, dys, rx, ry, rw, rh, radii):
+    """
+    Vectorized segment_rect_toi(), every argument an array of the same
+    length (or a scalar).
+
+    Returns:
+        np.ndarray: Time of impact in [0, 1], np.inf where it misses.
+    """
+    toi = np.full(np.broadcast(xs, rx).shape, np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_dx = 1.0 / dxs
+        inv_dy = 1.0 / dys
+        for left, top, right, bottom in ((rx - radii, ry, rx + rw + radii, ry + rh),
+                                         (rx, ry - radii, rx + rw, ry + rh + radii)):
+            t_enter = np.zeros_like(toi)
+            t_exit = np.ones_like(toi)
+            for p, d, inv, low, high in ((xs, dxs, inv_dx, left, right), (ys, dys, inv_dy, top, bottom)):
+                t1 = (low - p) * inv
+                t2 = (high - p) * inv
+                # Hareket yoksa: slab içindeyse her t, değilse hiçbiri
+                still = d == 0.0
+                inside = (p >= low) & (p <= high)
+                t1 = np.where(still, np.where(inside, -np.inf, np.inf), t1)
+                t2 = np.where(still, np.inf, t2)
+                t_enter = np.maximum(t_enter, np.minimum(t1, t2))
+                t_exit = np.minimum(t_exit, np.maximum(t1, t2))
+            toi = np.where(t_enter <= t_exit, np.minimum(toi, t_enter), toi)
+    for cx, cy in ((rx, ry), (rx + rw, ry), (rx, ry + rh), (rx + rw, ry + rh)):
+        toi = np.minimum(toi, sweep_circle_toi(xs, ys, dxs, dys, cx, cy, radii))
+    return toi
@@ -4,8 +4,12 @@ sys.path.append(os.path.dirname(__file__))
 import random
 from enum import Enum
 from player import Player
-from bullet import Bullet
+from bullet_pool import BulletPool
+from collision_map import CollisionMap, segment_circle_toi
+from sim_clock import SimClock
+from position_history import PositionHistory
 from Utils.protocol import Protocol
+from Utils.logger import Logger, LogType
 
 
 class Status(Enum):
@@ -25,6 +29,10 @@ class Game:
     MAP_WIDTH = 1152
     MAP_HEIGHT = 648
     GAME_DURATION = 180.0
+    PLAYER_HIT_RADIUS = 20.0
+    # Batched NumPy hit test from BulletPool.SCALAR_BELOW bullet rows on;
+    # False always uses the per-bullet scalar loop
+    VECTORIZED_HITS = True
 
     STARTING_POSITIONS = [
 
@@ -33,29 +41,50 @@ class Game:
         {"position": (800, 320), "direction": (0, 0)},   
         {"position": (1040, 512), "direction": (0, 0)}  
     ]
-    def __init__(self):
+    def __init__(self, clock=time.time, rng=None):
         """
         Initializes the game state.
 
+        Parameters:
+            clock (callable): Time source in seconds for the match timer.
+            rng (random.Random): Source of every random decision of the match,
+                a fresh unseeded one if None. See make_deterministic().
+
         Attributes:
             players (dict): A mapping of player IDs to their game state 
                 (position, health, score, team, etc.).
-            bullets (list): Active bullets with positions, velocities, and owner IDs.
+            bullets (BulletPool): Active bullets with positions, velocities, and owner IDs.
             enemies (list): Active enemies (if applicable) with positions and states.
             game_time (float): Tracks elapsed time since the start.
             status (str): Indicates current state (e.g., 'waiting', 'running', 'ended').
-            map_data (object/dict): Stores map layout, boundaries, obstacles.
+            platforms (CollisionMap): Compiled map layout used for collisions.
+            map_width, map_height (float): World bounds, MAP_WIDTH x MAP_HEIGHT
+                unless the room's map sets its own (see set_map_bounds).
         """
         self.players = dict()
         self.status = Status.WAITING.value
         self.player_count = 0
-        self.platforms = None
-        self.bullets = []
+        self.platforms = CollisionMap(())
+        self.map_width = Game.MAP_WIDTH
+        self.map_height = Game.MAP_HEIGHT
+        self.bullets = BulletPool()
         self.protocol = Protocol()
         self.start_time = None
+        self.start_tick = 0
         self.game_ended = False
         self.winner_info = None
         self.winner_broadcasted = False
+        # TickProfiler, profiling kapalıyken None; profile_id = room id
+        self.profiler = None
+        self.profile_id = None
+        self.clock = clock
+        self.rng = rng if rng is not None else random.Random()
+        # Deterministik modda tick'lerle ilerleyen saat, yoksa None
+        self.sim_clock = None
+        # InputLog, kayıt kapalıyken None
+        self.recorder = None
+        # PositionHistory, lag compensation kapalıyken None
+        self.history = None
 
         
     def add_player(self, player_id, username , connection):
@@ -74,24 +103,99 @@ class Game:
         self.players[player_id] = player
         self.player_count += 1
         self.assign_position_to_new_player(player_id)
-        
+        if self.history is not None:
+            self.history.add(player_id)
+        if self.recorder:
+            self.recorder.join(player_id, username)
+
     def start_game(self):
         self.status = Status.STARTED.value
-        self.start_time = time.time()
+        self.start_time = self.clock()
+        if self.sim_clock is not None:
+            self.start_tick = self.sim_clock.ticks
         self.game_ended = False
         self.winner_info = None
         self.winner_broadcasted = False
-        print("[Game] Game started!")
+        if self.history is not None:
+            # Başlangıç pozisyonlarına ışınlandılar
+            self.history.reset()
+        if self.recorder:
+            self.recorder.start()
+        Logger.send_log(LogType.GAME_INFO, "Game started")
+
+    def make_deterministic(self, seed):
+        """
+        Switches the game to deterministic mode.
+
+        The match timer runs on a SimClock advanced by every tick() and all
+        random decisions come from a Random seeded with seed, so the same
+        inputs on the same ticks always produce the same match. This is what
+        input logs are recorded and replayed with (see replay.py).
+
+        Parameters:
+            seed (int): Seed of the game's RNG.
+        """
+        self.sim_clock = SimClock()
+        self.clock = self.sim_clock
+        self.rng = random.Random(seed)
+
+    def enable_lag_compensation(self, max_rewind, slots):
+        """
+        Tests bullets against where the players were on the shooter's screen.
+
+        A PositionHistory of max_rewind ticks is allocated once and filled
+        by every tick(); bullets remember their shooter's rewind (see
+        set_player_rewind) and are hit tested against the players as they
+        were that many ticks ago.
+
+        Parameters:
+            max_rewind (int): Most ticks a hit test can go back.
+            slots (int): Players tracked at once, the room's capacity.
+        """
+        self.history = PositionHistory(max_rewind, slots)
+        for player_id in self.players:
+            self.history.add(player_id)
+        if self.recorder:
+            self.recorder.lag_compensation(max_rewind, slots)
+
+    def set_player_rewind(self, player_id, ticks):
+        """
+        Sets how many ticks back the bullets the player fires from now on
+        are hit tested, usually its estimated latency. No-op without lag
+        compensation.
+
+        Returns:
+            int: The rewind in use, clamped to the history's max_rewind.
+        """
+        history = self.history
+        if history is None:
+            return 0
+        ticks = min(max(0, int(ticks)), history.max_rewind)
+        if player_id in history.slot_of and history.rewind_of(player_id) != ticks:
+            history.set_rewind(player_id, ticks)
+            if self.recorder:
+                self.recorder.rewind(player_id, ticks)
+        return ticks
 
     def get_remaining_time(self):
         if self.start_time is None:
-            print("[Debug] start_time is None!")
             return self.GAME_DURATION
-        elapsed = time.time() - self.start_time
-        remaining = self.GAME_DURATION - elapsed
-        print(f"[Debug] elapsed: {elapsed:.2f}, remaining: {remaining:.2f}")
+        remaining = self.GAME_DURATION - (self.clock() - self.start_time)
         return max(0, remaining)
     
+    def time_is_up(self):
+        """
+        Whether the match has run for GAME_DURATION.
+
+        On a SimClock the match ends after exactly round(GAME_DURATION /
+        delta_time) ticks, e.g. 1800 ticks for 30 s at 60 Hz, so recorded
+        logs are as long as the configured duration.
+        """
+        clock = self.sim_clock
+        if clock is None or self.start_time is None or clock.step <= 0:
+            return self.get_remaining_time() <= 0
+        return clock.ticks - self.start_tick >= max(1, round(self.GAME_DURATION / clock.step))
+
     def broadcast_remaining_time(self):
         
         return self.protocol.serialize_remaining_time(self)
@@ -110,6 +214,10 @@ class Game:
         if player_id in self.players.keys():
             self.players.pop(player_id)
             self.player_count -= 1
+            if self.history is not None:
+                self.history.remove(player_id)
+            if self.recorder:
+                self.recorder.leave(player_id)
             return True
         return False
 
@@ -147,7 +255,7 @@ class Game:
 
     def assign_position_to_respawned_player(self,player):
         if not player.is_alive:
-            random_spawn_point_idx = random.randint(0,3)
+            random_spawn_point_idx = self.rng.randint(0,3)
             return self.STARTING_POSITIONS[random_spawn_point_idx]["position"]
 
             
@@ -161,7 +269,9 @@ class Game:
         player = self.players[player_id]
         
         # Add input to buffer instead of immediately applying
-        player.add_input_to_buffer(direction)
+        player.add_input_to_buffer(direction, self.clock())
+        if self.recorder:
+            self.recorder.move(player_id, direction)
         #print(f"Buffered input for player {player_id}: {direction}")
         
     def clamp_position(self,x,y):
@@ -174,14 +284,39 @@ class Game:
 
         Returns:
             tuple: A tuple (x, y) where both coordinates are constrained
-                to be within the map dimensions [0, MAP_WIDTH] and [0, MAP_HEIGHT].
+                to be within the map dimensions [0, map_width] and [0, map_height].
 
         Purpose:
             - Prevents the player or objects from moving outside the map boundaries.
         """
-        x = max(0,min(x,Game.MAP_WIDTH))
-        y = max(0,min(y,Game.MAP_HEIGHT))
+        x = max(0,min(x,self.map_width))
+        y = max(0,min(y,self.map_height))
         return x,y
+
+    def set_map_bounds(self, width, height):
+        """
+        Sets the world size used for clamping players and culling bullets.
+
+        Parameters:
+            width (float): Map width, MAP_WIDTH if None.
+            height (float): Map height, MAP_HEIGHT if None.
+        """
+        self.map_width = Game.MAP_WIDTH if width is None else float(width)
+        self.map_height = Game.MAP_HEIGHT if height is None else float(height)
+
+    def set_map(self, collision_map, width=None, height=None):
+        """
+        Sets the map the game is played on.
+
+        Parameters:
+            collision_map (CollisionMap): Compiled map geometry.
+            width (float): Map width, MAP_WIDTH if None.
+            height (float): Map height, MAP_HEIGHT if None.
+        """
+        self.platforms = collision_map
+        self.set_map_bounds(width, height)
+        if self.recorder:
+            self.recorder.map(collision_map, self.map_width, self.map_height)
     
     def fire_bullet(self, player_id, position, direction):
         """
@@ -197,16 +332,19 @@ class Game:
             - Bullet added to bullets list with owner_id for scoring.
         """
         if self.players[player_id].is_alive:
-            bullet = Bullet(
+            self.bullets.spawn(
                 owner_id=player_id,
                 pos=position,
                 dir_vec=direction,
                 speed=500,
                 damage=10,
-                radius=5.0
+                radius=5.0,
+                rewind=self.history.rewind_of(player_id) if self.history is not None else 0
             )
-            self.bullets.append(bullet)
-            print(f"[Game] Bullet spawned by Player {player_id} at {position} with dir {direction}")
+            if self.recorder:
+                self.recorder.shoot(player_id, position, direction)
+            if Logger.debug_enabled:
+                Logger.send_log(LogType.DEBUG, "Bullet spawned", player_id=player_id, position=position, direction=direction)
         
     def update_bullets(self, delta_time):
         """
@@ -220,32 +358,116 @@ class Game:
         """
         collision_events = set()
 
-        self.bullets = [b for b in self.bullets if b.alive]
-        for bullet in list(self.bullets):  
-            bullet.update(delta_time,self.platforms)
-
-            for player in self.players.values():
-                if player.id != bullet.owner_id and player.is_alive:
-                    if bullet.check_collision(player.position, player_radius=20):
-                        player.health -= bullet.damage * player.attack_multiplier()
-                        print(player.username," ",player.health," ",player.is_alive)
-                        if player.health <= 0:
-                            player.is_alive = False
-                            collision_events.add(bullet.owner_id)
-                        bullet.alive = False
-                        break  
-                    
-            if not ((0 < bullet.pos["x"] and bullet.pos["x"] < self.MAP_WIDTH) and (0 < bullet.pos["y"] and bullet.pos["y"] < self.MAP_HEIGHT)):
-                bullet.alive = False
+        n = self.bullets.step(delta_time, self.platforms, self.map_width, self.map_height)
+        if n == 0 or not self.players:
+            return
+
+        for bullet_id, victim_id, owner_id in self.detect_collisions(n):
+            self.apply_hit(bullet_id, victim_id, owner_id, collision_events)
 
         self.update_scores(collision_events)
 
+    def detect_collisions(self, n):
+        """
+        Yields hit events for the first n bullets of the pool.
+
+        Parameters:
+            n (int): Number of bullet rows taking part in this tick.
+
+        Yields:
+            tuple: (bullet_id, victim_id, owner_id) for every bullet that hits.
+
+        Usage:
+            - Consumed by update_bullets(), which applies each hit before the
+              next one is resolved, so a player killed by an earlier bullet
+              is no longer a valid victim for later bullets in the same tick.
+        """
+        players = self.players
+        # Birkaç mermide skaler döngü NumPy matrisinden hızlı
+        if self.VECTORIZED_HITS and n >= self.bullets.SCALAR_BELOW:
+            candidates = self.bullets.hit_test(
+                list(players.keys()),
+                [p.x for p in players.values()],
+                [p.y for p in players.values()],
+                [p.is_alive for p in players.values()],
+                self.PLAYER_HIT_RADIUS,
+                n,
+                self.history
+            )
+        else:
+            candidates = self._scalar_hit_candidates(n)
+
+        alive = self.bullets.alive
+        for row, bullet_id, owner_id, victim_ids in candidates:
+            for victim_id in victim_ids:
+                if players[victim_id].is_alive:
+                    alive[row] = False
+                    yield bullet_id, victim_id, owner_id
+                    break
+
+    def _scalar_hit_candidates(self, n):
+        """Reference per-bullet implementation of BulletPool.hit_test()."""
+        bullets = self.bullets
+        xs = bullets.x[:n].tolist()
+        ys = bullets.y[:n].tolist()
+        start_xs = bullets.px[:n].tolist()
+        start_ys = bullets.py[:n].tolist()
+        radii = bullets.radius[:n].tolist()
+        owners = bullets.owner[:n].tolist()
+        ids = bullets.ids[:n].tolist()
+        moved = bullets.moved[:n].tolist()
+        rewinds = bullets.rewind[:n].tolist()
+        players = [p for p in self.players.values() if p.is_alive]
+        history = self.history
+
+        candidates = []
+        for i in range(n):
+            if not moved[i]:
+                continue
+            reach = radii[i] + self.PLAYER_HIT_RADIUS
+            move_x, move_y = xs[i] - start_xs[i], ys[i] - start_ys[i]
+            victims = []
+            for player in players:
+                if player.id != owners[i]:
+                    seen = history.position_at(player.id, rewinds[i]) if history is not None and rewinds[i] else None
+                    target_x, target_y = seen if seen is not None else (player.x, player.y)
+                    toi = segment_circle_toi(start_xs[i], start_ys[i], move_x, move_y, target_x, target_y, reach)
+                    if toi is not None:
+                        victims.append((toi, player.id))
+            if victims:
+                victims.sort(key=lambda victim: victim[0])
+                candidates.append((i, ids[i], owners[i], [player_id for _, player_id in victims]))
+        return candidates
+
+    def apply_hit(self, bullet_id, victim_id, owner_id, collision_events):
+        """
+        Applies the damage of one bullet hit.
+
+        Parameters:
+            bullet_id (int): ID of the bullet that hit.
+            victim_id (int): ID of the player that was hit.
+            owner_id (int): ID of the player who fired the bullet.
+            collision_events (set): Owner IDs credited with a kill, filled here
+                and passed to update_scores().
+        """
+        bullets = self.bullets
+        player = self.players[victim_id]
+        player.health -= float(bullets.damage[bullets.row_of(bullet_id)]) * player.attack_multiplier(self.rng)
+        if Logger.debug_enabled:
+            Logger.send_log(LogType.DEBUG, "Player hit", player_id=victim_id, health=player.health, owner_id=owner_id)
+        if player.health <= 0:
+            player.is_alive = False
+            collision_events.add(owner_id)
+
     def respawn_player(self,player_id):
-        print("respawn_player")
         player = self.players[player_id]
         spawn_point = self.assign_position_to_respawned_player(player)
-        print(spawn_point)
+        Logger.send_log(LogType.DEBUG, "Player respawn", player_id=player_id, spawn_point=spawn_point)
         player.respawn(spawn_point)
+        if self.history is not None:
+            self.history.reset(player_id)
+        if self.recorder:
+            self.recorder.respawn(player_id)
         
 
     def update_scores(self, collision_events):
@@ -263,7 +485,7 @@ class Game:
         for owner_id in collision_events:
             if owner_id in self.players and self.players[owner_id].is_alive:
                 self.players[owner_id].score += 1
-                print(f"[Score Update] Player {self.players[owner_id].username} (ID: {owner_id}) new score: {self.players[owner_id].score}")
+                Logger.send_log(LogType.GAME_INFO, "Score update", player_id=owner_id, score=self.players[owner_id].score)
 
     
     def check_win_condition(self):
@@ -280,7 +502,7 @@ class Game:
         if self.game_ended:
             return self.winner_info
         
-        if self.get_remaining_time() > 0:
+        if not self.time_is_up():
             return None 
 
         self.game_ended = True
@@ -309,7 +531,7 @@ class Game:
                 "message": f"{winner.username} kazandı! Puan: {max_score}"
             }
 
-        print(f"[Game] Winner Info: {self.winner_info}")
+        Logger.send_log(LogType.DEBUG, "Winner info", rate=1, winner_info=self.winner_info)
         return self.winner_info
 
     def get_game_state(self):
@@ -317,20 +539,21 @@ class Game:
         Returns the current game state for broadcasting.
 
         Returns:
-            dict: Contains player positions, scores, bullet positions, etc.
+            dict: Contains player positions, scores, bullet positions, remaining time, etc.
 
         Usage:
             - Called by GameRoom.broadcast_game_state() to send to clients.
+            - Each call counts as a sent snapshot for the bullet tombstones
+              (see BulletPool.snapshot_taken()).
         """
-        bullets_data = []
-        for bullet in self.bullets:
-            bullets_data.append(self.protocol.serialize_shoot(bullet))  
-            
+        bullets_data = self.protocol.serialize_shoot(self.bullets)
+        self.bullets.snapshot_taken()
+
         players_data = []
         for player in self.players.values():
             players_data.append(self.protocol.serialize_player(player))
 
-        return self.protocol.serialize_game_state(players_data, bullets_data)
+        return self.protocol.serialize_game_state(players_data, bullets_data, self.get_remaining_time())
     
    
     
@@ -355,19 +578,37 @@ class Game:
             - Called by GameRoom.tick().
             - Updates player movements, bullets, collisions, and scores.
         """
+        if self.sim_clock is not None:
+            self.sim_clock.advance(delta_time)
+        if self.recorder:
+            self.recorder.tick()
         if self.status == Status.STARTED.value:
-            for player in self.players.values():
-                player.update_physics(delta_time, self.platforms)
-                player.position = self.clamp_position(player.position[0],player.position[1])
-                
-            for bullet in self.bullets:
-                self.update_bullets(delta_time)
+            profiler = self.profiler
+            start = profiler.now() if profiler else 0.0
+            movable = [player for player in self.players.values() if player.can_move()]
+            for player in movable:
+                player.apply_inputs()
+            if profiler:
+                start = profiler.record(self.profile_id, "input", start)
+
+            for player in movable:
+                player.integrate(delta_time, self.platforms)
+                player.x, player.y = self.clamp_position(player.x, player.y)
+            if self.history is not None:
+                self.history.record(self.players)
+            if profiler:
+                start = profiler.record(self.profile_id, "physics", start)
+
+            self.update_bullets(delta_time)
+            if profiler:
+                profiler.record(self.profile_id, "bullets", start)
 
 
         # Oyun bitiş kontrolü
         winner_info = self.check_win_condition()
         if winner_info:
-            print(f"[Game] Game ended! {winner_info}")
+            # Kazanan yayınlanana kadar her tick'te tekrar eder
+            Logger.send_log(LogType.GAME_INFO, "Game ended", rate=1, winner_info=winner_info)
 
 
     def log_event(self, event_type, details):
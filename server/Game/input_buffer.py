@@ -0,0 +1,54 @@
+class InputBuffer:
+    """
+    Fixed-capacity ring of the MOVE inputs a player sent since the last tick.
+
+    Consecutive inputs without a jump only overwrite each other (only the
+    latest horizontal direction matters for the next tick), so a client
+    flooding MOVE messages fills one slot instead of growing a list. Inputs
+    with a jump (dy < 0) get their own slot so the jump edge survives the
+    next horizontal input. When the ring is full a new input is merged into
+    the newest slot, keeping that slot's jump.
+
+    Usage:
+        buffer.add((dx, dy), timestamp)
+        for direction, timestamp in buffer:
+            ...
+        buffer.clear()
+    """
+    __slots__ = ("capacity", "entries", "start", "count")
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.entries = [None] * capacity
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        entries, capacity = self.entries, self.capacity
+        for i in range(self.count):
+            yield entries[(self.start + i) % capacity]
+
+    def add(self, direction, timestamp):
+        jump = direction[1] < 0
+        if self.count:
+            newest = (self.start + self.count - 1) % self.capacity
+            newest_direction = self.entries[newest][0]
+            newest_jump = newest_direction[1] < 0
+            if not jump and not newest_jump:
+                # Önceki yatay input'un yerine geçer
+                self.entries[newest] = (direction, timestamp)
+                return
+            if self.count == self.capacity:
+                if newest_jump and not jump:
+                    direction = (direction[0], newest_direction[1])
+                self.entries[newest] = (direction, timestamp)
+                return
+        self.entries[(self.start + self.count) % self.capacity] = (direction, timestamp)
+        self.count += 1
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
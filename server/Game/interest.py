@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class InterestFilter:
+    """
+    Area-of-interest filter: decides which players and bullets each
+    recipient gets in its snapshots.
+
+    A recipient sees what is inside a view rectangle centred on its own
+    player. Entities it already sees stay visible until they are margin
+    units outside the rectangle (hysteresis), so something moving along
+    the edge does not flicker in and out of the snapshots. The recipient's
+    own player is always visible.
+    """
+
+    def __init__(self, view_width, view_height, margin=64.0):
+        """
+        Args:
+            view_width (float): Width of the view rectangle around a player.
+            view_height (float): Height of the view rectangle around a player.
+            margin (float): Extra distance an entity that is already visible
+                has to travel before it is dropped.
+        """
+        self.half_width = view_width / 2
+        self.half_height = view_height / 2
+        self.margin = margin
+        # recipient id -> (player ids, bullet id array) görünür olanlar
+        self.visible_players = {}
+        self.visible_bullets = {}
+
+    def forget(self, recipient_id):
+        """Drops the state of a recipient that left the room."""
+        self.visible_players.pop(recipient_id, None)
+        self.visible_bullets.pop(recipient_id, None)
+
+    def visible(self, recipient_id, game):
+        """
+        Runs the spatial query for one recipient.
+
+        Args:
+            recipient_id: Player id of the recipient.
+            game (Game): Players are read from game.players, bullets column-wise
+                from game.bullets.
+
+        Returns:
+            tuple: (player_ids, bullet_ids) as sets; None if the recipient has
+                no player in the game (everything is visible then). Bullets
+                visible last time that have left the pool stay in bullet_ids,
+                so their tombstones reach the recipient.
+        """
+        me = game.players.get(recipient_id)
+        if me is None:
+            return None
+        cx, cy = me.x, me.y
+
+        previous = self.visible_players.get(recipient_id, ())
+        player_ids = {recipient_id}
+        for player_id, player in game.players.items():
+            extra = self.margin if player_id in previous else 0.0
+            if (abs(player.x - cx) <= self.half_width + extra and
+                    abs(player.y - cy) <= self.half_height + extra):
+                player_ids.add(player_id)
+
+        pool = game.bullets
+        previous_bullets = self.visible_bullets.get(recipient_id)
+        if len(pool):
+            rows = pool.rows()
+            ids = pool.ids[rows]
+            extra = np.zeros(ids.size)
+            if previous_bullets is not None and len(previous_bullets):
+                extra[np.isin(ids, previous_bullets, assume_unique=True)] = self.margin
+            mask = ((np.abs(pool.x[rows] - cx) <= self.half_width + extra) &
+                    (np.abs(pool.y[rows] - cy) <= self.half_height + extra))
+            bullet_ids = ids[mask]
+        else:
+            ids = bullet_ids = pool.ids[:0]
+
+        self.visible_players[recipient_id] = player_ids
+        self.visible_bullets[recipient_id] = bullet_ids
+        visible_bullets = set(bullet_ids.tolist())
+        if previous_bullets is not None and len(previous_bullets):
+            # Havuzdan çıkanlar: varsa tombstone'ları bu snapshot'ta gider
+            visible_bullets.update(previous_bullets[~np.isin(previous_bullets, ids, assume_unique=True)].tolist())
+        return player_ids, visible_bullets
+
+    @staticmethod
+    def filter_state(game_state, visible):
+        """
+        Returns:
+            dict: game_state with only the visible players and bullets.
+        """
+        if visible is None:
+            return game_state
+        player_ids, bullet_ids = visible
+        return dict(
+            game_state,
+            players=[p for p in game_state["players"] if p["player_id"] in player_ids],
+            bullets=[b for b in game_state["bullets"] if b["id"] in bullet_ids]
+        )
@@ -0,0 +1,98 @@
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+import hashlib
+import json
+from collections import OrderedDict
+from collision_map import CollisionMap
+from Utils.validation import Validation
+
+
+class MapRegistry:
+    """
+    Process-wide cache of compiled maps, keyed by a content hash of the
+    validated platform data.
+
+    Each distinct map is compiled once into an immutable CollisionMap that
+    every room using it shares by reference. Rooms acquire a map by key and
+    release it when they are removed; maps no room holds any more are kept
+    in an LRU of at most max_idle entries, so switching back to a recent map
+    is free and old ones are eventually dropped.
+    """
+
+    def __init__(self, max_idle=8):
+        self.max_idle = max_idle
+        self.maps = {}
+        self.ref_counts = {}
+        self.idle = OrderedDict()
+
+    @staticmethod
+    def content_key(platforms):
+        """
+        Validates the platforms and hashes their geometry.
+
+        Args:
+            platforms (list): Raw platform dicts.
+
+        Returns:
+            tuple: (key, validated_platforms). Platform order and non-geometry
+                fields such as tile_count do not change the key.
+        """
+        validated = []
+        for platform in platforms:
+            validated_platform = Validation.validate_platform_data(platform)
+            if validated_platform:
+                validated.append(validated_platform)
+
+        geometry = sorted((p["x"], p["y"], p["width"], p["height"]) for p in validated)
+        key = hashlib.sha1(json.dumps(geometry).encode()).hexdigest()
+        return key, validated
+
+    def acquire_platforms(self, platforms):
+        """
+        Acquires the compiled map for raw platform data, compiling it if this
+        content was never seen before (or was evicted).
+
+        Returns:
+            tuple: (key, CollisionMap)
+        """
+        key, validated = self.content_key(platforms)
+        if key not in self.maps:
+            self.maps[key] = CollisionMap(validated)
+            self.ref_counts[key] = 0
+        return key, self.acquire(key)
+
+    def acquire(self, key):
+        """
+        Takes a reference to an already registered map.
+
+        Raises:
+            KeyError: If no map with this key is registered.
+        """
+        collision_map = self.maps[key]
+        self.ref_counts[key] += 1
+        self.idle.pop(key, None)
+        return collision_map
+
+    def release(self, key):
+        """Drops a reference taken by acquire()/acquire_platforms()."""
+        if key not in self.ref_counts or self.ref_counts[key] <= 0:
+            return
+        self.ref_counts[key] -= 1
+        if self.ref_counts[key] > 0:
+            return
+
+        self.idle[key] = None
+        while len(self.idle) > self.max_idle:
+            old_key, _ = self.idle.popitem(last=False)
+            del self.maps[old_key]
+            del self.ref_counts[old_key]
+
+    def __contains__(self, key):
+        return key in self.maps
+
+    def __len__(self):
+        return len(self.maps)
+
+
+# Tüm odalar aynı registry'yi paylaşır
+map_registry = MapRegistry()
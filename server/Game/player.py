@@ -1,42 +1,63 @@
 import math
 import random
+import time
+from input_buffer import InputBuffer
 
 class Player:
-    
+    """
+    Server-side state of one player.
+
+    The layout is fixed by __slots__ and the position is kept as two scalar
+    floats (x, y); position is a tuple view of them for code that reads or
+    assigns both at once. Tuning values shared by every player are class
+    attributes instead of per-instance fields.
+    """
+    __slots__ = (
+        "id", "username", "connection", "x", "y", "direction", "side",
+        "health", "is_alive", "score", "velocity_x", "velocity_y",
+        "is_on_ground", "input_buffer", "current_direction", "jump_count"
+    )
+    speed = 200
+    gravity = 800.0
+    jump_force = 400.0
+    player_width = 34
+    player_height = 68
+    max_jumps = 2
+
     def __init__(self, id, username, connection):
         self.id = id
         self.username = username
         self.connection = connection
-        self.position = tuple([0,0]) # tuple(x,y)
-        self.direction = tuple([0,0]) # (dx,dy)
+        self.x = 0.0
+        self.y = 0.0
+        self.direction = (0, 0) # (dx,dy)
+        self.side = None
         self.health = 100.0
         self.is_alive = True
         self.score = 0.0
-        self.speed = 200
-        self.bullets = list()
         self.velocity_x = 0.0
         self.velocity_y = 0.0
-        self.gravity = 800.0
-        self.jump_force = 400.0
         self.is_on_ground = False
-        self.player_width = 34
-        self.player_height = 68
-        self.input_buffer = []
-        self.max_jumps = 2
+        self.input_buffer = InputBuffer()
+        self.current_direction = (0, 0)
         self.jump_count = 0
 
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+    @position.setter
+    def position(self, value):
+        self.x = float(value[0])
+        self.y = float(value[1])
+
     def add_input_to_buffer(self, direction, timestamp=None):
         """
         Add input to buffer for processing on next physics tick
         """
-        if not hasattr(self, 'input_buffer'):
-            self.input_buffer = []
-        
-        import time
         if timestamp is None:
             timestamp = time.time()
-        
-        self.input_buffer.append((direction, timestamp))
+        self.input_buffer.add(direction, timestamp)
         #print(f"Player {self.id} buffered input: {direction}")
 
     def process_buffered_inputs(self, delta_time):
@@ -68,12 +89,13 @@ class Player:
         if not self.can_move():
             return
         
-        # Initialize input buffer and current direction if they don't exist
-        if not hasattr(self, 'input_buffer'):
-            self.input_buffer = []
-        if not hasattr(self, 'current_direction'):
-            self.current_direction = (0, 0)
-        
+        self.apply_inputs()
+        self.integrate(delta_time, platforms)
+
+    def apply_inputs(self):
+        """
+        Consumes the buffered inputs: direction, horizontal velocity and jumps.
+        """
         # Process all buffered inputs from this tick
         jump_triggered = False
         
@@ -109,14 +131,18 @@ class Player:
             self.is_on_ground = False
             self.jump_count += 1
             #print(f"Player {self.id} jumping! velocity_y: {self.velocity_y}, jump_count: {self.jump_count}")
-        
+
+    def integrate(self, delta_time, platforms):
+        """
+        Moves the player by its velocity under gravity and lands it on platforms.
+        """
         # Apply gravity if not on ground
         if not self.is_on_ground:
             self.velocity_y += self.gravity * delta_time
         
         # Calculate new positions using velocities
-        new_x = self.position[0] + self.velocity_x * delta_time
-        new_y = self.position[1] + self.velocity_y * delta_time
+        new_x = self.x + self.velocity_x * delta_time
+        new_y = self.y + self.velocity_y * delta_time
         
         # Check platform collisions
         collision_result = self.check_platform_collisions(new_x, new_y, platforms)
@@ -130,7 +156,8 @@ class Player:
         else:
             self.is_on_ground = False
         
-        self.position = (new_x, new_y)
+        self.x = new_x
+        self.y = new_y
         #print(f"Player {self.id} - pos: {self.position}, velocity: ({self.velocity_x}, {self.velocity_y}), on_ground: {self.is_on_ground}, jumps: {self.jump_count}/{self.max_jumps}")
 
 
@@ -195,12 +222,17 @@ class Player:
     def check_platform_collisions(self, x, y, platforms):
         """
         Platform collision detection
+
+        Args:
+            platforms (CollisionMap): Only the platforms near the player's feet
+                are tested, top-most first.
         """
         player_bottom = y + self.player_height
         player_left = x
         player_right = x + self.player_width
-        
-        for platform in platforms:
+
+        # Sadece ayak hizasındaki platformlara bak
+        for platform in platforms.query(player_left, player_bottom - 5, player_right, player_bottom):
             if (player_right > platform["x"] and 
                 player_left < platform["x"] + platform["width"] and
                 self.velocity_y >= 0 and  # Düşüyor
@@ -211,8 +243,12 @@ class Player:
         
         return None
     
-    def attack_multiplier(self):
-        return random.choices([0, 1, 3, 5], weights=[10, 80, 8, 2], k=1 )[0]
+    def attack_multiplier(self, rng=random):
+        """
+        Args:
+            rng: Random source, the game's own RNG so matches can be replayed.
+        """
+        return rng.choices([0, 1, 3, 5], weights=[10, 80, 8, 2], k=1 )[0]
         
     def can_move(self):
         if self.is_alive:
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+class PositionHistory:
+    """
+    Fixed-size ring of recent player positions, one row per tick.
+
+    All storage is allocated up front: a (capacity x slots) array per axis,
+    where every player owns a slot (column) while it is in the game and row
+    tick % capacity holds the positions recorded at that tick. record()
+    overwrites the oldest row in place, so keeping the history costs no
+    allocation per tick and its memory never grows.
+
+    Lag compensation uses it to test a bullet against where the players
+    were on the shooter's screen: each player has a rewind, in ticks, that
+    bullets it fires carry, and positions() returns the players as they were
+    that many ticks ago. A rewind never reaches past max_rewind, past the
+    oldest recorded row, or to before a player joined or was last moved by
+    the server (reset()); in those cases the current position is used.
+    """
+
+    def __init__(self, max_rewind, slots):
+        """
+        Parameters:
+            max_rewind (int): Most ticks a hit test can go back.
+            slots (int): Players that can be tracked at once; players beyond
+                this are always tested at their current position.
+        """
+        self.max_rewind = max(0, int(max_rewind))
+        self.capacity = self.max_rewind + 1
+        self.slots = max(1, int(slots))
+        self.xs = np.zeros((self.capacity, self.slots), dtype=np.float64)
+        self.ys = np.zeros((self.capacity, self.slots), dtype=np.float64)
+        # Satırın hangi tick'e ait olduğu, -1 boş
+        self.row_ticks = np.full(self.capacity, -1, dtype=np.int64)
+        # Slot'un geçerli geçmişinin başladığı tick
+        self.since = np.zeros(self.slots, dtype=np.int64)
+        self.rewind = np.zeros(self.slots, dtype=np.int64)
+        self.slot_of = {}
+        self.free = list(range(self.slots - 1, -1, -1))
+        self.tick = -1
+
+    def add(self, player_id):
+        """Gives the player a slot; returns it, or None if all are taken."""
+        if player_id in self.slot_of:
+            return self.slot_of[player_id]
+        if not self.free:
+            return None
+        slot = self.free.pop()
+        self.slot_of[player_id] = slot
+        self.rewind[slot] = 0
+        self.since[slot] = self.tick + 1
+        return slot
+
+    def remove(self, player_id):
+        slot = self.slot_of.pop(player_id, None)
+        if slot is not None:
+            self.free.append(slot)
+
+    def reset(self, player_id=None):
+        """
+        Drops the recorded past of one player (all players if None), e.g.
+        after a respawn teleported it; hit tests use its current position
+        until new ticks are recorded.
+        """
+        if player_id is None:
+            self.since[:] = self.tick + 1
+            return
+        slot = self.slot_of.get(player_id)
+        if slot is not None:
+            self.since[slot] = self.tick + 1
+
+    def set_rewind(self, player_id, ticks):
+        """
+        Sets how far back bullets fired by the player are tested.
+
+        Returns:
+            int: The rewind actually used, clamped to [0, max_rewind].
+        """
+        ticks = min(max(0, int(ticks)), self.max_rewind)
+        slot = self.slot_of.get(player_id)
+        if slot is not None:
+            self.rewind[slot] = ticks
+        return ticks
+
+    def rewind_of(self, player_id):
+        slot = self.slot_of.get(player_id)
+        return 0 if slot is None else int(self.rewind[slot])
+
+    def record(self, players):
+        """
+        Stores the current position of every tracked player as the next tick.
+
+        Parameters:
+            players (dict): player_id -> Player, e.g. Game.players.
+        """
+        self.tick += 1
+        row = self.tick % self.capacity
+        xs = self.xs[row]
+        ys = self.ys[row]
+        for player_id, slot in self.slot_of.items():
+            player = players[player_id]
+            xs[slot] = player.x
+            ys[slot] = player.y
+        self.row_ticks[row] = self.tick
+
+    def positions(self, player_ids, rewinds, current_x, current_y):
+        """
+        Player positions as seen rewinds ticks ago, one row per rewind.
+
+        Parameters:
+            player_ids (list): Players, the columns of the result.
+            rewinds (ndarray): Rewind in ticks of every row.
+            current_x (ndarray): Current x of the players, used wherever
+                there is no valid history.
+            current_y (ndarray): Current y, same order.
+
+        Returns:
+            tuple: (xs, ys), arrays of shape (len(rewinds), len(player_ids)).
+        """
+        slot_of = self.slot_of
+        slots = np.array([slot_of.get(player_id, -1) for player_id in player_ids], dtype=np.int64)
+        target = self.tick - np.minimum(rewinds, self.max_rewind)
+        rows = target % self.capacity
+        valid = ((self.row_ticks[rows] == target) & (target >= 0))[:, None] & (slots >= 0)[None, :]
+        valid &= target[:, None] >= self.since[slots][None, :]
+        xs = np.where(valid, self.xs[rows[:, None], slots[None, :]], current_x[None, :])
+        ys = np.where(valid, self.ys[rows[:, None], slots[None, :]], current_y[None, :])
+        return xs, ys
+
+    def position_at(self, player_id, rewind):
+        """
+        Scalar form of positions(): (x, y) of one player rewind ticks ago,
+        or None if there is no valid history that far back.
+        """
+        slot = self.slot_of.get(player_id)
+        if slot is None:
+            return None
+        target = self.tick - min(int(rewind), self.max_rewind)
+        row = target % self.capacity
+        if target < 0 or self.row_ticks[row] != target or target < self.since[slot]:
+            return None
+        return float(self.xs[row, slot]), float(self.ys[row, slot])
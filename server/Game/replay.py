@@ -0,0 +1,316 @@
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+import json
+import struct
+import time
+import zlib
+from game import Game
+from collision_map import CollisionMap
+
+
+# Kayıt tipleri; her kaydın başı <BI: tip, tick
+JOIN = 1
+LEAVE = 2
+MAP = 3
+START = 4
+MOVE = 5
+SHOOT = 6
+RESPAWN = 7
+END = 8
+LAG_COMPENSATION = 9
+REWIND = 10
+
+RECORD_HEAD = struct.Struct("<BI")
+RECORDS = {
+    JOIN: struct.Struct("<BIqH"),      # + username (utf-8)
+    LEAVE: struct.Struct("<BIq"),
+    MAP: struct.Struct("<BII"),        # + JSON
+    START: struct.Struct("<BI"),
+    MOVE: struct.Struct("<BIqdd"),
+    SHOOT: struct.Struct("<BIqdddd"),
+    RESPAWN: struct.Struct("<BIq"),
+    END: struct.Struct("<BII"),        # tick sayısı, state_checksum
+    LAG_COMPENSATION: struct.Struct("<BIII"),  # max_rewind, slots
+    REWIND: struct.Struct("<BIqI"),
+}
+PLAYER_STATE = struct.Struct("<qdddddd?")
+
+
+def state_checksum(game):
+    """
+    CRC32 of the simulation state: every player's position, velocity,
+    health, score and alive flag, and every bullet in the pool. Two games
+    with the same checksum after the same ticks took the same path.
+    """
+    crc = 0
+    for player in game.players.values():
+        crc = zlib.crc32(PLAYER_STATE.pack(
+            int(player.id), player.x, player.y, player.velocity_x, player.velocity_y,
+            float(player.health), float(player.score), bool(player.is_alive)
+        ), crc)
+    bullets = game.bullets
+    rows = bullets.rows()
+    for column in (bullets.ids, bullets.x, bullets.y, bullets.alive):
+        crc = zlib.crc32(column[rows].tobytes(), crc)
+    return crc
+
+
+class InputLog:
+    """
+    Compact append-only log of everything a deterministic Game was fed.
+
+    Game calls it from add_player, remove_player, set_map, start_game,
+    update_player_position, fire_bullet, respawn_player,
+    enable_lag_compensation and set_player_rewind after the input took
+    effect, and from tick() to count ticks. Every record carries the number
+    of ticks that ran before it, so a replay applies it at exactly the same
+    point of the simulation. Together with the RNG seed in the header
+    that is all a Replayer needs to re-simulate the match.
+
+    File layout: MAGIC, uint32 header length, JSON header, then fixed-size
+    little-endian records (see RECORDS), a MOVE is 29 bytes. Records are
+    buffered and written in chunks of flush_size bytes; close() writes an
+    END record with the final state_checksum().
+
+    Usage:
+        game.make_deterministic(seed)
+        game.recorder = InputLog(path, seed, 1 / 60)
+        ...
+        game.recorder.close(state_checksum(game))
+    """
+    MAGIC = b"K2IL"
+    VERSION = 1
+
+    def __init__(self, path, seed, delta_time, flush_size=64 * 1024, game_duration=None):
+        """
+        Parameters:
+            path (str): File to write, truncated if it exists.
+            seed (int): Seed the game was made deterministic with.
+            delta_time (float): Fixed simulation step of the recorded game.
+            flush_size (int): Buffered bytes that trigger a write.
+            game_duration (float): Match length, if the game does not use
+                Game.GAME_DURATION.
+        """
+        self.path = path
+        self.seed = seed
+        self.delta_time = delta_time
+        self.flush_size = flush_size
+        self.ticks = 0
+        self.records = 0
+        self.buffer = bytearray()
+        self.file = open(path, "wb")
+        header = {
+            "version": self.VERSION,
+            "seed": seed,
+            "delta_time": delta_time,
+            "recorded_at": time.time()
+        }
+        if game_duration is not None:
+            header["game_duration"] = game_duration
+        header = json.dumps(header).encode()
+        self.file.write(self.MAGIC + struct.pack("<I", len(header)) + header)
+
+    def _append(self, data):
+        self.buffer += data
+        self.records += 1
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer and self.file:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+    def tick(self):
+        self.ticks += 1
+
+    def join(self, player_id, username):
+        name = str(username).encode()
+        self._append(RECORDS[JOIN].pack(JOIN, self.ticks, int(player_id), len(name)) + name)
+
+    def leave(self, player_id):
+        self._append(RECORDS[LEAVE].pack(LEAVE, self.ticks, int(player_id)))
+
+    def map(self, collision_map, width, height):
+        data = json.dumps({
+            "rects": [dict(rect) for rect in collision_map.rects],
+            "cell_size": collision_map.cell_size,
+            "margin": collision_map.margin,
+            "width": width,
+            "height": height
+        }).encode()
+        self._append(RECORDS[MAP].pack(MAP, self.ticks, len(data)) + data)
+
+    def start(self):
+        self._append(RECORDS[START].pack(START, self.ticks))
+
+    def move(self, player_id, direction):
+        self._append(RECORDS[MOVE].pack(MOVE, self.ticks, int(player_id), direction[0], direction[1]))
+
+    def shoot(self, player_id, position, direction):
+        self._append(RECORDS[SHOOT].pack(
+            SHOOT, self.ticks, int(player_id), position[0], position[1], direction[0], direction[1]
+        ))
+
+    def respawn(self, player_id):
+        self._append(RECORDS[RESPAWN].pack(RESPAWN, self.ticks, int(player_id)))
+
+    def lag_compensation(self, max_rewind, slots):
+        self._append(RECORDS[LAG_COMPENSATION].pack(LAG_COMPENSATION, self.ticks, max_rewind, slots))
+
+    def rewind(self, player_id, ticks):
+        self._append(RECORDS[REWIND].pack(REWIND, self.ticks, int(player_id), ticks))
+
+    def close(self, checksum=0):
+        """Writes the END record and closes the file; safe to call twice."""
+        if self.file is None:
+            return
+        self._append(RECORDS[END].pack(END, self.ticks, checksum & 0xFFFFFFFF))
+        self.flush()
+        self.file.close()
+        self.file = None
+
+
+def read_input_log(path):
+    """
+    Reads an InputLog file.
+
+    Returns:
+        tuple: (header dict, list of records). A record is a tuple starting
+            with its type and tick, followed by the fields of RECORDS; JOIN
+            ends with the username and MAP with the decoded map dict. A log
+            cut short by a crash simply ends at its last complete record.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != InputLog.MAGIC:
+        raise ValueError(f"{path} is not an input log")
+    (header_size,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + header_size])
+    if header.get("version") != InputLog.VERSION:
+        raise ValueError(f"unsupported input log version {header.get('version')}")
+
+    records = []
+    offset = 8 + header_size
+    end = len(data)
+    while offset + RECORD_HEAD.size <= end:
+        kind = data[offset]
+        layout = RECORDS.get(kind)
+        if layout is None:
+            raise ValueError(f"unknown record type {kind} at byte {offset}")
+        if offset + layout.size > end:
+            break
+        record = layout.unpack_from(data, offset)
+        offset += layout.size
+        if kind == JOIN or kind == MAP:
+            size = record[-1]
+            if offset + size > end:
+                break
+            payload = data[offset:offset + size]
+            offset += size
+            record = record[:-1] + (payload.decode() if kind == JOIN else json.loads(payload),)
+        records.append(record)
+    return header, records
+
+
+class Replayer:
+    """
+    Re-simulates a recorded match headless, as fast as the CPU allows.
+
+    The game is rebuilt with the logged seed, every record is applied after
+    the same number of ticks as in the recording, and when the log has an
+    END record the final state_checksum() is compared to the recorded one.
+
+    Usage:
+        result = Replayer("room3.k2log").run()
+        result["checksum_match"], result["ticks_per_second"]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header, self.records = read_input_log(path)
+        self.delta_time = float(self.header["delta_time"])
+
+    def new_game(self):
+        game = Game()
+        game.make_deterministic(self.header["seed"])
+        if "game_duration" in self.header:
+            game.GAME_DURATION = self.header["game_duration"]
+        return game
+
+    def apply(self, game, record):
+        """Feeds one record to the game the way the live room did."""
+        kind = record[0]
+        if kind == MOVE:
+            game.update_player_position(record[2], (record[3], record[4]))
+        elif kind == SHOOT:
+            game.fire_bullet(record[2], (record[3], record[4]), (record[5], record[6]))
+        elif kind == RESPAWN:
+            game.respawn_player(record[2])
+        elif kind == JOIN:
+            game.add_player(record[2], record[3], None)
+        elif kind == LEAVE:
+            game.remove_player(record[2])
+        elif kind == START:
+            # GameRoom.start_game gibi
+            game.assign_starting_positions()
+            game.start_game()
+        elif kind == REWIND:
+            game.set_player_rewind(record[2], record[3])
+        elif kind == LAG_COMPENSATION:
+            game.enable_lag_compensation(record[2], record[3])
+        elif kind == MAP:
+            data = record[2]
+            game.set_map(CollisionMap(data["rects"], data["cell_size"], data["margin"]),
+                         data["width"], data["height"])
+
+    def run(self, game=None):
+        """
+        Parameters:
+            game (Game): Game to replay into, a fresh one from new_game() if
+                None (e.g. pass one with a profiler attached).
+
+        Returns:
+            dict: Ticks simulated, wall time, speedup over real time, final
+                scores and whether the checksum matched (None without END).
+                errors counts records the game rejected, which only happens
+                once a replay has diverged from the recording.
+        """
+        if game is None:
+            game = self.new_game()
+        delta_time = self.delta_time
+        ticks = 0
+        errors = 0
+        expected = None
+        started = time.perf_counter()
+        for record in self.records:
+            target = record[1]
+            while ticks < target:
+                game.tick(delta_time)
+                ticks += 1
+            if record[0] == END:
+                expected = record[2]
+                break
+            try:
+                self.apply(game, record)
+            except Exception:
+                # Canlı sunucu da handler hatalarını yutar; ancak sapmış bir replay'de olur
+                errors += 1
+        wall_time = time.perf_counter() - started
+
+        checksum = state_checksum(game)
+        sim_time = ticks * delta_time
+        return {
+            "ticks": ticks,
+            "records": len(self.records),
+            "errors": errors,
+            "sim_time": sim_time,
+            "wall_time": wall_time,
+            "ticks_per_second": ticks / wall_time if wall_time > 0 else 0.0,
+            "speedup": sim_time / wall_time if wall_time > 0 else 0.0,
+            "scores": {player.username: player.score for player in game.players.values()},
+            "winner_info": game.winner_info,
+            "checksum": checksum,
+            "expected_checksum": expected,
+            "checksum_match": None if expected is None else checksum == expected
+        }
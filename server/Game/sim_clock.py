@@ -0,0 +1,31 @@
+class SimClock:
+    """
+    Clock that only moves when the simulation says so.
+
+    A Game running on a SimClock measures its match time in simulated
+    seconds (Game.tick advances it by delta_time), so the same inputs end
+    the match on the same tick no matter how fast the ticks actually run.
+    It also counts its ticks and remembers the last step, so the match
+    length can be checked as a whole number of ticks instead of against a
+    float sum that drifts below the duration (1800 steps of 1/60 add up
+    to slightly less than 30.0).
+
+    Usage:
+        clock = SimClock()
+        clock()            # 0.0
+        clock.advance(1/60)
+    """
+    __slots__ = ("now", "ticks", "step")
+
+    def __init__(self, start=0.0):
+        self.now = float(start)
+        self.ticks = 0
+        self.step = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, delta_time):
+        self.now += delta_time
+        self.ticks += 1
+        self.step = delta_time
@@ -0,0 +1,106 @@
+"""
+BulletPool bookkeeping: slots, generations and counters.
+
+Run from server/: python -m pytest -q Game/test_bullet_pool.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from bullet_pool import BulletPool
+
+
+def counters(pool):
+    return (pool.count, pool.high, pool.free_count, pool.recycled, pool.spawned)
+
+
+@pytest.mark.parametrize("pos, dir_vec, extra", (
+    (("a", 0), (1, 0), {}),
+    ((0, 0), ("x", 0), {}),
+    ((0,), (1, 0), {}),
+    ((0, 0), (1,), {}),
+    (None, (1, 0), {}),
+    ((0, 0), None, {}),
+    ((0, 0), (1, 0), {"speed": "fast"}),
+    ((0, 0), (1, 0), {"damage": None}),
+    ((0, 0), (1, 0), {"radius": [2]}),
+))
+def test_malformed_spawn_leaves_pool_unchanged(pos, dir_vec, extra):
+    pool = BulletPool()
+    first = pool.spawn(1, (10, 10), (1, 0))
+    pool.spawn(1, (20, 10), (1, 0))
+    pool.alive[pool.row_of(first)] = False
+    # Bir slotu serbest bırak ki hem free list hem high yolu denensin
+    pool.release_dead()
+    before = counters(pool)
+    for _ in range(2):
+        with pytest.raises((TypeError, ValueError, IndexError)):
+            pool.spawn(1, pos, dir_vec, **extra)
+        assert counters(pool) == before
+    # Sağlam bir spawn serbest slotu yeniden kullanır
+    bullet_id = pool.spawn(1, (30, 10), (0, 2))
+    assert bullet_id & BulletPool.SLOT_MASK == first & BulletPool.SLOT_MASK
+    assert (pool.count, pool.high, pool.free_count) == (2, 2, 0)
+    row = pool.row_of(bullet_id)
+    assert (float(pool.dx[row]), float(pool.dy[row])) == (0.0, 1.0)
+
+
+def kill(pool, bullet_id):
+    pool.alive[pool.row_of(bullet_id)] = False
+
+
+def test_tombstones_are_off_by_default():
+    pool = BulletPool()
+    kill(pool, pool.spawn(1, (10, 10), (1, 0)))
+    pool.release_dead()
+    assert pool.tombstones is None
+    pool.snapshot_taken()
+
+
+def test_tombstone_only_for_deaths_no_snapshot_reported():
+    pool = BulletPool()
+    pool.enable_tombstones()
+    seen_alive = pool.spawn(1, (10, 10), (1, 0))
+    seen_dead = pool.spawn(2, (20, 10), (1, 0))
+    kill(pool, seen_dead)
+    pool.snapshot_taken()
+    never_seen = pool.spawn(3, (30, 10), (0, 1))
+    kill(pool, seen_alive)
+    kill(pool, never_seen)
+    pool.release_dead()
+    # Yalnızca canlı raporlanıp ölümü raporlanmayan mermi kalır
+    assert pool.tombstones == [(seen_alive, 1, 10.0, 10.0, 1.0, 0.0)]
+    assert pool.count == 0
+    pool.snapshot_taken()
+    assert pool.tombstones == []
+
+
+def test_recycled_slot_starts_unreported():
+    pool = BulletPool()
+    pool.enable_tombstones()
+    first = pool.spawn(1, (10, 10), (1, 0))
+    pool.snapshot_taken()
+    kill(pool, first)
+    pool.release_dead()
+    pool.snapshot_taken()
+    second = pool.spawn(1, (10, 10), (1, 0))
+    assert second & BulletPool.SLOT_MASK == first & BulletPool.SLOT_MASK
+    kill(pool, second)
+    pool.release_dead()
+    assert pool.tombstones == []
+
+
+def test_tombstones_do_not_change_slot_reuse():
+    def spawned_ids(pool):
+        ids = [pool.spawn(1, (i, 10), (1, 0)) for i in range(10)]
+        pool.snapshot_taken()
+        for bullet_id in ids[::3]:
+            kill(pool, bullet_id)
+        pool.release_dead()
+        return ids + [pool.spawn(1, (i, 20), (1, 0)) for i in range(5)]
+
+    plain, tracked = BulletPool(), BulletPool()
+    tracked.enable_tombstones()
+    assert spawned_ids(plain) == spawned_ids(tracked)
+    assert len(tracked.tombstones) == 4
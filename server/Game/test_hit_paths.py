@@ -0,0 +1,200 @@
+"""
+Seeded equivalence checks of the hit detection paths: the batched NumPy
+paths against the per-object scalar ones, and the swept times of impact
+against brute-force sub-stepping of the same move.
+
+Run from server/: python -m pytest -q Game/test_hit_paths.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import math
+import random
+import numpy as np
+import pytest
+from game import Game
+from bullet import Bullet
+from bullet_pool import BulletPool
+from collision_map import (CollisionMap, segment_circle_toi, segment_rect_toi,
+                           sweep_circle_toi)
+from replay import state_checksum
+from Utils.logger import Logger, LogLevel
+
+SEEDS = range(10)
+SUBSTEPS = 400
+
+
+def random_platforms(rng, count=40):
+    """Ground plus count thin (16 px) and thick platforms, like the extractor sends."""
+    platforms = [{"x": 8.0, "y": 533.0, "width": 1152.0, "height": 128.0}]
+    for _ in range(count):
+        platforms.append({
+            "x": float(rng.randrange(0, 1100)),
+            "y": float(rng.randrange(0, 520)),
+            "width": float(rng.choice((16, 32, 64, 128, 384))),
+            "height": float(rng.choice((16, 16, 32, 80)))
+        })
+    return platforms
+
+
+def circle_touches_rect(x, y, radius, rect):
+    nearest_x = min(max(x, rect["x"]), rect["x"] + rect["width"])
+    nearest_y = min(max(y, rect["y"]), rect["y"] + rect["height"])
+    return (x - nearest_x) ** 2 + (y - nearest_y) ** 2 <= radius * radius
+
+
+def random_move(rng):
+    x, y = rng.uniform(0, 1152), rng.uniform(0, 648)
+    angle = rng.uniform(0, 2 * math.pi)
+    length = rng.choice((0.0, 8.3, 25.0, 50.0, 90.0))
+    return x, y, math.cos(angle) * length, math.sin(angle) * length
+
+
+def play(seed, vectorized, lag_compensation, ticks=600):
+    """Plays a seeded 4 player match and returns the state checksum of every tick."""
+    rng = random.Random(seed)
+    game = Game()
+    game.make_deterministic(seed)
+    game.VECTORIZED_HITS = vectorized
+    # Her iki taraf da aynı step() yolunu kullansın, yalnızca isabet testi farklı
+    game.bullets.SCALAR_BELOW = 0
+    if lag_compensation:
+        game.enable_lag_compensation(12, 4)
+    game.set_map(CollisionMap(random_platforms(random.Random(seed))))
+    for player_id in range(1, 5):
+        game.add_player(player_id, f"p{player_id}", None)
+    game.assign_starting_positions()
+    game.start_game()
+
+    checksums = []
+    for _ in range(ticks):
+        for player_id, player in game.players.items():
+            if not player.is_alive:
+                if rng.random() < 0.05:
+                    game.respawn_player(player_id)
+                continue
+            game.update_player_position(player_id, (rng.choice((-1, 0, 1)), -1 if rng.random() < 0.03 else 0))
+            if rng.random() < 0.3:
+                if lag_compensation:
+                    game.set_player_rewind(player_id, rng.randint(0, 20))
+                target = game.players[rng.choice([other for other in game.players if other != player_id])]
+                game.fire_bullet(player_id, (player.x, player.y), (target.x - player.x, target.y - player.y))
+        game.tick(1 / 60)
+        checksums.append(state_checksum(game))
+    return checksums
+
+
+def setup_module():
+    Logger.configure(level=LogLevel.ERROR)
+
+
+@pytest.mark.parametrize("lag_compensation", (False, True))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vectorized_hits_match_scalar(seed, lag_compensation):
+    assert play(seed, True, lag_compensation) == play(seed, False, lag_compensation)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sweep_circles_matches_scalar_toi(seed):
+    rng = random.Random(seed)
+    collision_map = CollisionMap(random_platforms(rng))
+    moves = [random_move(rng) for _ in range(2000)]
+    xs, ys, dxs, dys = (np.array(column) for column in zip(*moves))
+    # 20 büyük yarıçaplar için margin'i aşan yolu dener
+    for radius in (2.0, 5.0, 20.0):
+        toi = collision_map.sweep_circles(xs, ys, dxs, dys, np.full(len(xs), radius))
+        for i, (x, y, dx, dy) in enumerate(moves):
+            expected = None
+            for rect in collision_map.rects:
+                t = segment_rect_toi(x, y, dx, dy, rect["x"], rect["y"], rect["width"], rect["height"], radius)
+                if t is not None and (expected is None or t < expected):
+                    expected = t
+            if expected is None:
+                assert toi[i] == np.inf
+            else:
+                assert toi[i] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("count", (3, 40))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_query_returns_every_touching_platform(seed, count):
+    rng = random.Random(seed)
+    collision_map = CollisionMap(random_platforms(rng, count))
+    for _ in range(500):
+        left, top = rng.uniform(-50, 1150), rng.uniform(-50, 640)
+        right, bottom = left + rng.choice((0.0, 5.0, 40.0, 150.0)), top + rng.choice((0.0, 5.0, 60.0))
+        found = list(collision_map.query(left, top, right, bottom))
+        assert found == [rect for rect in collision_map.rects if rect in found]
+        for rect in collision_map.rects:
+            if (rect["x"] <= right and rect["x"] + rect["width"] >= left and
+                    rect["y"] <= bottom and rect["y"] + rect["height"] >= top):
+                assert rect in found
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_rect_toi_matches_substepping(seed):
+    rng = random.Random(seed)
+    rects = CollisionMap(random_platforms(rng, count=10)).rects
+    for _ in range(300):
+        x, y, dx, dy = random_move(rng)
+        radius = rng.choice((2.0, 5.0))
+        rect = rng.choice(rects)
+        toi = segment_rect_toi(x, y, dx, dy, rect["x"], rect["y"], rect["width"], rect["height"], radius)
+        first = next((k / SUBSTEPS for k in range(SUBSTEPS + 1)
+                      if circle_touches_rect(x + dx * k / SUBSTEPS, y + dy * k / SUBSTEPS, radius, rect)), None)
+        if first is not None:
+            # Örnekte değiyorsa swept sonuç en geç o an olmalı
+            assert toi is not None and toi <= first + 1e-9
+        if toi is not None:
+            assert circle_touches_rect(x + dx * toi, y + dy * toi, radius + 1e-6, rect)
+            assert first is None or first >= toi - 1 / SUBSTEPS
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_circle_toi_matches_substepping(seed):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(300):
+        x, y, dx, dy = random_move(rng)
+        cx, cy = x + rng.uniform(-60, 60), y + rng.uniform(-60, 60)
+        radius = rng.choice((7.0, 25.0))
+        cases.append((x, y, dx, dy, cx, cy, radius))
+        toi = segment_circle_toi(x, y, dx, dy, cx, cy, radius)
+        first = next((k / SUBSTEPS for k in range(SUBSTEPS + 1)
+                      if math.hypot(x + dx * k / SUBSTEPS - cx, y + dy * k / SUBSTEPS - cy) <= radius), None)
+        if first is not None:
+            assert toi is not None and toi <= first + 1e-9
+        if toi is not None:
+            assert math.hypot(x + dx * toi - cx, y + dy * toi - cy) <= radius + 1e-6
+            assert first is None or first >= toi - 1 / SUBSTEPS
+
+    columns = [np.array(column) for column in zip(*cases)]
+    vectorized = sweep_circle_toi(*columns)
+    for i, case in enumerate(cases):
+        expected = segment_circle_toi(*case)
+        assert vectorized[i] == (np.inf if expected is None else pytest.approx(expected, abs=1e-9))
+
+
+@pytest.mark.parametrize("scalar_below", (0, BulletPool.MAX_SLOTS))
+@pytest.mark.parametrize("rate", (60, 20, 10))
+def test_bullet_matches_pool_row(rate, scalar_below):
+    rng = random.Random(rate)
+    collision_map = CollisionMap(random_platforms(rng))
+    pool = BulletPool()
+    pool.SCALAR_BELOW = scalar_below
+    bullets = []
+    for _ in range(200):
+        x, y, dx, dy = random_move(rng)
+        bullets.append(Bullet(1, (x, y), (dx, dy or 1.0), speed=500, damage=10, radius=5.0))
+        pool.spawn(1, (x, y), (dx, dy or 1.0), speed=500, damage=10, radius=5.0)
+    for _ in range(rate):
+        pool.step(1 / rate, collision_map, Game.MAP_WIDTH, Game.MAP_HEIGHT)
+        for row, bullet in enumerate(bullets):
+            if not bullet.alive:
+                continue
+            bullet.update(1 / rate, collision_map)
+            if not 0 < bullet.x < Game.MAP_WIDTH or not 0 < bullet.y < Game.MAP_HEIGHT:
+                bullet.alive = False
+            assert (bullet.x, bullet.y, bullet.alive) == pytest.approx(
+                (float(pool.x[row]), float(pool.y[row]), bool(pool.alive[row])), abs=1e-9)
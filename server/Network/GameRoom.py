@@ -3,10 +3,17 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from Game.game import Game
+from Game.map_registry import map_registry
+from Game.interest import InterestFilter
+from Game.replay import InputLog, state_checksum
 import json
 import asyncio
+from websockets.asyncio.server import broadcast as ws_broadcast
 from Utils.protocol import Protocol
+from Utils.snapshot import SnapshotHistory
+from Utils.logger import Logger, LogType
 import time
+from collections import OrderedDict
 from enum import Enum
 
 class GameRoomState(Enum):
@@ -16,17 +23,45 @@ class GameRoomState(Enum):
 
 class GameRoom:
     room_counter = 0
-    def __init__(self,max_player = 4):
+    # Gecikme tahmininde yeni örneğin ağırlığı (TCP SRTT gibi)
+    RTT_SMOOTHING = 0.125
+    def __init__(self,max_player = 4, sim_rate = 30, snapshot_rate = 30, view_size = (1152, 648)):
+        """
+        Args:
+            max_player (int): Room capacity.
+            sim_rate (int): Simulation steps per second, the rate tick() is called at.
+            snapshot_rate (int): Game state snapshots sent to clients per second,
+                at most sim_rate.
+            view_size (tuple): (width, height) a client sees around its player.
+                On maps larger than this each client only gets the entities
+                in its view (see InterestFilter).
+        """
         self.room_id = GameRoom.room_counter
         self.players = list()
         self.max_player = max_player
         self.game = Game()
+        # Snapshot'lar arasında ölen mermiler de client'a "alive: false" olarak gitsin
+        self.game.bullets.enable_tombstones()
         GameRoom.room_counter += 1 
         self.status = GameRoomState.WAITING.value
         self.protocol = Protocol()
         self.map_loaded = False
         self.platforms = None
+        self.map_key = None
         self.minimum_player_num = 2
+        self.snapshots = SnapshotHistory()
+        self.sim_rate = sim_rate
+        self.snapshot_rate = min(snapshot_rate, sim_rate)
+        self.snapshot_interval = 1 / self.snapshot_rate
+        # Son snapshot'tan beri simüle edilen süre
+        self.snapshot_accumulator = 0.0
+        self.sim_tick = 0
+        self.view_size = view_size
+        # TickProfiler, profiling kapalıyken None (bkz. set_profiler)
+        self.profiler = None
+        self.frame_send_time = 0.0
+        # Harita tek ekrana sığıyorsa None, herkes her şeyi görür
+        self.interest = None
         
     def min_player_reached(self):
         return len(self.players) >= self.minimum_player_num
@@ -41,11 +76,13 @@ class GameRoom:
         """
         return len(self.players) == self.max_player 
         
-    def add_player(self, ws, player_info):
+    def add_player(self, ws, player_info, outbound=None):
         """
         Parameters:
             ws: WebSocket object of the connecting player.
             player_info: A dictionary containing player info (id, username, etc.).
+            outbound: The connection's OutboundQueue; without one frames are
+                written to ws directly.
 
         Purpose: Adds a new player to the room’s self.players list.
         
@@ -64,7 +101,14 @@ class GameRoom:
                 {
                     "id" : player_info["player_id"],
                     "websocket" : ws,
-                    "player_info" : player_info
+                    "outbound" : outbound,
+                    "player_info" : player_info,
+                    "ack_seq" : None,
+                    # Snapshot ack'lerinden yumuşatılmış round-trip, tick cinsinden
+                    "rtt_ticks" : None,
+                    # seq -> (player ids, bullet ids) bu client'a gönderilenler
+                    "visible" : OrderedDict(),
+                    "encoding" : self.protocol.negotiate_encoding(player_info.get("encoding"))
                 }
             )
             self.game.add_player(player_info["player_id"],player_info["username"],ws)
@@ -90,6 +134,8 @@ class GameRoom:
                 if player["websocket"] == ws:
                     self.players.remove(player)
                     self.game.remove_player(player["id"])
+                    if self.interest is not None:
+                        self.interest.forget(player["id"])
                     message = self.protocol.serialize_leave(player["id"])
                     await self.broadcast(message)
                     return True
@@ -115,38 +161,229 @@ class GameRoom:
 
         data = json.dumps(message)
 
-        websockets_to_send = [
-            player["websocket"]
+        recipients = [
+            player
             for player in self.players
             if player["websocket"] != exclude_ws
         ]
+        self.send_frame(data, recipients)
 
-        if websockets_to_send:
-            await asyncio.gather(
-                *(ws.send(data) for ws in websockets_to_send),
-                return_exceptions=True
-            )
+    def send_frame(self, data, recipients, snapshot=False):
+        """
+        Parameters:
+            data: An already encoded frame (str for text, bytes for binary).
+            recipients: Player entries of self.players.
+            snapshot: True for game state frames, which replace a snapshot
+                the client has not received yet instead of queueing behind it.
+
+        Purpose: Hands one encoded frame to many connections without awaiting.
+
+        What it should do:
+            Put the frame on every recipient's OutboundQueue, whose own task
+            writes it, so a slow client never delays the room's tick.
+            Recipients without a queue get it through websockets' broadcast,
+            which skips sockets whose buffer is full.
+        """
+        if recipients:
+            profiler = self.profiler
+            start = profiler.now() if profiler else 0.0
+            direct = []
+            for player in recipients:
+                outbound = player["outbound"]
+                if outbound is None:
+                    direct.append(player["websocket"])
+                elif snapshot:
+                    outbound.put_snapshot(data)
+                else:
+                    outbound.put(data)
+            if direct:
+                ws_broadcast(direct, data)
+            if profiler:
+                self.frame_send_time += profiler.now() - start
     
     
-    async def broadcast_game_state(self, game_state):
+    def broadcast_game_state(self, game_state):
         """
         Parameters:
-            game_state: The current game state data (positions, scores, etc.).
+            game_state: The current game state data (positions, scores, remaining time, etc.).
 
-        Purpose: Sends the entire game state to all connected players.
+        Purpose: Sends the game state to all connected players.
 
         What it should do:
-            Serialize and broadcast the latest game state each tick.
+            Store the snapshot and send each client only what changed since
+            the snapshot it acknowledged last. Clients that never acknowledged
+            one (just joined, older clients) or whose baseline is too old get
+            the full snapshot. Clients that negotiated the binary encoding
+            always get a full binary frame. Each distinct frame is encoded
+            once and handed to all its recipients through send_frame().
+            With an interest filter every client gets its own frame holding
+            only the entities in its view.
 
         Usage:
             Called inside the game loop to synchronize clients with the server state.
         """
-        await self.broadcast(
-            {
-                "type": "game_state",
-                "data": game_state
-            }
-        )
+        seq = self.snapshots.push(game_state, self.sim_tick)
+        if self.interest is not None:
+            self.broadcast_filtered_game_state(game_state, seq)
+            return
+
+        groups = {}
+        binary_players = []
+        for player in self.players:
+            if player["encoding"] == Protocol.BINARY_ENCODING:
+                binary_players.append(player)
+                continue
+            base_seq = player["ack_seq"]
+            if base_seq not in self.snapshots:
+                base_seq = None
+            groups.setdefault(base_seq, []).append(player)
+
+        for base_seq, recipients in groups.items():
+            delta = self.snapshots.delta(base_seq, seq) if base_seq is not None else None
+            if delta is None:
+                message = {
+                    "type": "game_state",
+                    "data": dict(game_state, seq=seq, tick=self.sim_tick)
+                }
+            else:
+                delta["remaining_time"] = game_state.get("remaining_time")
+                delta["tick"] = self.sim_tick
+                message = self.protocol.serialize_game_state_delta(seq, base_seq, delta)
+            self.send_frame(json.dumps(message), recipients, snapshot=True)
+
+        if binary_players:
+            self.send_frame(self.protocol.serialize_game_state_binary(game_state, seq, self.sim_tick), binary_players, snapshot=True)
+
+    def broadcast_filtered_game_state(self, game_state, seq):
+        """
+        Parameters:
+            game_state: Snapshot already pushed to self.snapshots as seq.
+
+        Purpose: Per-recipient variant of broadcast_game_state() used when the
+            interest filter is on. Deltas are computed between what the client
+            saw in its acknowledged snapshot and what it sees now, so entities
+            leaving the view arrive as removed ones.
+        """
+        for player in self.players:
+            visible = self.interest.visible(player["id"], self.game)
+            history = player["visible"]
+            history[seq] = visible
+            while len(history) > self.snapshots.size:
+                history.popitem(last=False)
+
+            state = InterestFilter.filter_state(game_state, visible)
+            if player["encoding"] == Protocol.BINARY_ENCODING:
+                self.send_frame(self.protocol.serialize_game_state_binary(state, seq, self.sim_tick), [player], snapshot=True)
+                continue
+
+            base_seq = player["ack_seq"]
+            delta = None
+            if base_seq in self.snapshots and base_seq in history:
+                delta = self.snapshots.delta(base_seq, seq, history[base_seq], visible)
+            if delta is None:
+                message = {
+                    "type": "game_state",
+                    "data": dict(state, seq=seq, tick=self.sim_tick)
+                }
+            else:
+                delta["remaining_time"] = game_state.get("remaining_time")
+                delta["tick"] = self.sim_tick
+                message = self.protocol.serialize_game_state_delta(seq, base_seq, delta)
+            self.send_frame(json.dumps(message), [player], snapshot=True)
+
+    def set_profiler(self, profiler):
+        """
+        Parameters:
+            profiler: TickProfiler, or None to switch profiling off.
+
+        Purpose: Attaches the profiler to the room and its game.
+        """
+        self.profiler = profiler
+        self.game.profiler = profiler
+        self.game.profile_id = self.room_id
+
+    def enable_recording(self, path, seed):
+        """
+        Parameters:
+            path: File the room's input log is written to.
+            seed: Seed of the room's RNG, stored in the log.
+
+        Purpose: Makes the room's game deterministic and records every input
+            it gets, so the match can be replayed (see Game/replay.py).
+
+        Usage:
+            Right after the room is created, before any player or map is added.
+        """
+        self.game.make_deterministic(seed)
+        self.game.recorder = InputLog(path, seed, 1 / self.sim_rate)
+        Logger.send_log(LogType.GAME_INFO, "Recording room", room_id=self.room_id, path=path, seed=seed)
+
+    def stop_recording(self):
+        """
+        Purpose: Closes the input log with the final state checksum.
+
+        Usage:
+            When the match ends or the room is removed; no-op if not recording.
+        """
+        recorder = self.game.recorder
+        if recorder is not None:
+            self.game.recorder = None
+            recorder.close(state_checksum(self.game))
+
+    def enable_lag_compensation(self, max_rewind):
+        """
+        Parameters:
+            max_rewind: Most seconds a hit test goes back in time.
+
+        Purpose: Hit tests bullets against where the players were on the
+            shooter's screen instead of where they are now. The room keeps a
+            preallocated position history of max_rewind seconds and rewinds
+            each shooter by its latency, estimated from snapshot acks (see
+            update_rewind). Clients that never ack are not rewound.
+
+        Usage:
+            Right after the room is created (after enable_recording).
+        """
+        self.game.enable_lag_compensation(round(max_rewind * self.sim_rate), self.max_player)
+
+    def update_rewind(self, player, seq):
+        """
+        Parameters:
+            player: Room entry of the client that acknowledged seq.
+            seq: Snapshot sequence number it received.
+
+        Purpose: Updates the client's round-trip estimate with the ticks that
+            passed since seq was taken and sets its rewind to the age of what
+            it sees when it shoots: the round trip plus, on average, half a
+            snapshot interval.
+        """
+        sent_tick = self.snapshots.tick_of(seq)
+        if sent_tick is None:
+            return
+        sample = self.sim_tick - sent_tick
+        rtt = player["rtt_ticks"]
+        rtt = sample if rtt is None else rtt + self.RTT_SMOOTHING * (sample - rtt)
+        player["rtt_ticks"] = rtt
+        view_delay = rtt + self.sim_rate / self.snapshot_rate / 2
+        self.game.set_player_rewind(player["id"], round(view_delay))
+
+    def ack_snapshot(self, ws, seq):
+        """
+        Parameters:
+            ws: WebSocket of the acknowledging client.
+            seq: Snapshot sequence number the client received, or None to ask
+                for a full snapshot next time (e.g. after packet loss).
+
+        Purpose: Moves the client's delta baseline forward.
+        """
+        for player in self.players:
+            if player["websocket"] == ws:
+                if seq is None or seq in self.snapshots:
+                    player["ack_seq"] = seq
+                    if seq is not None and self.game.history is not None:
+                        self.update_rewind(player, seq)
+                return True
+        return False
     
     async def broadcast_winner_info(self):
         """
@@ -168,7 +405,7 @@ class GameRoom:
         )
         # Change room status to finished
         self.status = GameRoomState.FINISHED.value
-        print(f"[GameRoom] Winner info broadcasted: {self.game.winner_info}")
+        Logger.send_log(LogType.GAME_INFO, "Winner info broadcasted", room_id=self.room_id, winner_info=self.game.winner_info)
             
     
     def find_player_by_id(self, player_id):
@@ -219,14 +456,16 @@ class GameRoom:
         """   
         self.game.assign_starting_positions()
         self.status = "in_progress"
-        self.game.status = 2
-        self.game.start_time = time.time()
+        self.game.start_game()
         await self.broadcast({
             "type": "game_start",
             "data": {
                 "room_id": self.room_id,
                 "game_state": self.game.get_game_state(),
                 "status": self.status,
+                # İstemci interpolasyonu için: snapshot'lar arası tick = sim_rate / snapshot_rate
+                "sim_rate": self.sim_rate,
+                "snapshot_rate": self.snapshot_rate,
             }
         })
         
@@ -249,7 +488,8 @@ class GameRoom:
         """
 
         self.players.clear()
-        print("jdfkgred")
+        self.stop_recording()
+        Logger.send_log(LogType.GAME_INFO, "Room finished", room_id=self.room_id)
     
     def reset_room(self):
         """
@@ -275,10 +515,11 @@ class GameRoom:
         What it should do:
             Update game state (self.game.update_game_state()).
             Perform hit detection, score updates.
-            Call broadcast_game_state() to sync with clients.
+            Call broadcast_game_state() every snapshot_interval of simulated
+            time to sync with clients.
 
         Usage:
-            Called periodically (e.g., 60 times per second) by the server.
+            Called sim_rate times per second by the server.
         """
 
 
@@ -292,12 +533,24 @@ class GameRoom:
                 return
 
             self.game.tick(delta_time)
-            game_state = self.game.get_game_state()
-            #perform hit detection
-            #update health
-            #update score
-            await self.broadcast_game_state(game_state)
-            await self.broadcast(self.game.broadcast_remaining_time())
+            self.sim_tick += 1
+            self.snapshot_accumulator += delta_time
+            # Yarım adım tolerans: 60/20 gibi oranlarda float hatası snapshot kaçırmasın
+            if self.snapshot_accumulator + delta_time / 2 >= self.snapshot_interval:
+                self.snapshot_accumulator -= self.snapshot_interval
+                profiler = self.profiler
+                start = profiler.now() if profiler else 0.0
+                game_state = self.game.get_game_state()
+                if profiler:
+                    start = profiler.record(self.room_id, "snapshot", start)
+                    self.frame_send_time = 0.0
+                # Tek frame: oyun durumu + kalan süre
+                self.broadcast_game_state(game_state)
+                if profiler:
+                    # Encode ve gönderim iç içe; gönderim süresi send_frame'de toplanır
+                    end = profiler.now()
+                    profiler.record(self.room_id, "encode", start, end - self.frame_send_time)
+                    profiler.record(self.room_id, "broadcast", end - self.frame_send_time, end)
             
 
     
@@ -340,101 +593,83 @@ class GameRoom:
         """
         pass
     
-    def apply_player_move(self, move_data):
-        x, y, direction, player_id = move_data
-        #print("direction:", direction)
-
-        self.game.update_player_position(int(player_id), direction)
+    def apply_player_move(self, player_id, move_data):
+        """
+        Parameters:
+            player_id: ID of the sending session's player.
+            move_data: (x, y, direction, player_id) from deserialize_move; the
+                player_id the client put in the message is ignored, a client
+                can only steer its own player.
+        """
+        x, y, direction, _ = move_data
+        self.game.update_player_position(player_id, direction)
         
     def apply_player_shoot(self, player_id,shoot_data):
         direction,position = shoot_data
         self.game.fire_bullet(player_id, position,direction)
     
     def apply_player_respawn(self,player_id):
-        print("apply_player_respawn")
         self.game.respawn_player(player_id)
         
     def load_map_data(self, platforms, map_metadata=None):
         """
         Platform verilerini yükler - duplicate kontrolü ile
+
+        The compiled map comes from the shared map_registry, so rooms playing
+        the same map share one CollisionMap.
         """
         # Eğer zaten map yüklüyse, duplicate kontrolü yap
-        if self.map_loaded and self.platforms:
-            if self.is_same_map_data(platforms):
-                #print(f"Room {self.room_id}: Aynı map data zaten yüklü, atlanıyor")
-                return False  # Duplicate, yükleme
-        print(platforms)
-        # Yeni map data'sını yükle
-        self.platforms = platforms
-        self.map_loaded = True
-        self.map_metadata = map_metadata or {}
-        self.game.platforms = self.platforms
-        print(f"Room {self.room_id}: {len(platforms)} platform yüklendi")
-        
-        # Platform verilerini optimize et
-        self.optimize_platforms()
+        if self.map_loaded and self.is_same_map_data(platforms):
+            return False  # Duplicate, yükleme
+
+        map_key, collision_map = map_registry.acquire_platforms(platforms)
+        self.set_map(map_key, collision_map, map_metadata)
         return True
-    
-    def is_same_map_data(self, new_platforms):
+
+    def load_map(self, map_key, map_metadata=None):
         """
-        Yeni gelen platform data'sının aynı olup olmadığını kontrol eder
+        Parameters:
+            map_key: Content key of a map already in map_registry.
+
+        Purpose: Attaches a registered map to the room without touching the
+            platform data, this is what GameServer.create_room uses.
         """
-        # Platform sayısı farklı ise kesinlikle farklı
-        if len(new_platforms) != len(self.platforms):
+        if self.map_loaded and self.map_key == map_key:
             return False
-        
-        # Platform sayısı aynı ise ilk 3 platformun koordinatlarını karşılaştır
-        check_count = min(3, len(new_platforms))
-        
-        for i in range(check_count):
-            old_p = self.platforms[i]
-            new_p = new_platforms[i]
-            
-            # Koordinat farkı 1 pikselden fazla ise farklı map
-            if (abs(old_p.get("x", 0) - new_p.get("x", 0)) > 1 or
-                abs(old_p.get("y", 0) - new_p.get("y", 0)) > 1 or
-                abs(old_p.get("width", 0) - new_p.get("width", 0)) > 1 or
-                abs(old_p.get("height", 0) - new_p.get("height", 0)) > 1):
-                return False
-        
-        # İlk 3 platform aynı ise muhtemelen aynı map
-        #print(f"Room {self.room_id}: Map data duplicate detected")
+        self.set_map(map_key, map_registry.acquire(map_key), map_metadata)
         return True
-    
-    def optimize_platforms(self):
+
+    def set_map(self, map_key, collision_map, map_metadata=None):
+        self.unload_map()
+        self.map_key = map_key
+        self.platforms = collision_map
+        self.map_loaded = True
+        self.map_metadata = map_metadata or {}
+        self.game.set_map(collision_map, self.map_metadata.get("width"), self.map_metadata.get("height"))
+        view_width, view_height = self.view_size
+        if self.game.map_width > view_width or self.game.map_height > view_height:
+            self.interest = InterestFilter(view_width, view_height)
+        else:
+            self.interest = None
+
+    def unload_map(self):
+        """
+        Purpose: Releases the room's reference on its shared map.
+
+        Usage:
+            When the room is removed, so the registry can evict unused maps.
         """
-        Platform verilerini optimize eder
+        if self.map_key is not None:
+            map_registry.release(self.map_key)
+            self.map_key = None
+            self.map_loaded = False
+
+    def is_same_map_data(self, new_platforms):
         """
-        original_count = len(self.platforms)
-        
-        # Çok küçük platformları filtrele
-        min_size = 8
-        self.platforms = [
-            p for p in self.platforms 
-            if p.get("width", 0) >= min_size and p.get("height", 0) >= min_size
-        ]
-        
-        # Platformları Y koordinatına göre sırala (collision detection için)
-        self.platforms.sort(key=lambda p: p.get("y", 0))
-        
-        # Duplicate platformları temizle
-        unique_platforms = []
-        for platform in self.platforms:
-            is_duplicate = False
-            for existing in unique_platforms:
-                if (abs(existing["x"] - platform["x"]) < 1 and
-                    abs(existing["y"] - platform["y"]) < 1 and
-                    abs(existing["width"] - platform["width"]) < 1 and
-                    abs(existing["height"] - platform["height"]) < 1):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_platforms.append(platform)
-        
-        self.platforms = unique_platforms
-        
-        #print(f"Platform optimization: {original_count} -> {len(self.platforms)} platforms")
+        Yeni gelen platform data'sının aynı olup olmadığını kontrol eder
+        """
+        new_key, _ = map_registry.content_key(new_platforms)
+        return new_key == self.map_key
 
 def main():
     gameroom = GameRoom()
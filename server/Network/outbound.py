@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from collections import deque
+from websockets.exceptions import ConnectionClosed
+from Utils.logger import Logger, LogType
+
+
+class OutboundQueue:
+    """
+    Outgoing frames of one connection, written by its own task so that no
+    room or handler ever awaits a client's socket.
+
+    Reliable frames (join, game_start, game_end, leave, errors) are sent in
+    order. Game state snapshots are not queued: a new one replaces the one
+    still waiting, so a client that cannot keep up gets the newest state
+    instead of a growing backlog (deltas are computed against the client's
+    acknowledged snapshot, so a skipped snapshot needs no special handling).
+
+    A connection is a slow consumer, and gets disconnected, when its reliable
+    backlog passes max_pending frames or max_pending_bytes, or when one send
+    has been blocked for stall_timeout seconds.
+    """
+    # 1008 = policy violation
+    SLOW_CLOSE_CODE = 1008
+
+    def __init__(self, websocket, max_pending=64, max_pending_bytes=1 << 20, stall_timeout=5.0):
+        """
+        Args:
+            websocket: The connection frames are written to.
+            max_pending (int): High-water mark of queued reliable frames.
+            max_pending_bytes (int): High-water mark of queued reliable data.
+            stall_timeout (float): Longest a single send may block, in seconds.
+        """
+        self.websocket = websocket
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        self.stall_timeout = stall_timeout
+        self.reliable = deque()
+        self.reliable_bytes = 0
+        self.snapshot = None
+        self.closed = False
+        self.wakeup = asyncio.Event()
+        # Süren send'in başladığı an, yoksa None
+        self.send_started = None
+        self.sent = 0
+        self.coalesced = 0
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def put(self, frame):
+        """
+        Queues a reliable frame.
+
+        Returns:
+            bool: False if the connection is closed or was just dropped as a slow consumer.
+        """
+        if self.closed:
+            return False
+        self.reliable.append(frame)
+        self.reliable_bytes += len(frame)
+        if len(self.reliable) > self.max_pending or self.reliable_bytes > self.max_pending_bytes:
+            self.drop_slow_consumer("reliable backlog")
+            return False
+        self.wakeup.set()
+        return True
+
+    def put_snapshot(self, frame):
+        """
+        Makes frame the pending snapshot, replacing one that was not sent yet.
+
+        Returns:
+            bool: False if the connection is closed or was just dropped as a slow consumer.
+        """
+        if self.closed:
+            return False
+        if self.send_started is not None and time.monotonic() - self.send_started > self.stall_timeout:
+            self.drop_slow_consumer("send stalled")
+            return False
+        if self.snapshot is not None:
+            self.coalesced += 1
+        self.snapshot = frame
+        self.wakeup.set()
+        return True
+
+    async def run(self):
+        try:
+            while not self.closed:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                while self.reliable or self.snapshot is not None:
+                    if self.reliable:
+                        frame = self.reliable.popleft()
+                        self.reliable_bytes -= len(frame)
+                    else:
+                        frame, self.snapshot = self.snapshot, None
+                    self.send_started = time.monotonic()
+                    await self.websocket.send(frame)
+                    self.send_started = None
+                    self.sent += 1
+        except ConnectionClosed:
+            pass
+        finally:
+            self.closed = True
+
+    def drop_slow_consumer(self, reason):
+        Logger.send_log(LogType.CLIENT_INFO, "Disconnecting slow consumer", rate=5,
+                        address=self.websocket.remote_address, reason=reason,
+                        pending=len(self.reliable), pending_bytes=self.reliable_bytes)
+        self.close()
+        asyncio.get_running_loop().create_task(
+            self.websocket.close(self.SLOW_CLOSE_CODE, "slow consumer")
+        )
+
+    def close(self):
+        """Stops the writer and drops everything still queued."""
+        self.closed = True
+        self.reliable.clear()
+        self.reliable_bytes = 0
+        self.snapshot = None
+        self.task.cancel()
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "pending": len(self.reliable),
+            "pending_bytes": self.reliable_bytes
+        }
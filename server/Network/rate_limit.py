@@ -0,0 +1,41 @@
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: allows `rate` events per second on average
+    with bursts of up to `burst` events. take() is O(1) and refills lazily
+    from the clock, so an idle bucket costs nothing.
+    """
+    __slots__ = ("rate", "burst", "tokens", "last", "clock", "dropped")
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            burst (float): Bucket size, the most events allowed back to back.
+            clock (callable): Monotonic time source in seconds.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.clock = clock
+        self.last = clock()
+        self.dropped = 0
+
+    def take(self):
+        """
+        Returns:
+            bool: True if the event is allowed, False (and counted in dropped) if not.
+        """
+        now = self.clock()
+        tokens = self.tokens + (now - self.last) * self.rate
+        self.last = now
+        if tokens > self.burst:
+            tokens = self.burst
+        if tokens < 1.0:
+            self.tokens = tokens
+            self.dropped += 1
+            return False
+        self.tokens = tokens - 1.0
+        return True
@@ -0,0 +1,168 @@
+import time
+
+
+class RoomClock:
+    """
+    Fixed-timestep bookkeeping for one room.
+
+    Attributes:
+        step (float): The room's fixed simulation step, in seconds.
+        phase (float): Offset of the room's ticks inside the tick interval, in seconds.
+        next_due (float): Clock time of the room's next tick.
+        last_time (float): Clock time the accumulator was last advanced to.
+        accumulator (float): Wall time not simulated yet.
+        ticks (int): Fixed steps run.
+        late_ticks (int): Steps run as catch-up because the room fell behind.
+        overruns (int): Wakeups whose steps took longer than one tick interval.
+        dropped_steps (int): Steps thrown away because the backlog exceeded max_catch_up.
+    """
+
+    def __init__(self, phase, now, step):
+        self.step = step
+        self.phase = phase
+        self.next_due = now + phase
+        self.last_time = self.next_due - step
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.late_ticks = 0
+        self.overruns = 0
+        self.dropped_steps = 0
+
+    def stats(self):
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "overruns": self.overruns,
+            "dropped_steps": self.dropped_steps
+        }
+
+
+class TickScheduler:
+    """
+    Runs every room at a fixed simulation step, decoupled from how late the
+    event loop wakes up.
+
+    Each room has its own accumulator: wall time that passed since its last
+    wakeup is added to it and consumed in whole steps of the room's own
+    simulation rate (1/tick_rate unless the room was added with one), so
+    simulation time follows wall time even when a tick overruns. At most
+    max_catch_up steps are run per wakeup; a larger backlog is dropped (and
+    counted) instead of spiralling.
+
+    Rooms get phase offsets spread over the tick interval, so their ticks
+    are interleaved instead of all running at the same instant.
+
+    Usage:
+        scheduler = TickScheduler(30)
+        scheduler.add(room)
+        while running:
+            for room, steps, step in scheduler.due():
+                started = scheduler.clock()
+                for _ in range(steps):
+                    await room.tick(step)
+                scheduler.finish(room, started)
+            await asyncio.sleep(scheduler.time_until_next())
+    """
+
+    # Accumulator may borrow this fraction of a step from the next interval
+    SLACK = 0.25
+
+    def __init__(self, tick_rate, max_catch_up=4, clock=time.perf_counter):
+        """
+        Args:
+            tick_rate (int): Default simulation steps per second.
+            max_catch_up (int): Most steps a room runs in one wakeup.
+            clock (callable): Monotonic time source in seconds.
+        """
+        self.step = 1 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.clocks = {}
+        self.rooms = {}
+        self.slot_counter = 0
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def next_phase(self, step):
+        """
+        Phase for the next room: the bit-reversed room counter as a fraction
+        of the interval (0, 1/2, 1/4, 3/4, 1/8, ...), which keeps any number
+        of rooms evenly spread without re-phasing existing ones.
+        """
+        n = self.slot_counter
+        self.slot_counter += 1
+        fraction, scale = 0.0, 0.5
+        while n:
+            if n & 1:
+                fraction += scale
+            n >>= 1
+            scale /= 2
+        return fraction * step
+
+    def add(self, room, tick_rate=None):
+        """
+        Args:
+            room (GameRoom): Room to schedule, keyed by room_id.
+            tick_rate (int): The room's simulation rate, the scheduler's default if None.
+        """
+        if room.room_id in self.rooms:
+            return
+        step = 1 / tick_rate if tick_rate else self.step
+        self.rooms[room.room_id] = room
+        self.clocks[room.room_id] = RoomClock(self.next_phase(step), self.clock(), step)
+
+    def remove(self, room_id):
+        self.rooms.pop(room_id, None)
+        self.clocks.pop(room_id, None)
+
+    def due(self):
+        """
+        Advances the accumulators of rooms whose tick is due.
+
+        Returns:
+            list: (room, steps, step) tuples, steps being the number of fixed
+                steps of length step the room has to run now.
+        """
+        now = self.clock()
+        due = []
+        for room_id, clock in self.clocks.items():
+            if clock.next_due > now:
+                continue
+            clock.accumulator += now - clock.last_time
+            clock.last_time = now
+            # Uyanma gecikmesindeki titreşim 0/2 adım arasında gidip gelmesin
+            steps = int(clock.accumulator / clock.step + self.SLACK)
+            if steps > self.max_catch_up:
+                # Yetişemiyoruz, fazlasını at
+                clock.dropped_steps += steps - self.max_catch_up
+                clock.accumulator -= (steps - self.max_catch_up) * clock.step
+                steps = self.max_catch_up
+            clock.accumulator -= steps * clock.step
+            clock.ticks += steps
+            if steps > 1:
+                clock.late_ticks += steps - 1
+            # Fazı koruyarak bir sonraki tick zamanı
+            clock.next_due += clock.step * (int((now - clock.next_due) / clock.step) + 1)
+            if steps:
+                due.append((self.rooms[room_id], steps, clock.step))
+        return due
+
+    def finish(self, room, started):
+        """Records how long the room's steps took; anything above one interval is an overrun."""
+        clock = self.clocks.get(room.room_id)
+        if clock is not None and self.clock() - started > clock.step:
+            clock.overruns += 1
+
+    def time_until_next(self):
+        """Seconds until the earliest room tick, one interval if there are no rooms."""
+        if not self.clocks:
+            return self.step
+        return max(0.0, min(c.next_due for c in self.clocks.values()) - self.clock())
+
+    def stats(self):
+        """
+        Returns:
+            dict: { room_id: RoomClock.stats() }
+        """
+        return {room_id: clock.stats() for room_id, clock in self.clocks.items()}
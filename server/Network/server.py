@@ -2,14 +2,26 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
 import asyncio
+import random
+import time
 from websockets.asyncio.server import serve
 from websockets.exceptions import ConnectionClosedOK,ConnectionClosedError
-from Utils.logger import Logger, LogType
+from Utils.logger import Logger, LogType, LogLevel
 from Utils.protocol import Protocol, MessageType
 import json
 from GameRoom import GameRoom, GameRoomState
-import time
+from Game.map_registry import map_registry
+from session import SessionRegistry
+from outbound import OutboundQueue
+from rate_limit import TokenBucket
+from scheduler import TickScheduler
+from Utils.profiler import TickProfiler
+
+# Godot'daki varsayılan haritanın platformları
+STOCK_MAP_PLATFORMS = [{'x': 8.0, 'y': 533.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 549.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 565.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 581.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 597.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 613.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 629.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 645.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 376.0, 'y': 197.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 213.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 229.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 245.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 261.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 232.0, 'y': 341.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 232.0, 'y': 357.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 104.0, 'y': 405.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 104.0, 'y': 421.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 776.0, 'y': 341.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 776.0, 'y': 357.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 920.0, 'y': 421.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 920.0, 'y': 437.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}]
+
 
 class GameServer: 
     """
@@ -28,25 +40,73 @@ class GameServer:
             max_rooms (int): Maximum number of active rooms allowed.
         
         Attributes:
-            clients (set): Stores connected client websockets.
+            sessions (SessionRegistry): Connected clients, indexed by websocket, id and username.
             rooms (list): List of active GameRoom instances.
             host (str): Server IP/hostname.
             port (int): Server port.
             server (WebSocketServer): Reference to the running WebSocket server.
+            tick_rate (int): Simulation steps per second of new rooms.
+            snapshot_rate (int): Game state snapshots sent per second by new rooms.
+            map_size (tuple): World (width, height) of new rooms.
+            view_size (tuple): Area around a player its client receives entities from.
+            outbound_max_pending, outbound_max_bytes, outbound_stall_timeout:
+                High-water marks and stall limit after which a client is
+                disconnected as a slow consumer.
+            move_rate_limit, shoot_rate_limit (tuple): (rate, burst) of the
+                per-connection token buckets; messages above it are dropped.
         """
         self.host = host
         self.port = port
         self.rooms = {}
-        self.clients = {}
+        self.sessions = SessionRegistry()
         self.max_rooms = max_rooms
         self.server = None
         self.protocol = Protocol()
+        # Client interpolasyon yapana kadar her tick bir snapshot gönderilir
         self.tick_rate = 30
+        self.snapshot_rate = 30
+        # Harita boyutu ve client görüş alanı; harita büyükse interest filter açılır
+        self.map_size = (1152, 648)
+        self.view_size = (1152, 648)
+        # Yavaş client politikası, bkz. OutboundQueue
+        self.outbound_max_pending = 64
+        self.outbound_max_bytes = 1 << 20
+        self.outbound_stall_timeout = 5.0
+        # (saniyede mesaj, burst); client MOVE'u her physics frame'de gönderir
+        self.move_rate_limit = (90, 30)
+        self.shoot_rate_limit = (10, 5)
         self.running = True
-        self.last_time = time.time()
-        self.map_platforms = [{'x': 8.0, 'y': 533.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 549.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 565.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 581.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 597.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 613.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 629.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 8.0, 'y': 645.0, 'width': 1152.0, 'height': 16.0, 'tile_count': 72}, {'x': 376.0, 'y': 197.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 213.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 229.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 245.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 376.0, 'y': 261.0, 'width': 384.0, 'height': 16.0, 'tile_count': 24}, {'x': 232.0, 'y': 341.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 232.0, 'y': 357.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 104.0, 'y': 405.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 104.0, 'y': 421.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 776.0, 'y': 341.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 776.0, 'y': 357.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 920.0, 'y': 421.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}, {'x': 920.0, 'y': 437.0, 'width': 64.0, 'height': 16.0, 'tile_count': 4}]
+        self.scheduler = TickScheduler(self.tick_rate)
+        # enable_profiling() ile açılır
+        self.profiler = None
+        # Dolu ise her oda deterministik çalışır ve input log'unu buraya yazar
+        self.record_dir = None
+        # Lag compensation'da en fazla geri sarma (saniye), 0 kapalı
+        self.max_rewind = 0.2
+        self.map_platforms = list(STOCK_MAP_PLATFORMS)
+        self.map_key, _ = map_registry.acquire_platforms(self.map_platforms)
 
         self.max_player_for_game_room = 2
+        self.message_handlers = self.build_message_handlers()
+        # Sharded modda worker bu callback ile acceptor'a durum bildirir
+        self.on_lobby_change = None
+
+    def build_message_handlers(self):
+        """
+        Builds the message type -> handler table used by process_client_message.
+
+        Returns:
+            dict: { MessageType value: coroutine function(websocket, message) }
+        """
+        return {
+            MessageType.JOIN.value: self.handle_client_join,
+            MessageType.MOVE.value: self.handle_client_move,
+            MessageType.SHOOT.value: self.handle_client_shoot,
+            MessageType.RESPAWN.value: self.handle_client_respawn,
+            MessageType.ACK.value: self.handle_client_ack,
+            # MessageType.MAP.value: self.handle_map_data,
+        }
+
     async def start_server(self):
         """
         Starts the WebSocket server and listens for incoming connections.
@@ -71,58 +131,60 @@ class GameServer:
             path (str): URL path for WebSocket connection.
         
         Should:
-            - Add the client to the `clients` set.
+            - Open a session for the client.
             - Wait for messages from the client.
             - Parse messages and call relevant handlers.
             - Remove client on disconnect.
         """
-        Logger.send_log(LogType.CLIENT_INFO,f"Client connected : {websocket.remote_address}")
-        self.clients[GameServer.player_counter] = {"websocket": websocket}
+        Logger.send_log(LogType.CLIENT_INFO, "Client connected", address=websocket.remote_address)
+        outbound = OutboundQueue(websocket, self.outbound_max_pending,
+                                 self.outbound_max_bytes, self.outbound_stall_timeout)
+        session = self.sessions.open(GameServer.player_counter, websocket, outbound)
+        session.move_limit = TokenBucket(*self.move_rate_limit)
+        session.shoot_limit = TokenBucket(*self.shoot_rate_limit)
         message = self.protocol.serialize_connect(GameServer.player_counter)
         GameServer.player_counter += 1
-        await websocket.send(message)
+        self.notify_lobby_change()
+        outbound.put(message)
         try: 
             async for message in websocket:
                 #Logger.send_log(LogType.CLIENT_INFO ,f"Received message from client : {message}")
                 decoded_message = self.protocol.decode_message(message)
                 await self.process_client_message(websocket,decoded_message)
         except ConnectionClosedOK:
-            Logger.send_log(LogType.CLIENT_INFO, f"Client disconnected")
+            Logger.send_log(LogType.CLIENT_INFO, "Client disconnected")
         except ConnectionClosedError:
-            Logger.send_log(LogType.CLIENT_INFO, f"Client disconnected")
+            Logger.send_log(LogType.CLIENT_INFO, "Client disconnected")
         finally:
-            for client in self.clients.keys():
-                if self.clients[client]["websocket"] == websocket:
-                    self.clients.pop(client)
-                    await self.remove_player_from_room(websocket)
-                    self.remove_empty_rooms()
-                    break
+            outbound.close()
+            session = self.sessions.close(websocket)
+            if session is not None:
+                await self.remove_player_from_room(websocket, session)
+            self.notify_lobby_change()
                 
     async def process_client_message(self,websocket,message):
-        try:
-            message_type = message["type"]
-            if message_type == MessageType.JOIN.value:
-                await self.handle_client_join(websocket,message)
-            elif message_type == MessageType.MOVE.value:
-                await self.handle_client_move(websocket, message)
-            elif message_type == MessageType.MAP.value:
-       #         await self.handle_map_data(websocket,message)
-                pass
-            elif message_type == MessageType.SHOOT.value:
-                await self.handle_client_shoot(websocket,message)
-            elif message_type == MessageType.RESPAWN.value:
-                await self.handle_client_respawn(websocket,message)
-                
-        except Exception as e:
-            print("Message connection {e}")
+        if message is None:
+            return
+        handler = self.message_handlers.get(message.get("type"))
+        if handler is not None:
+            await handler(websocket, message)
                    
     async def handle_client_join(self,websocket,message):
         try:
             player_data = message.get("data")
-            if self.check_username(player_data["username"]) or self.is_already_player(websocket, player_data["username"], player_data["player_id"]):
-                self.clients[message["data"]["player_id"]]["username"] = message["data"]["username"]
+            session = self.sessions.get(websocket)
+            if session is None:
+                return
+            if session.room is not None and session.room.status == GameRoomState.FINISHED.value:
+                # Maç bitti, oyuncu yeni bir odaya katılabilir
+                self.sessions.unbind_room(session)
+            if session.room is None and self.check_username(player_data["username"], session):
+                self.sessions.set_username(session, player_data["username"])
+                player_data["player_id"] = session.client_id
                 room = self.assign_player_to_room(websocket, player_data)
                 if room:  
+                    self.sessions.bind_room(session, room, room.game.players.get(session.client_id))
+                    self.notify_lobby_change()
                     waiting_message = {
                         "type": "join",
                         "data": {
@@ -131,9 +193,9 @@ class GameServer:
                             "status": room.status
                         }
                     }
-                    await websocket.send(json.dumps(waiting_message))
+                    session.outbound.put(json.dumps(waiting_message))
                     if room.min_player_reached() and room.status == GameRoomState.WAITING.value:
-                        print(f"Room is full {room.room_id}")
+                        Logger.send_log(LogType.GAME_INFO, "Room is full, starting game", room_id=room.room_id)
                         await room.start_game()
             else:
                 response = {
@@ -142,55 +204,61 @@ class GameServer:
                         "message" : "username in used"
                     }
                 }
-                await websocket.send(json.dumps(response))
+                session.outbound.put(json.dumps(response))
 
         except Exception as e:
-            print(f"player join : {e}")      
+            Logger.send_log(LogType.ERROR, "Player join error", error=e)      
     
     async def handle_client_move(self, websocket, message):
         try:
-            #print(f"Raw move message received: {message}")
-            
+            session = self.sessions.get(websocket)
+            if session is None or (session.move_limit is not None and not session.move_limit.take()):
+                return
             move_data = self.protocol.deserialize_move(message)
             #print(f"Deserialized move data: {move_data}")
             
             if move_data:
-                room = self.find_room_by_player(websocket)
-                room.apply_player_move(move_data)      
+                if session.room:
+                    session.room.apply_player_move(session.client_id, move_data)
             else:
-                print("Move data is None - deserialization failed")
+                Logger.send_log(LogType.ERROR, "Move data is None - deserialization failed", rate=1)
                 
         except Exception as e:
-            print(f"Move handling error: {e}")
+            Logger.send_log(LogType.ERROR, "Move handling error", rate=1, error=e)
             
     async def handle_client_shoot(self,websocket,message):
         try:
-            print(message)
+            session = self.sessions.get(websocket)
+            if session is None or (session.shoot_limit is not None and not session.shoot_limit.take()):
+                return
             shoot_data = self.protocol.deserialize_shoot(message)
-            print(f"deserialized shoot data: {shoot_data}")
             
             if shoot_data:
-                room = self.find_room_by_player(websocket)
-                client_id = self.find_client_id(websocket)
-                if room:
-                    room.apply_player_shoot(client_id,shoot_data)
+                if session.room:
+                    session.room.apply_player_shoot(session.client_id,shoot_data)
                 else:
-                    print("room cant find")
+                    Logger.send_log(LogType.DEBUG, "Shoot without a room", rate=1)
             else:
-                print("shoot data is None")                 
+                Logger.send_log(LogType.ERROR, "Shoot data is None - deserialization failed", rate=1)
         except Exception as e:
-            print(f"Shoot handling error: {e}")
+            Logger.send_log(LogType.ERROR, "Shoot handling error", rate=1, error=e)
     
     async def handle_client_respawn(self,websocket,message):
         try:
-            client_id = self.find_client_id(websocket)
-            room = self.find_room_by_player(websocket)
+            session = self.sessions.get(websocket)
             
-            if room :
-                room.apply_player_respawn(client_id)
+            if session and session.room :
+                session.room.apply_player_respawn(session.client_id)
         except Exception as e:
-            print(f"respawn handling error {e}")
+            Logger.send_log(LogType.ERROR, "Respawn handling error", rate=1, error=e)
     
+    async def handle_client_ack(self, websocket, message):
+        try:
+            room = self.find_room_by_player(websocket)
+            if room:
+                room.ack_snapshot(websocket, self.protocol.deserialize_ack(message))
+        except Exception as e:
+            Logger.send_log(LogType.ERROR, "Ack handling error", rate=1, error=e)
     
     async def handle_map_data(self, websocket, message):
         """
@@ -202,8 +270,11 @@ class GameServer:
             if not map_data:
                 return
             
+            map_key, _ = map_registry.acquire_platforms(map_data["platforms"])
+            if self.map_key is not None:
+                map_registry.release(self.map_key)
+            self.map_key = map_key
             self.map_platforms = map_data["platforms"]
-            print(self.map_platforms)
                 
         except Exception as e:
             Logger.send_log(LogType.ERROR, f"Map data handling error: {e}")
@@ -218,18 +289,53 @@ class GameServer:
         Returns:
             GameRoom: The newly created room instance, or None if max room limit reached.
         """
-        gameroom = GameRoom(max_players)
-        if self.map_platforms:
-            gameroom.load_map_data(self.map_platforms)
-            gameroom.map_loaded = True
+        gameroom = GameRoom(max_players, self.tick_rate, self.snapshot_rate, self.view_size)
+        gameroom.set_profiler(self.profiler)
+        if self.record_dir is not None:
+            path = os.path.join(self.record_dir, f"room{gameroom.room_id}_{int(time.time())}.k2log")
+            gameroom.enable_recording(path, random.SystemRandom().getrandbits(32))
+        if self.max_rewind > 0:
+            gameroom.enable_lag_compensation(self.max_rewind)
+        if self.map_key is not None:
+            gameroom.load_map(self.map_key, {"width": self.map_size[0], "height": self.map_size[1]})
         self.rooms[gameroom.room_id] = gameroom
+        self.scheduler.add(gameroom, gameroom.sim_rate)
         return gameroom
     
     def remove_empty_rooms(self):
         empty_rooms = [room_id for room_id, room in self.rooms.items() if not room.players]
         for room_id in empty_rooms:
+            self.rooms[room_id].stop_recording()
+            self.rooms[room_id].unload_map()
             del self.rooms[room_id]
-            print(f"Room {room_id} deleted (no players left).")
+            self.scheduler.remove(room_id)
+            Logger.send_log(LogType.GAME_INFO, "Room deleted (no players left)", room_id=room_id)
+        if empty_rooms:
+            self.notify_lobby_change()
+
+    def open_slots(self, pending=0):
+        """
+        Number of players this server can still seat in rooms that exist or
+        that its waiting clients are about to create.
+
+        Args:
+            pending (int): Connections not registered as sessions yet.
+
+        Returns:
+            int: Free seats in non-full rooms (where assign_player_to_room puts
+                new players) minus connected clients that have not joined yet.
+        """
+        free = sum(room.max_player - len(room.players) for room in self.rooms.values())
+        lobby = pending + sum(1 for session in self.sessions if session.room is None)
+        if lobby > free:
+            # Lobidekiler yeni odalar açacak
+            size = self.max_player_for_game_room
+            free += -(-(lobby - free) // size) * size
+        return free - lobby
+
+    def notify_lobby_change(self):
+        if self.on_lobby_change is not None:
+            self.on_lobby_change()
             
     def list_rooms(self):
         """
@@ -271,35 +377,46 @@ class GameServer:
             - If no available room, create a new one.
             - Add the player to the room.
         """
+        session = self.sessions.get(websocket)
+        outbound = session.outbound if session is not None else None
         for room in list(self.rooms.values()):
             if not room.is_room_full():
-                print("added")
-                room.add_player(websocket, player_info)
+                room.add_player(websocket, player_info, outbound)
                 return room
 
         # No available room -> create new
         new_room = self.create_room(self.max_player_for_game_room)
         self.rooms[new_room.room_id] = new_room
-        new_room.add_player(websocket, player_info)
+        new_room.add_player(websocket, player_info, outbound)
         #print(f"Yeni room oluşturuldu: {new_room.room_id}")
         return new_room
             
-    async def remove_player_from_room(self, websocket):
+    async def remove_player_from_room(self, websocket, session=None):
         """
         Removes a player from its current room.
         
         Args:
             websocket: Player's WebSocket.
+            session (Session): The player's session, looked up if not given.
         
         Should:
             - Find which room the player is in.
             - Remove them from that room.
-            - If room is empty after removal, consider deleting the room.
+            - If room is empty after removal, delete the room.
         """
-        for room in list(self.rooms.values()):
-            await room.remove_player(websocket)
-            if len(room.players) == 0:
-                del room
+        if session is None:
+            session = self.sessions.get(websocket)
+        if session is None or session.room is None:
+            return
+        room = session.room
+        self.sessions.unbind_room(session)
+        await room.remove_player(websocket)
+        if not room.players and self.rooms.get(room.room_id) is room:
+            room.stop_recording()
+            room.unload_map()
+            del self.rooms[room.room_id]
+            self.scheduler.remove(room.room_id)
+            Logger.send_log(LogType.GAME_INFO, "Room deleted (no players left)", room_id=room.room_id)
         
     async def broadcast_to_all(self, message):
         """
@@ -325,18 +442,55 @@ class GameServer:
         Main server loop that updates rooms and handles periodic events.
         
         Should:
-            - Iterate over rooms and call their `tick` methods.
+            - Run each room's fixed steps when its staggered tick is due (TickScheduler).
             - Handle server-wide events like cleanup.
         """
-        while self.running: 
-            start = time.time()
-            delta = start - self.last_time
-            for room in list(self.rooms.values()):
-                await room.tick(1/self.tick_rate)
-            self.last_time = start
-            
-            await asyncio.sleep(max(0, 1/self.tick_rate - (time.time() - start)))
+        while self.running:
+            profiler = self.profiler
+            for room, steps, step in self.scheduler.due():
+                started = self.scheduler.clock()
+                for _ in range(steps):
+                    start = profiler.now() if profiler else 0.0
+                    await room.tick(step)
+                    if profiler:
+                        profiler.record(room.room_id, "tick", start)
+                self.scheduler.finish(room, started)
             self.remove_empty_rooms()
+            await asyncio.sleep(self.scheduler.time_until_next())
+
+    def enable_profiling(self, trace=False):
+        """
+        Starts per-room, per-phase tick profiling for existing and new rooms.
+
+        Args:
+            trace (bool): Also keep a timeline for export_chrome_trace().
+
+        Returns:
+            TickProfiler: The profiler, see report() and export_chrome_trace().
+        """
+        self.profiler = TickProfiler(trace)
+        for room in self.rooms.values():
+            room.set_profiler(self.profiler)
+        return self.profiler
+
+    def disable_profiling(self):
+        self.profiler = None
+        for room in self.rooms.values():
+            room.set_profiler(None)
+
+    def tick_stats(self):
+        """
+        Returns:
+            dict: Per-room scheduler counters, see TickScheduler.stats().
+        """
+        return self.scheduler.stats()
+
+    def bullet_pool_stats(self):
+        """
+        Returns:
+            dict: Per-room bullet pool size and occupancy, see BulletPool.stats().
+        """
+        return {room_id: room.game.bullets.stats() for room_id, room in self.rooms.items()}
 
     def log_event(self, event_type, details):
         """
@@ -358,16 +512,16 @@ class GameServer:
         Returns:
             GameRoom or None: The room the player belongs to.
         """
-        for room in list(self.rooms.values()):
-            for player in room.players:
-                if player["websocket"] == websocket:
-                    return room
-        return None
+        session = self.sessions.get(websocket)
+        if session is None:
+            return None
+        return session.room
+
     def find_client_id(self, websocket):
-        for client in self.clients.keys():
-            if self.clients[client]["websocket"] == websocket:
-                return client
-        return None
+        session = self.sessions.get(websocket)
+        if session is None:
+            return None
+        return session.client_id
             
     async def shutdown(self):
         """
@@ -380,21 +534,56 @@ class GameServer:
         """
         pass
     
-    def check_username(self,username):
-        for client in self.clients.values():
-            if client.get("username","")== username :
-                return False
-        return True
+    def check_username(self, username, session=None):
+        """
+        True if the username is free, or already belongs to this session.
+
+        Only this server's sessions are checked; in sharded mode names are
+        unique per worker (see ShardedServer).
+        """
+        return self.sessions.is_username_free(username, session)
     
     def is_already_player(self, websocket, username, player_id):
-        print("username" in self.clients[player_id])
-        if "username" in self.clients[player_id] and self.clients[player_id].get("username") == username:
-            return True
-        return False
+        session = self.sessions.get(websocket)
+        return session is not None and session.username == username
     
-async def main():
-    gameserver = GameServer()
-    await gameserver.start_server()
+async def main(args):
+    gameserver = GameServer(args.host, args.port)
+    gameserver.tick_rate = args.tick_rate
+    gameserver.max_rewind = args.max_rewind / 1000
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+        gameserver.record_dir = args.record
+    if args.profile or args.trace:
+        gameserver.enable_profiling(trace=bool(args.trace))
+    try:
+        await gameserver.start_server()
+    finally:
+        for room in gameserver.rooms.values():
+            room.stop_recording()
+        if gameserver.profiler is not None:
+            print(json.dumps(gameserver.profiler.report(), indent=2))
+            if args.trace:
+                gameserver.profiler.export_chrome_trace(args.trace)
+
 if __name__ =="__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run the game server.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick-rate", type=int, default=30,
+                        help="simulation steps per second of new rooms; collisions are swept, so 10-20 is safe on busy hosts")
+    parser.add_argument("--max-rewind", type=float, default=200, metavar="MS",
+                        help="most milliseconds lag compensation rewinds a hit test, 0 turns it off")
+    parser.add_argument("--record", metavar="DIR",
+                        help="run rooms deterministically and write their input logs to DIR (replay with Tools/replay.py)")
+    parser.add_argument("--profile", action="store_true", help="print per-phase tick histograms on exit")
+    parser.add_argument("--trace", metavar="FILE", help="also write a Chrome trace of the ticks to FILE on exit")
+    parser.add_argument("--log-level", default="INFO", choices=[level.name for level in LogLevel])
+    parser.add_argument("--log-json", action="store_true", help="write logs as JSON lines")
+    args = parser.parse_args()
+    Logger.configure(level=LogLevel[args.log_level], json_output=args.log_json)
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
     
\ No newline at end of file
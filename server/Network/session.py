@@ -0,0 +1,100 @@
+class Session:
+    """
+    Everything the server knows about one connected client.
+
+    Attributes:
+        client_id (int): ID sent to the client in the connect message.
+        websocket: The client's connection.
+        username (str): Set on join, None before.
+        room (GameRoom): Room the client plays in, None while in the lobby.
+        player (Player): The client's Player in room.game, None while in the lobby.
+        outbound (OutboundQueue): Frames waiting to be written to websocket.
+        move_limit, shoot_limit (TokenBucket): Per-connection MOVE/SHOOT rate
+            limits, None means unlimited.
+    """
+
+    def __init__(self, client_id, websocket, outbound=None):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.outbound = outbound
+        self.move_limit = None
+        self.shoot_limit = None
+        self.username = None
+        self.room = None
+        self.player = None
+
+
+class SessionRegistry:
+    """
+    Indexes sessions by connection, client id and username so that routing a
+    message is a dict lookup, independent of the number of rooms and clients.
+
+    It is only updated on connect, join, leave and disconnect.
+    """
+
+    def __init__(self):
+        self.by_websocket = {}
+        self.by_id = {}
+        self.by_username = {}
+
+    def __len__(self):
+        return len(self.by_websocket)
+
+    def __iter__(self):
+        return iter(list(self.by_websocket.values()))
+
+    def open(self, client_id, websocket, outbound=None):
+        """
+        Registers a new connection.
+
+        Returns:
+            Session: The new session.
+        """
+        session = Session(client_id, websocket, outbound)
+        self.by_websocket[websocket] = session
+        self.by_id[client_id] = session
+        return session
+
+    def close(self, websocket):
+        """
+        Forgets a connection.
+
+        Returns:
+            Session or None: The removed session, still bound to its room so
+                the caller can clean the room up.
+        """
+        session = self.by_websocket.pop(websocket, None)
+        if session is None:
+            return None
+        self.by_id.pop(session.client_id, None)
+        if session.username is not None and self.by_username.get(session.username) is session:
+            del self.by_username[session.username]
+        return session
+
+    def get(self, websocket):
+        return self.by_websocket.get(websocket)
+
+    def get_by_id(self, client_id):
+        return self.by_id.get(client_id)
+
+    def get_by_username(self, username):
+        return self.by_username.get(username)
+
+    def is_username_free(self, username, session=None):
+        """True if nobody, or only the given session, uses the username."""
+        owner = self.by_username.get(username)
+        return owner is None or owner is session
+
+    def set_username(self, session, username):
+        if session.username is not None and self.by_username.get(session.username) is session:
+            del self.by_username[session.username]
+        session.username = username
+        self.by_username[username] = session
+
+    def bind_room(self, session, room, player):
+        session.room = room
+        session.player = player
+
+    def unbind_room(self, session):
+        session.room = None
+        session.player = None
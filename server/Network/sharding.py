@@ -0,0 +1,272 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+import socket
+from websockets.asyncio.server import serve, ServerConnection
+from websockets.server import ServerProtocol
+from websockets.protocol import State
+from Utils.logger import Logger, LogType
+from GameRoom import GameRoom
+from Network.server import GameServer
+
+
+class ShardMatchmaker:
+    """
+    Decides which worker gets the next connection, so matchmaking stays the
+    same as on a single process: a new player goes where a room is waiting
+    for players, and only when no shard has a free seat is a new room opened
+    on the least loaded shard.
+
+    Workers report their free seats (GameServer.open_slots()) and how many
+    handed-off connections they have received so far. Connections sent after
+    the last report are still counted against the shard, so a burst of
+    connections fills one room instead of being spread over all shards.
+    """
+
+    def __init__(self, shard_count, room_size):
+        self.room_size = room_size
+        self.handed = [0] * shard_count
+        self.received = [0] * shard_count
+        self.open_slots = [0] * shard_count
+        self.connections = [0] * shard_count
+
+    def pending(self, shard):
+        return self.handed[shard] - self.received[shard]
+
+    def choose(self):
+        """
+        Returns:
+            int: Index of the shard that should get the next connection.
+        """
+        best = None
+        for shard in range(len(self.handed)):
+            free = self.open_slots[shard] - self.pending(shard)
+            if free > 0 and (best is None or free < best[0]):
+                # En dolu bekleyen odayı önce doldur
+                best = (free, shard)
+        if best is not None:
+            return best[1]
+
+        load = [self.connections[i] + self.pending(i) for i in range(len(self.handed))]
+        shard = load.index(min(load))
+        # Bu bağlantı yeni bir oda açacak, kalan koltukları şimdiden say
+        self.open_slots[shard] += self.room_size
+        return shard
+
+    def handed_off(self, shard):
+        self.handed[shard] += 1
+
+    def report(self, shard, data):
+        self.received[shard] = data["received"]
+        self.open_slots[shard] = data["open_slots"]
+        self.connections[shard] = data["connections"]
+
+
+class ShardWorker:
+    """
+    Runs one GameServer in a worker process. Instead of listening itself it
+    receives already accepted client sockets from the acceptor over a Unix
+    socket and serves them with the same websockets connection handling.
+    """
+    ID_SHIFT = 24
+
+    def __init__(self, index, fd_channel, report_channel, room_size):
+        self.index = index
+        self.fd_channel = fd_channel
+        self.report_channel = report_channel
+        self.received = 0
+        # Alınmış ama handshake'i bitmemiş bağlantılar da lobide sayılır
+        self.handshaking = set()
+        # Alınmış ama serve_socket henüz handshaking'e eklememiş soketler
+        self.registering = 0
+        # Shard'lar arasında çakışmayan player ve room id'leri
+        GameServer.player_counter = index << self.ID_SHIFT
+        GameRoom.room_counter = index << self.ID_SHIFT
+        self.game_server = GameServer()
+        self.game_server.max_player_for_game_room = room_size
+        self.game_server.on_lobby_change = self.report
+        self.ws_server = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.fd_channel.setblocking(False)
+        # Server objesi handshake ve handler için; kendi portuna kimse bağlanmaz
+        async with serve(self.handle_client, "127.0.0.1", 0) as ws_server:
+            self.ws_server = ws_server
+            loop.add_reader(self.fd_channel.fileno(), self.receive_sockets)
+            self.report()
+            await self.game_server.game_loop()
+
+    def receive_sockets(self):
+        try:
+            data, fds, _, _ = socket.recv_fds(self.fd_channel, 64, 64)
+        except BlockingIOError:
+            return
+        if not data:
+            # Acceptor kapandı
+            self.game_server.running = False
+            asyncio.get_running_loop().remove_reader(self.fd_channel.fileno())
+            return
+        for fd in fds:
+            self.received += 1
+            self.registering += 1
+            client = socket.socket(fileno=fd)
+            client.setblocking(False)
+            asyncio.get_running_loop().create_task(self.serve_socket(client))
+        self.report()
+
+    async def serve_socket(self, client):
+        """Runs the websocket handshake and GameServer.handle_client on a handed-off socket."""
+        try:
+            connection = ServerConnection(ServerProtocol(), self.ws_server)
+            self.handshaking.add(connection)
+        finally:
+            self.registering -= 1
+        try:
+            await asyncio.get_running_loop().connect_accepted_socket(lambda: connection, client)
+        except OSError as e:
+            # Soket handshake başlamadan kapandı, koltuğunu geri ver
+            self.handshaking.discard(connection)
+            client.close()
+            Logger.send_log(LogType.CLIENT_INFO, "Handed-off socket closed before handshake", rate=1, error=e)
+            self.report()
+
+    async def handle_client(self, websocket):
+        self.handshaking.discard(websocket)
+        await self.game_server.handle_client(websocket)
+
+    def report(self):
+        # Handshake'te düşen bağlantıları unut
+        self.handshaking = {c for c in self.handshaking if c.state is not State.CLOSED}
+        message = json.dumps({
+            "received": self.received,
+            "open_slots": self.game_server.open_slots(len(self.handshaking) + self.registering),
+            "connections": len(self.game_server.sessions)
+        }) + "\n"
+        try:
+            self.report_channel.sendall(message.encode())
+        except OSError as e:
+            Logger.send_log(LogType.ERROR, "Shard report failed", rate=1, shard=self.index, error=e)
+
+
+def run_worker(index, fd_channel, report_channel, room_size, inherited=()):
+    # fork ile gelen acceptor uçlarını kapat, yoksa EOF hiç gelmez
+    for channel in inherited:
+        channel.close()
+    worker = ShardWorker(index, fd_channel, report_channel, room_size)
+    asyncio.run(worker.run())
+
+
+class ShardedServer:
+    """
+    Multi-process mode: one acceptor process owns the listening socket and
+    hands every accepted connection to one of several worker processes, each
+    running its own GameServer, rooms and game loop on its own core.
+
+    Usernames are unique per shard only: a worker checks a join against its
+    own sessions, so two players on different shards may pick the same name.
+
+    Usage:
+        python Network/sharding.py --workers 4 --port 8765
+    """
+
+    def __init__(self, host="localhost", port=8765, workers=None, room_size=2):
+        self.host = host
+        self.port = port
+        self.worker_count = workers or os.cpu_count() or 1
+        self.room_size = room_size
+        self.matchmaker = ShardMatchmaker(self.worker_count, room_size)
+        self.fd_channels = []
+        self.report_channels = []
+        self.processes = []
+
+    def start_workers(self):
+        context = multiprocessing.get_context("fork")
+        for index in range(self.worker_count):
+            fd_parent, fd_child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+            report_parent, report_child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+            process = context.Process(
+                target=run_worker,
+                args=(index, fd_child, report_child, self.room_size,
+                      self.fd_channels + self.report_channels + [fd_parent, report_parent]),
+                daemon=True
+            )
+            process.start()
+            fd_child.close()
+            report_child.close()
+            self.fd_channels.append(fd_parent)
+            self.report_channels.append(report_parent)
+            self.processes.append(process)
+
+    async def start_server(self):
+        self.start_workers()
+        loop = asyncio.get_running_loop()
+        for index, channel in enumerate(self.report_channels):
+            channel.setblocking(False)
+            loop.add_reader(channel.fileno(), self.read_reports, index, bytearray())
+
+        listener = socket.create_server((self.host, self.port))
+        listener.setblocking(False)
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        Logger.send_log(LogType.GAME_INFO, "Acceptor listening", host=self.host, port=self.port, workers=self.worker_count)
+        try:
+            while True:
+                client, _ = await loop.sock_accept(listener)
+                client.setblocking(True)
+                shard = self.matchmaker.choose()
+                socket.send_fds(self.fd_channels[shard], [b"c"], [client.fileno()])
+                self.matchmaker.handed_off(shard)
+                client.close()
+        finally:
+            listener.close()
+            self.shutdown()
+
+    def read_reports(self, index, buffer):
+        try:
+            chunk = self.report_channels[index].recv(4096)
+        except BlockingIOError:
+            return
+        if not chunk:
+            asyncio.get_running_loop().remove_reader(self.report_channels[index].fileno())
+            return
+        buffer.extend(chunk)
+        while b"\n" in buffer:
+            line, _, rest = bytes(buffer).partition(b"\n")
+            buffer[:] = rest
+            self.matchmaker.report(index, json.loads(line))
+
+    def shutdown(self):
+        loop = asyncio.get_running_loop()
+        for channel in self.report_channels:
+            loop.remove_reader(channel.fileno())
+        for channel in self.fd_channels + self.report_channels:
+            channel.close()
+        for process in self.processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game server sharded over worker processes.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPUs")
+    parser.add_argument("--room-size", type=int, default=2)
+    args = parser.parse_args()
+    server = ShardedServer(args.host, args.port, args.workers, args.room_size)
+    try:
+        asyncio.run(server.start_server())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+GameRoom snapshot cadence and bullet deaths as seen by clients, with fake
+outbound queues that keep every frame the room hands them.
+
+Run from server/: python -m pytest -q Network/test_gameroom.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import json
+import random
+import pytest
+from GameRoom import GameRoom
+from Network.server import STOCK_MAP_PLATFORMS
+from Game.map_registry import map_registry
+from Utils.logger import Logger, LogLevel
+
+
+class FakeOutbound:
+    """Stands in for OutboundQueue, keeps the frames in order."""
+
+    def __init__(self):
+        self.frames = []
+
+    def put(self, frame):
+        self.frames.append(json.loads(frame))
+        return True
+
+    def put_snapshot(self, frame):
+        return self.put(frame)
+
+    def game_states(self):
+        return [f["data"] for f in self.frames if f["type"] in ("game_state", "game_state_delta")]
+
+
+def setup_module():
+    Logger.configure(level=LogLevel.ERROR)
+
+
+def make_room(sim_rate, snapshot_rate, map_size=(1152, 648), players=2):
+    room = GameRoom(players, sim_rate, snapshot_rate)
+    map_key, _ = map_registry.acquire_platforms(STOCK_MAP_PLATFORMS)
+    room.load_map(map_key, {"width": map_size[0], "height": map_size[1]})
+    room.game.make_deterministic(sim_rate * 1000 + snapshot_rate)
+    for player_id in range(1, players + 1):
+        room.add_player(f"ws{player_id}", {"player_id": player_id, "username": f"p{player_id}"}, FakeOutbound())
+    asyncio.run(room.start_game())
+    for player in room.players:
+        player["outbound"].frames.clear()
+    return room
+
+
+def play(room, ticks, seed=0, ack=(), fire_chance=0.2):
+    """Ticks the room with random movement and shooting; clients in ack acknowledge every snapshot."""
+    rng = random.Random(seed)
+    game = room.game
+
+    async def run():
+        for _ in range(ticks):
+            for player_id, player in game.players.items():
+                if not player.is_alive:
+                    game.respawn_player(player_id)
+                    continue
+                game.update_player_position(player_id, (rng.choice((-1, 0, 1)), 0))
+                if rng.random() < fire_chance:
+                    game.fire_bullet(player_id, (player.x, player.y - 10), (rng.uniform(-1, 1), rng.uniform(-1, 1)))
+            await room.tick(1 / room.sim_rate)
+            for entry in room.players:
+                if entry["id"] in ack and entry["outbound"].frames:
+                    room.ack_snapshot(entry["websocket"], entry["outbound"].frames[-1]["data"]["seq"])
+    asyncio.run(run())
+
+
+def client_view(states):
+    """
+    Applies full snapshots and deltas like a client would.
+
+    Returns:
+        dict: bullet id -> list of alive flags the client saw, one per
+            snapshot that carried the bullet.
+    """
+    bullets = {}
+    seen = {}
+    for state in states:
+        if "base" not in state:
+            bullets = {}
+        for removed in state.get("removed_bullets", ()):
+            bullets.pop(removed, None)
+        for entry in state["bullets"]:
+            bullet = bullets.setdefault(entry["id"], {})
+            bullet.update(entry)
+            seen.setdefault(entry["id"], []).append(bullet["alive"])
+    return seen
+
+
+@pytest.mark.parametrize("sim_rate, snapshot_rate", ((60, 20), (30, 30), (60, 25), (20, 20)))
+def test_snapshot_cadence(sim_rate, snapshot_rate):
+    room = make_room(sim_rate, snapshot_rate)
+    ticks = sim_rate * 5
+    play(room, ticks)
+    states = room.players[0]["outbound"].game_states()
+    assert len(states) == ticks * snapshot_rate // sim_rate
+    sent_at = [state["tick"] for state in states]
+    gaps = {b - a for a, b in zip(sent_at, sent_at[1:])}
+    # 60/25 gibi tam bölünmeyen oranlarda aralık iki komşu değer arasında gider
+    assert gaps <= {sim_rate // snapshot_rate, -(-sim_rate // snapshot_rate)}
+
+
+@pytest.mark.parametrize("map_size", ((1152, 648), (2304, 1296)))
+@pytest.mark.parametrize("sim_rate, snapshot_rate", ((60, 20), (60, 12), (30, 30)))
+def test_every_bullet_death_reaches_the_clients(sim_rate, snapshot_rate, map_size):
+    room = make_room(sim_rate, snapshot_rate, map_size)
+    play(room, sim_rate * 8, seed=snapshot_rate, ack=(2,))
+    live_at_end = set(room.game.bullets.ids[room.game.bullets.rows()][room.game.bullets.alive[room.game.bullets.rows()]].tolist())
+    deaths = 0
+    for player in room.players:
+        seen = client_view(player["outbound"].game_states())
+        assert seen
+        for bullet_id, flags in seen.items():
+            # Bir kez ölü görülür, ondan sonra hiç görülmez
+            assert flags.count(False) <= 1
+            assert False not in flags or flags[-1] is False
+            if room.interest is None and True in flags and bullet_id not in live_at_end:
+                assert flags[-1] is False
+            deaths += flags.count(False)
+    assert deaths > 0
+
+
+@pytest.mark.parametrize("map_size", ((1152, 648), (2304, 1296)))
+def test_bullet_freed_between_snapshots_is_reported_dead(map_size):
+    room = make_room(60, 20, map_size)
+    player = room.game.players[1]
+    pool = room.game.bullets
+    # Mermi oyuncunun yanında, görüş alanı içinde ve duvardan uzakta
+    bullet_id = pool.spawn(1, (player.x + 30, player.y - 60), (0, -1), speed=1)
+    play(room, 3, fire_chance=0)
+    assert [b["alive"] for b in room.players[0]["outbound"].game_states()[-1]["bullets"]] == [True]
+
+    pool.alive[pool.row_of(bullet_id)] = False
+    play(room, 3, fire_chance=0)
+    assert pool.row_of(bullet_id) is None
+    for entry in room.players:
+        state = entry["outbound"].game_states()[-1]
+        assert [(b["id"], b["alive"]) for b in state["bullets"]] == [(bullet_id, False)]
+    play(room, 3, fire_chance=0)
+    for entry in room.players:
+        assert entry["outbound"].game_states()[-1]["bullets"] == []
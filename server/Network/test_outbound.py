@@ -0,0 +1,133 @@
+"""
+OutboundQueue against a fake websocket whose send can be held open, to
+play a client that stops reading.
+
+Run from server/: python -m pytest -q Network/test_outbound.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+from websockets.exceptions import ConnectionClosedError
+from outbound import OutboundQueue
+from Utils.logger import Logger, LogLevel
+
+
+class GatedWebSocket:
+    """send() waits while the gate is closed, like a full socket buffer."""
+
+    def __init__(self):
+        self.remote_address = ("test", 0)
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.close_code = None
+        self.fail = False
+
+    async def send(self, frame):
+        await self.gate.wait()
+        if self.fail:
+            raise ConnectionClosedError(None, None)
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+
+
+def setup_module():
+    Logger.configure(level=LogLevel.ERROR)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_reliable_frames_keep_their_order():
+    async def run():
+        websocket = GatedWebSocket()
+        queue = OutboundQueue(websocket)
+        for i in range(10):
+            assert queue.put(f"r{i}")
+        await settle()
+        assert websocket.sent == [f"r{i}" for i in range(10)]
+        assert queue.stats() == {"sent": 10, "coalesced": 0, "pending": 0, "pending_bytes": 0}
+        queue.close()
+    asyncio.run(run())
+
+
+def test_latest_snapshot_wins_while_the_client_is_blocked():
+    async def run():
+        websocket = GatedWebSocket()
+        queue = OutboundQueue(websocket)
+        websocket.gate.clear()
+        queue.put("join")
+        await settle()
+        for i in range(5):
+            assert queue.put_snapshot(f"s{i}")
+        queue.put("chat")
+        websocket.gate.set()
+        await settle()
+        # Reliable frame'ler snapshot'tan önce, ara snapshot'lar atlanır
+        assert websocket.sent == ["join", "chat", "s4"]
+        assert queue.coalesced == 4
+        queue.close()
+    asyncio.run(run())
+
+
+def test_reliable_backlog_drops_slow_consumer():
+    async def run():
+        websocket = GatedWebSocket()
+        queue = OutboundQueue(websocket, max_pending=3)
+        websocket.gate.clear()
+        assert queue.put("r0")
+        await settle()
+        # r0 gönderimde takılı, üçü kuyruğa sığar, dördüncüsü sınırı aşar
+        assert all(queue.put(f"r{i}") for i in range(1, 4))
+        assert queue.put("r4") is False
+        await settle()
+        assert queue.closed and websocket.close_code == OutboundQueue.SLOW_CLOSE_CODE
+        assert queue.put("r5") is False and queue.put_snapshot("s") is False
+        assert queue.stats()["pending"] == 0
+    asyncio.run(run())
+
+
+def test_byte_limit_drops_slow_consumer():
+    async def run():
+        websocket = GatedWebSocket()
+        queue = OutboundQueue(websocket, max_pending_bytes=100)
+        websocket.gate.clear()
+        assert queue.put("x" * 60)
+        assert queue.put("y" * 60) is False
+        await settle()
+        assert websocket.close_code == OutboundQueue.SLOW_CLOSE_CODE
+    asyncio.run(run())
+
+
+def test_stalled_send_drops_slow_consumer():
+    async def run():
+        websocket = GatedWebSocket()
+        queue = OutboundQueue(websocket, stall_timeout=0.05)
+        websocket.gate.clear()
+        assert queue.put_snapshot("s0")
+        await settle()
+        assert queue.put_snapshot("s1")
+        await asyncio.sleep(0.1)
+        assert queue.put_snapshot("s2") is False
+        await settle()
+        assert queue.closed and websocket.close_code == OutboundQueue.SLOW_CLOSE_CODE
+    asyncio.run(run())
+
+
+def test_closed_connection_stops_the_writer():
+    async def run():
+        websocket = GatedWebSocket()
+        queue = OutboundQueue(websocket)
+        websocket.fail = True
+        queue.put("r0")
+        await settle()
+        assert queue.closed and queue.task.done()
+        assert queue.put("r1") is False
+        assert websocket.close_code is None
+    asyncio.run(run())
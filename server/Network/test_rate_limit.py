@@ -0,0 +1,90 @@
+"""
+TokenBucket with a hand-driven clock, and the MOVE/SHOOT handlers dropping
+what their bucket does not allow.
+
+Run from server/: python -m pytest -q Network/test_rate_limit.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import pytest
+from rate_limit import TokenBucket
+from test_server import started_match
+from Utils.logger import Logger, LogLevel
+
+
+def setup_module():
+    Logger.configure(level=LogLevel.ERROR)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_drop():
+    clock = FakeClock()
+    bucket = TokenBucket(10, 5, clock=clock)
+    assert [bucket.take() for _ in range(7)] == [True] * 5 + [False] * 2
+    assert bucket.dropped == 2
+
+
+def test_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(10, 5, clock=clock)
+    for _ in range(5):
+        bucket.take()
+    clock.now += 0.25
+    # 0.25 s * 10/s = 2.5 token
+    assert [bucket.take() for _ in range(3)] == [True, True, False]
+    clock.now += 0.1
+    assert bucket.take() is True
+    assert bucket.take() is False
+
+
+def test_idle_bucket_does_not_exceed_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(90, 30, clock=clock)
+    clock.now += 3600
+    assert sum(bucket.take() for _ in range(100)) == 30
+    assert bucket.dropped == 70
+
+
+def test_sustained_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(30, 10, clock=clock)
+    allowed = 0
+    # 120 Hz gönderen client 10 saniyede burst + rate * süre kadar geçer
+    for _ in range(1200):
+        clock.now += 1 / 120
+        allowed += bucket.take()
+    assert allowed == pytest.approx(10 + 30 * 10, abs=1)
+
+
+def test_handlers_drop_messages_above_the_limit():
+    async def run():
+        server, websocket, session = await started_match()
+        clock = FakeClock()
+        session.move_limit = TokenBucket(90, 3, clock=clock)
+        session.shoot_limit = TokenBucket(10, 2, clock=clock)
+        for _ in range(5):
+            # Zıplama input'ları birleştirilmez, her geçen MOVE bir slot alır
+            await server.process_client_message(websocket, {"type": "move", "data": {"direction": [0, -1]}})
+            await server.process_client_message(websocket, {
+                "type": "shoot", "data": {"direction": [1, 0], "position": [session.player.x, session.player.y]}
+            })
+        assert len(session.player.input_buffer) == 3
+        assert session.room.game.bullets.count == 2
+        assert (session.move_limit.dropped, session.shoot_limit.dropped) == (2, 3)
+
+        clock.now += 0.15
+        await server.process_client_message(websocket, {
+            "type": "shoot", "data": {"direction": [1, 0], "position": [session.player.x, session.player.y]}
+        })
+        assert session.room.game.bullets.count == 3
+    asyncio.run(run())
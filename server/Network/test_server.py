@@ -0,0 +1,91 @@
+"""
+GameServer message handlers driven without sockets: a fake websocket stands
+in for the connection, everything else (sessions, rooms, outbound queues) is
+the real thing.
+
+Run from server/: python -m pytest -q Network/test_server.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import json
+import pytest
+from Network.server import GameServer
+from outbound import OutboundQueue
+from Utils.logger import Logger, LogLevel
+
+
+class FakeWebSocket:
+    """Collects the frames sent to it."""
+
+    def __init__(self, name):
+        self.remote_address = (name, 0)
+        self.sent = []
+        self.close_code = None
+
+    async def send(self, frame):
+        self.sent.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+
+
+def setup_module():
+    Logger.configure(level=LogLevel.ERROR)
+
+
+async def connect(server, name):
+    websocket = FakeWebSocket(name)
+    session = server.sessions.open(GameServer.player_counter, websocket, OutboundQueue(websocket))
+    GameServer.player_counter += 1
+    await server.handle_client_join(websocket, {"type": "join", "data": {"username": name}})
+    return websocket, session
+
+
+async def started_match():
+    server = GameServer()
+    first, session = await connect(server, "alice")
+    await connect(server, "bob")
+    assert session.room.status == "in_progress"
+    return server, first, session
+
+
+@pytest.mark.parametrize("data", (
+    {"direction": ["1", 0]},
+    {"direction": [1, 0, 0]},
+    {"direction": None},
+    {"direction": [float("nan"), 0]},
+    "left",
+))
+def test_malformed_move_never_reaches_the_game(data):
+    async def run():
+        server, websocket, session = await started_match()
+        await server.process_client_message(websocket, {"type": "move", "data": data})
+        assert len(session.player.input_buffer) == 0
+        # Oda döngüsü bozuk girdiyle ölmemeli
+        for _ in range(3):
+            await session.room.tick(1 / 60)
+        await server.process_client_message(websocket, {"type": "move", "data": {"direction": [1, 0]}})
+        assert len(session.player.input_buffer) == 1
+        await session.room.tick(1 / 60)
+        assert session.player.current_direction == (1, 0)
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("data", (
+    {"direction": ["1", 0], "position": [100, 100]},
+    {"direction": [1, 0], "position": [100]},
+    {"direction": [1, 0], "position": [float("inf"), 100]},
+    {"direction": [1, 0]},
+    None,
+))
+def test_malformed_shoot_spawns_nothing(data):
+    async def run():
+        server, websocket, session = await started_match()
+        bullets = session.room.game.bullets
+        await server.process_client_message(websocket, {"type": "shoot", "data": data})
+        assert (bullets.count, bullets.high) == (0, 0)
+        await session.room.tick(1 / 60)
+    asyncio.run(run())
@@ -0,0 +1,139 @@
+"""
+Sharded mode: the acceptor's ShardMatchmaker and the worker reports it
+relies on. The end-to-end test runs Network/sharding.py as a subprocess and
+connects real websocket clients to it.
+
+Run from server/: python -m pytest -q Network/test_sharding.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import json
+import socket
+import subprocess
+import pytest
+from websockets.asyncio.client import connect
+from Network.sharding import ShardMatchmaker, ShardWorker
+
+SHARDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sharding.py")
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_matchmaker_fills_one_room_before_opening_another():
+    matchmaker = ShardMatchmaker(2, 4)
+    for shard in range(2):
+        matchmaker.report(shard, {"received": 0, "open_slots": 0, "connections": 0})
+    chosen = []
+    for _ in range(4):
+        shard = matchmaker.choose()
+        matchmaker.handed_off(shard)
+        chosen.append(shard)
+    assert chosen == [chosen[0]] * 4
+    # Dolu odadan sonra gelen yeni odayı en az yüklü shard'da açar
+    matchmaker.report(chosen[0], {"received": 4, "open_slots": 0, "connections": 4})
+    assert matchmaker.choose() != chosen[0]
+
+
+def test_matchmaker_counts_received_connections_reported_as_pending():
+    matchmaker = ShardMatchmaker(2, 4)
+    for shard in range(2):
+        matchmaker.report(shard, {"received": 0, "open_slots": 0, "connections": 0})
+    first = matchmaker.choose()
+    matchmaker.handed_off(first)
+    second = matchmaker.choose()
+    matchmaker.handed_off(second)
+    # Worker iki bağlantıyı aldı ama henüz kaydetmedi: koltukları dolu sayılmalı
+    matchmaker.report(first, {"received": 2, "open_slots": 2, "connections": 0})
+    assert matchmaker.choose() == first
+
+
+async def read_report(channel, buffer):
+    loop = asyncio.get_running_loop()
+    while b"\n" not in buffer:
+        buffer.extend(await asyncio.wait_for(loop.sock_recv(channel, 4096), 5))
+    line, _, rest = bytes(buffer).partition(b"\n")
+    buffer[:] = rest
+    return json.loads(line)
+
+
+def test_worker_reports_received_sockets_as_taken_seats():
+    async def run():
+        fd_parent, fd_child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        report_parent, report_child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        report_parent.setblocking(False)
+        worker = ShardWorker(0, fd_child, report_child, room_size=4)
+        task = asyncio.get_running_loop().create_task(worker.run())
+        buffer = bytearray()
+        assert await read_report(report_parent, buffer) == {"received": 0, "open_slots": 0, "connections": 0}
+
+        clients = [socket.socketpair() for _ in range(3)]
+        socket.send_fds(fd_parent, [b"c"], [ours.fileno() for ours, _ in clients])
+        for ours, _ in clients:
+            ours.close()
+        # Rapor serve_socket'lar çalışmadan gider; üç koltuk yine de dolu sayılmalı
+        assert await read_report(report_parent, buffer) == {"received": 3, "open_slots": 1, "connections": 0}
+        await asyncio.sleep(0.05)
+        assert (len(worker.handshaking), worker.registering) == (3, 0)
+
+        for _, theirs in clients:
+            theirs.close()
+        fd_parent.close()
+        await asyncio.wait_for(task, 5)
+        report_parent.close()
+    asyncio.run(run())
+
+
+async def join(port, name, room_size):
+    async with connect(f"ws://127.0.0.1:{port}") as websocket:
+        await websocket.recv()
+        await websocket.send(json.dumps({"type": "join", "data": {"username": name}}))
+        room = None
+        # Herkes katılana kadar bağlı kal ve gelenleri oku, yoksa kapanış takılır
+        try:
+            async with asyncio.timeout(2):
+                async for raw in websocket:
+                    message = json.loads(raw)
+                    data = message["data"]
+                    if message["type"] == "join":
+                        room = data["room_id"]
+                    elif message["type"] == "error":
+                        return None
+                    elif message["type"] == "game_start":
+                        data = data["game_state"]
+                    if len(data.get("players", ())) == room_size:
+                        return room
+        except TimeoutError:
+            pass
+        return room
+
+
+@pytest.mark.parametrize("room_size", (2, 4))
+def test_concurrent_joins_share_a_room(room_size):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, SHARDING, "--workers", "3", "--port", str(port),
+         "--host", "127.0.0.1", "--room-size", str(room_size)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    try:
+        # Acceptor dinlemeye başlayınca log atar; yoklama bağlantısı shard'a gider, kullanma
+        for line in process.stdout:
+            if b"Acceptor listening" in line:
+                break
+        assert process.poll() is None
+
+        async def run():
+            return await asyncio.gather(*(join(port, f"p{i}", room_size) for i in range(room_size)))
+        rooms = set(asyncio.run(run()))
+        assert len(rooms) == 1 and None not in rooms
+    finally:
+        process.terminate()
+        process.wait(5)
+        process.stdout.close()
@@ -0,0 +1,404 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Game"))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Network"))
+
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+import numpy
+from Game.bullet import Bullet
+from Game.bullet_pool import BulletPool
+from Game.game import Game
+from Game.map_registry import map_registry
+from Game.player import Player
+from Utils.logger import Logger, LogLevel
+from Utils.protocol import Protocol
+from Utils.snapshot import SnapshotHistory
+from server import STOCK_MAP_PLATFORMS
+
+
+PLAYER_COUNTS = (2, 4, 16)
+# 1 ve 10: 4 kişilik bir maçta gerçekte uçuşan mermi sayıları
+BULLET_COUNTS = (0, 1, 10, 100, 1000)
+DELTA_TIME = 1.0 / 60
+# Tick'i değiştiren benchmark'larda bir örnek bu kadar ardışık tick
+TICKS_PER_SAMPLE = 10
+# Saf fonksiyonlarda bir örnek en az bu kadar sürecek şekilde tekrarlanır
+MIN_SAMPLE_TIME = 0.002
+# Bellek benchmark'larında oluşturulan varlık sayısı
+MEMORY_ENTITIES = 10000
+
+
+_stock_map = None
+
+
+def stock_map():
+    """Stock map compiled once and shared by every scenario, like rooms share it."""
+    global _stock_map
+    if _stock_map is None:
+        _, _stock_map = map_registry.acquire_platforms(STOCK_MAP_PLATFORMS)
+    return _stock_map
+
+
+class Scenario:
+    """
+    A started Game on the stock map with a fixed number of players and
+    bullets, built from a seed so every build is identical.
+
+    Players get seeded positions across the map (STARTING_POSITIONS only
+    has four) and enough health not to die during a sample, so the amount
+    of work stays the same from the first tick to the last. Every tick's
+    MOVE inputs are generated up front from the same seed.
+    """
+
+    def __init__(self, players, bullets, seed):
+        self.player_count = players
+        self.bullet_count = bullets
+        self.name = f"p{players}_b{bullets}"
+        rng = random.Random(f"{seed}:{self.name}")
+
+        self.game = Game()
+        self.game.platforms = stock_map()
+        for player_id in range(1, players + 1):
+            self.game.add_player(player_id, f"bench{player_id}", None)
+            player = self.game.players[player_id]
+            player.position = (rng.uniform(40, Game.MAP_WIDTH - 40), rng.uniform(40, Game.MAP_HEIGHT - 160))
+            player.health = 1e9
+        self.game.start_game()
+
+        for _ in range(bullets):
+            angle = rng.uniform(0, 2 * math.pi)
+            self.game.bullets.spawn(
+                owner_id=rng.randint(1, players),
+                pos=(rng.uniform(10, Game.MAP_WIDTH - 10), rng.uniform(10, Game.MAP_HEIGHT - 10)),
+                dir_vec=(math.cos(angle), math.sin(angle)),
+                speed=500,
+                damage=10,
+                radius=5.0
+            )
+
+        self.inputs = [
+            [(player_id, (rng.choice((-1, 0, 1)), -1 if rng.random() < 0.05 else 0))
+             for player_id in range(1, players + 1)]
+            for _ in range(TICKS_PER_SAMPLE)
+        ]
+
+    def feed_inputs(self, tick):
+        for player_id, direction in self.inputs[tick]:
+            self.game.players[player_id].add_input_to_buffer(direction, 0.0)
+
+
+def time_ticks(players, bullets, seed, step):
+    """
+    Times step(scenario) over TICKS_PER_SAMPLE consecutive ticks of a fresh
+    scenario, inputs are fed outside the timed region.
+
+    Returns:
+        float: Seconds per tick.
+    """
+    scenario = Scenario(players, bullets, seed)
+    total = 0.0
+    for tick in range(TICKS_PER_SAMPLE):
+        scenario.feed_inputs(tick)
+        start = time.perf_counter()
+        step(scenario)
+        total += time.perf_counter() - start
+    return total / TICKS_PER_SAMPLE
+
+
+def time_calls(func, number):
+    """
+    Returns:
+        float: Seconds per call of func, averaged over number calls.
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def calibrate(func):
+    """Number of calls that make one sample last at least MIN_SAMPLE_TIME."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= MIN_SAMPLE_TIME:
+            return number
+        number *= 2
+
+
+def tick_benchmarks(players, bullets, seed):
+    """Benchmarks that advance the simulation, each sample on a fresh scenario."""
+    def physics(scenario):
+        for player in scenario.game.players.values():
+            player.update_physics(DELTA_TIME, scenario.game.platforms)
+
+    return {
+        "game.tick": lambda: time_ticks(players, bullets, seed, lambda s: s.game.tick(DELTA_TIME)),
+        "game.update_bullets": lambda: time_ticks(players, bullets, seed, lambda s: s.game.update_bullets(DELTA_TIME)),
+        # Oyuncu başına bir çağrı
+        "player.update_physics": lambda: time_ticks(players, bullets, seed, physics) / players,
+    }
+
+
+def state_benchmarks(players, bullets, seed):
+    """
+    Benchmarks of pure functions on the scenario after one tick: building the
+    snapshot and the three ways GameRoom encodes it for broadcasting.
+    """
+    scenario = Scenario(players, bullets, seed)
+    game = scenario.game
+    protocol = Protocol()
+    history = SnapshotHistory()
+    base_seq = history.push(game.get_game_state())
+    scenario.feed_inputs(0)
+    game.tick(DELTA_TIME)
+    state = game.get_game_state()
+    seq = history.push(state)
+
+    def encode_json():
+        return json.dumps({"type": "game_state", "data": dict(state, seq=seq, tick=1)})
+
+    def encode_delta():
+        delta = history.delta(base_seq, seq)
+        delta["remaining_time"] = state["remaining_time"]
+        delta["tick"] = 1
+        return json.dumps(protocol.serialize_game_state_delta(seq, base_seq, delta))
+
+    return {
+        "game.get_game_state": game.get_game_state,
+        "encode.json_full": encode_json,
+        "encode.json_delta": encode_delta,
+        "encode.binary": lambda: protocol.serialize_game_state_binary(state, seq, 1),
+    }
+
+
+def decode_benchmarks():
+    protocol = Protocol()
+    messages = {
+        "decode.json_move": json.dumps({"type": "move", "data": {"position": [512.5, 300.25], "direction": [1, 0], "player_id": 3}}),
+        "decode.json_shoot": json.dumps({"type": "shoot", "data": {"position": [512.5, 300.25], "direction": [1, 0]}}),
+        "decode.binary_move": protocol.binary.encode_move(512.5, 300.25, (1, 0), 3),
+        "decode.binary_shoot": protocol.binary.encode_shoot((1, 0), (512.5, 300.25)),
+    }
+    return {name: (lambda raw=raw: protocol.decode_message(raw)) for name, raw in messages.items()}
+
+
+def random_bullets(rng, count):
+    bullets = []
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        bullets.append(((rng.uniform(10, Game.MAP_WIDTH - 10), rng.uniform(10, Game.MAP_HEIGHT - 10)),
+                        (math.cos(angle), math.sin(angle))))
+    return bullets
+
+
+def entity_benchmarks(seed):
+    """
+    Per-object paths at MEMORY_ENTITIES entities: one Bullet.update pass over
+    fresh Bullet objects, timed per bullet. No map is passed, so this is
+    attribute access and arithmetic only.
+    """
+    spawns = random_bullets(random.Random(f"{seed}:entities"), MEMORY_ENTITIES)
+
+    def bullet_update():
+        bullets = [Bullet(1, pos, direction, 500, 10, 5.0) for pos, direction in spawns]
+        start = time.perf_counter()
+        for bullet in bullets:
+            bullet.update(DELTA_TIME)
+        return (time.perf_counter() - start) / len(bullets)
+
+    return {f"bullet.update/b{MEMORY_ENTITIES}": bullet_update}
+
+
+def measure_memory(make):
+    """
+    Returns:
+        float: Bytes traced while make() runs, divided by MEMORY_ENTITIES.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = make()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size / MEMORY_ENTITIES
+
+
+def memory_benchmarks(seed):
+    """
+    Memory per entity of MEMORY_ENTITIES Bullet objects, Player objects and
+    bullets in a BulletPool.
+    """
+    spawns = random_bullets(random.Random(f"{seed}:memory"), MEMORY_ENTITIES)
+
+    def pool():
+        bullet_pool = BulletPool()
+        for pos, direction in spawns:
+            bullet_pool.spawn(1, pos, direction, 500, 10, 5.0)
+        return bullet_pool
+
+    return {
+        f"memory.bullet/{MEMORY_ENTITIES}": lambda: [Bullet(1, pos, direction, 500, 10, 5.0) for pos, direction in spawns],
+        f"memory.player/{MEMORY_ENTITIES}": lambda: [Player(i, f"bench{i}", None) for i in range(MEMORY_ENTITIES)],
+        f"memory.bullet_pool/{MEMORY_ENTITIES}": pool,
+    }
+
+
+def collect(sample, repeat):
+    """
+    Runs sample() repeat times with the garbage collector off (like timeit).
+
+    Returns:
+        dict: Per-operation statistics in microseconds.
+    """
+    sample()  # ısınma
+    samples = []
+    for _ in range(repeat):
+        gc.disable()
+        try:
+            samples.append(sample() * 1e6)
+        finally:
+            gc.enable()
+    samples.sort()
+    return {
+        "median_us": samples[len(samples) // 2],
+        "min_us": samples[0],
+        "max_us": samples[-1],
+        "samples": len(samples)
+    }
+
+
+def run(seed, repeat, only=None):
+    """
+    Runs every benchmark whose name contains only (all if None).
+
+    Returns:
+        dict: { name: stats } with names like "game.tick/p4_b100".
+    """
+    benchmarks = []
+    for players in PLAYER_COUNTS:
+        for bullets in BULLET_COUNTS:
+            suffix = f"/p{players}_b{bullets}"
+            for name, sample in tick_benchmarks(players, bullets, seed).items():
+                benchmarks.append((name + suffix, sample))
+            for name, func in state_benchmarks(players, bullets, seed).items():
+                benchmarks.append((name + suffix, func))
+    for name, func in decode_benchmarks().items():
+        benchmarks.append((name, func))
+    benchmarks.extend(entity_benchmarks(seed).items())
+
+    results = {}
+    for name, bench in benchmarks:
+        if only and only not in name:
+            continue
+        if name.split("/")[0] in ("game.tick", "game.update_bullets", "player.update_physics", "bullet.update"):
+            sample = bench
+        else:
+            number = calibrate(bench)
+            sample = lambda func=bench, number=number: time_calls(func, number)
+        results[name] = collect(sample, repeat)
+        print_result(name, results[name])
+
+    for name, make in memory_benchmarks(seed).items():
+        if only and only not in name:
+            continue
+        results[name] = {"bytes_per_entity": measure_memory(make)}
+        print_result(name, results[name])
+    return results
+
+
+def metric(stats):
+    """Value compared against the baseline: median time, or bytes for memory benchmarks."""
+    if "median_us" in stats:
+        return stats["median_us"]
+    return stats["bytes_per_entity"]
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares medians (bytes per entity for memory benchmarks) against a
+    saved baseline.
+
+    Returns:
+        list: Names whose value grew by more than threshold (0.1 = 10%).
+    """
+    regressions = []
+    print(f"\n{'benchmark':<34} {'base':>10} {'now':>10} {'change':>8}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<34} {'-':>10} {metric(stats):>10.2f} {'new':>8}")
+            continue
+        change = metric(stats) / metric(base) - 1.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<34} {metric(base):>10.2f} {metric(stats):>10.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def print_result(name, stats):
+    if "bytes_per_entity" in stats:
+        print(f"{name:<34} {stats['bytes_per_entity']:>10.1f} B/entity", flush=True)
+        return
+    print(f"{name:<34} {stats['median_us']:>10.2f} {stats['min_us']:>10.2f} {stats['max_us']:>10.2f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Seeded micro-benchmarks of the simulation and protocol hot paths.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=25, help="samples per benchmark")
+    parser.add_argument("--filter", metavar="TEXT", help="only run benchmarks whose name contains TEXT")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a baseline written by --save")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="median slowdown counted as a regression, 0.10 = 10%%")
+    args = parser.parse_args()
+
+    # Oyun logları ölçümü bozmasın
+    Logger.configure(level=LogLevel.ERROR)
+
+    print(f"{'benchmark':<34} {'median us':>10} {'min us':>10} {'max us':>10}")
+    results = run(args.seed, args.repeat, args.filter)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {
+                    "seed": args.seed,
+                    "repeat": args.repeat,
+                    "python": platform.python_version(),
+                    "numpy": numpy.__version__,
+                    "machine": platform.machine(),
+                    "created": time.time()
+                },
+                "results": results
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("seed") != args.seed:
+            print(f"warning: baseline was recorded with seed {baseline['meta'].get('seed')}")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Network"))
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import time
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+from Utils.logger import Logger, LogLevel
+from Utils.binary_protocol import BinaryProtocol
+
+
+class Bot:
+    """
+    Synthetic client that drives the server like scripts/network.gd and
+    scripts/player.gd do: connect, join, then every physics frame send a
+    MOVE while a direction key is held or just changed, jump now and then,
+    shoot with a cooldown and ask for a respawn after dying. When a match
+    ends it joins again.
+
+    Every bot has its own seeded RNG, so a run with the same seed sends the
+    same input pattern.
+    """
+    PHYSICS_RATE = 60
+    SHOT_COOLDOWN = 0.5
+
+    def __init__(self, url, name, seed, encoding="json", ack=False):
+        self.url = url
+        self.name = name
+        self.rng = random.Random(seed)
+        self.encoding = encoding
+        self.ack = ack
+        self.player_id = None
+        self.position = (0.0, 0.0)
+        self.alive = True
+        self.bytes_received = 0
+        self.frames_received = 0
+        self.snapshot_max = 0
+        self.snapshot_bytes = 0
+        self.snapshots = 0
+        self.messages_sent = 0
+        self.joined = asyncio.Event()
+
+    async def run(self, stop):
+        async with connect(self.url, max_queue=None) as ws:
+            hello = json.loads(await ws.recv())
+            self.player_id = hello["data"]["player_id"]
+            await self.join(ws)
+            reader = asyncio.create_task(self.read(ws))
+            try:
+                await self.play(ws, stop)
+            except ConnectionClosed:
+                pass
+            finally:
+                reader.cancel()
+
+    async def join(self, ws):
+        data = {"player_id": self.player_id, "username": self.name}
+        if self.encoding != "json":
+            data["encoding"] = self.encoding
+        await ws.send(json.dumps({"type": "join", "data": data}))
+
+    async def read(self, ws):
+        binary = BinaryProtocol()
+        try:
+            async for frame in ws:
+                size = len(frame)
+                self.bytes_received += size
+                self.frames_received += 1
+                if isinstance(frame, bytes):
+                    if frame[0] == binary.GAME_STATE:
+                        self.count_snapshot(size)
+                    continue
+                message = json.loads(frame)
+                kind = message.get("type")
+                if kind == "game_state" or kind == "game_state_delta":
+                    self.count_snapshot(size)
+                    self.track(message["data"])
+                    if self.ack:
+                        await ws.send(json.dumps({"type": "ack", "data": {"seq": message["data"]["seq"]}}))
+                elif kind == "game_start":
+                    self.joined.set()
+                elif kind == "game_end":
+                    # Maç bitti, yeni odaya katıl
+                    await self.join(ws)
+        except ConnectionClosed:
+            pass
+
+    def count_snapshot(self, size):
+        self.snapshots += 1
+        self.snapshot_bytes += size
+        if size > self.snapshot_max:
+            self.snapshot_max = size
+
+    def track(self, data):
+        for player in data.get("players", ()):
+            if player.get("player_id") == self.player_id:
+                if "player_position" in player:
+                    self.position = tuple(player["player_position"])
+                if "player_is_alive" in player:
+                    self.alive = player["player_is_alive"]
+
+    async def play(self, ws, stop):
+        rng = self.rng
+        frame_time = 1 / self.PHYSICS_RATE
+        dir_x, last_sent = 0, (0, 0)
+        next_turn = 0.0
+        next_shot = rng.uniform(0, 1)
+        dead_since = None
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        next_frame = start
+        while not stop.is_set():
+            now = loop.time() - start
+            if not self.alive:
+                if dead_since is None:
+                    dead_since = now
+                elif now - dead_since > 1.0:
+                    await self.send(ws, {"type": "respawn", "data": {"player_id": self.player_id}})
+                    dead_since = None
+                    self.alive = True
+            else:
+                if now >= next_turn:
+                    # Sola/sağa koş ya da dur
+                    dir_x = rng.choice((-1, 0, 1))
+                    next_turn = now + rng.uniform(0.3, 2.0)
+                dir_y = -1 if rng.random() < 1 / (2 * self.PHYSICS_RATE) else 0
+                if dir_x != 0 or dir_y != 0 or (dir_x, dir_y) != last_sent:
+                    await self.send_move(ws, dir_x, dir_y)
+                    last_sent = (dir_x, dir_y)
+                if now >= next_shot:
+                    await self.send_shoot(ws, 1 if rng.random() < 0.5 else -1)
+                    next_shot = now + self.SHOT_COOLDOWN + rng.uniform(0, 1.0)
+
+            next_frame += frame_time
+            delay = next_frame - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Geride kaldıysak kareleri atla, CPU'yu boğma
+                next_frame = loop.time()
+                await asyncio.sleep(0)
+
+    async def send(self, ws, message):
+        await ws.send(json.dumps(message))
+        self.messages_sent += 1
+
+    async def send_move(self, ws, dir_x, dir_y):
+        x, y = self.position
+        if self.encoding == "binary":
+            await ws.send(BinaryProtocol.MOVE_STRUCT.pack(BinaryProtocol.MOVE, x, y, dir_x, dir_y, self.player_id))
+            self.messages_sent += 1
+            return
+        await self.send(ws, {"type": "move", "data": {"x": x, "y": y, "direction": [dir_x, dir_y], "player_id": self.player_id}})
+
+    async def send_shoot(self, ws, dir_x):
+        x, y = self.position
+        if self.encoding == "binary":
+            await ws.send(BinaryProtocol.SHOOT_STRUCT.pack(BinaryProtocol.SHOOT, dir_x, 0.0, x, y - 20))
+            self.messages_sent += 1
+            return
+        await self.send(ws, {"type": "shoot", "data": {"direction": [dir_x, 0], "position": [x, y - 20]}})
+
+
+def run_server(port, room_size, conn):
+    """
+    Server process: a plain GameServer with profiling on, controlled over a
+    pipe. "measure" restarts the measurement window, "stop" sends the report
+    and exits.
+    """
+    from server import GameServer
+
+    Logger.configure(level=LogLevel.ERROR)
+
+    async def main():
+        server = GameServer("127.0.0.1", port)
+        server.max_player_for_game_room = room_size
+        window = {"cpu": time.process_time(), "wall": time.perf_counter()}
+        server.enable_profiling()
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+
+        def on_command():
+            command = conn.recv()
+            if command == "measure":
+                server.enable_profiling()
+                reset_scheduler_stats(server.scheduler)
+                window["cpu"] = time.process_time()
+                window["wall"] = time.perf_counter()
+            elif command == "stop":
+                conn.send(server_report(server, window))
+                task.cancel()
+
+        loop.add_reader(conn.fileno(), on_command)
+        serving = loop.create_task(server.start_server())
+        try:
+            await serving
+        except asyncio.CancelledError:
+            serving.cancel()
+
+    try:
+        asyncio.run(main())
+    except asyncio.CancelledError:
+        pass
+
+
+def reset_scheduler_stats(scheduler):
+    for clock in scheduler.clocks.values():
+        clock.ticks = clock.late_ticks = clock.overruns = clock.dropped_steps = 0
+
+
+def server_report(server, window):
+    cpu = time.process_time() - window["cpu"]
+    wall = time.perf_counter() - window["wall"]
+    profiler = server.profiler
+    tick = profiler.merged("tick")
+    phases = {}
+    for phase in ("input", "physics", "bullets", "snapshot", "encode", "broadcast"):
+        histogram = profiler.merged(phase)
+        phases[phase] = histogram.total / wall * 1e3 / max(1, len(server.rooms))
+    stats = server.tick_stats().values()
+    pools = server.bullet_pool_stats().values()
+    return {
+        "rooms": len(server.rooms),
+        "tick_rate": server.tick_rate,
+        "wall": wall,
+        "cpu": cpu,
+        "tick": tick.to_dict(),
+        # oda başına saniyede harcanan ms, faz bazında
+        "phase_ms_per_room_s": phases,
+        "ticks": sum(s["ticks"] for s in stats),
+        "late_ticks": sum(s["late_ticks"] for s in stats),
+        "dropped_steps": sum(s["dropped_steps"] for s in stats),
+        "bullet_slots": sum(p["capacity"] for p in pools),
+        "bullets_in_use": sum(p["in_use"] for p in pools),
+        "bullets_recycled": sum(p["recycled"] for p in pools),
+    }
+
+
+def run_bots(url, names, seed, encoding, ack, warmup, duration, conn):
+    """Bot process: runs its share of the swarm and sends the totals back."""
+    Logger.configure(level=LogLevel.ERROR)
+
+    async def main():
+        stop = asyncio.Event()
+        bots = [Bot(url, name, seed * 100003 + index, encoding, ack) for index, name in names]
+        tasks = []
+        for bot in bots:
+            tasks.append(asyncio.create_task(bot.run(stop)))
+            # Bağlantıları yay, accept kuyruğu taşmasın
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(warmup)
+        conn.send("ready")
+        base = [(b.bytes_received, b.snapshots, b.snapshot_bytes, b.messages_sent) for b in bots]
+        started = time.perf_counter()
+        await asyncio.sleep(duration)
+        elapsed = time.perf_counter() - started
+        result = {"bots": len(bots), "joined": sum(1 for b in bots if b.joined.is_set()),
+                  "bytes": 0, "snapshots": 0, "snapshot_bytes": 0, "sent": 0, "elapsed": elapsed,
+                  "snapshot_max": max((b.snapshot_max for b in bots), default=0)}
+        for bot, (bytes0, snaps0, snap_bytes0, sent0) in zip(bots, base):
+            result["bytes"] += bot.bytes_received - bytes0
+            result["snapshots"] += bot.snapshots - snaps0
+            result["snapshot_bytes"] += bot.snapshot_bytes - snap_bytes0
+            result["sent"] += bot.messages_sent - sent0
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        conn.send(result)
+
+    asyncio.run(main())
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_step(rooms, args):
+    """
+    Runs one load level: a fresh server, rooms * room_size bots split over
+    the bot processes, a warmup and a measured window.
+
+    Returns:
+        dict: One row of the report.
+    """
+    context = multiprocessing.get_context("fork")
+    port = free_port()
+    server_conn, server_child = context.Pipe()
+    server = context.Process(target=run_server, args=(port, args.room_size, server_child), daemon=True)
+    server.start()
+    time.sleep(0.5)
+
+    url = f"ws://127.0.0.1:{port}"
+    bot_count = rooms * args.room_size
+    names = [(i, f"bot{i}") for i in range(bot_count)]
+    groups = [names[i::args.bot_procs] for i in range(args.bot_procs) if names[i::args.bot_procs]]
+    workers = []
+    for group in groups:
+        parent, child = context.Pipe()
+        process = context.Process(
+            target=run_bots,
+            args=(url, group, args.seed, args.encoding, args.ack, args.warmup, args.duration, child),
+            daemon=True
+        )
+        process.start()
+        workers.append((process, parent))
+
+    for _, parent in workers:
+        parent.recv()
+    server_conn.send("measure")
+
+    results = [parent.recv() for _, parent in workers]
+    server_conn.send("stop")
+    report = server_conn.recv()
+    for process, _ in workers:
+        process.join(timeout=5)
+    server.join(timeout=5)
+    if server.is_alive():
+        server.terminate()
+
+    elapsed = max(r["elapsed"] for r in results)
+    bots = sum(r["bots"] for r in results)
+    snapshots = sum(r["snapshots"] for r in results)
+    step = 1 / report["tick_rate"]
+    tick = report["tick"]
+    cpu_share = report["cpu"] / report["wall"]
+    ok = (cpu_share < args.cpu_budget and report["dropped_steps"] == 0 and
+          tick["p99_ms"] <= step * 1e3 and report["late_ticks"] <= 0.01 * max(1, report["ticks"]))
+    return {
+        "rooms": rooms,
+        "live_rooms": report["rooms"],
+        "bots": bots,
+        "joined": sum(r["joined"] for r in results),
+        "tick_p50_ms": tick["p50_ms"],
+        "tick_p99_ms": tick["p99_ms"],
+        "tick_max_ms": tick["max_ms"],
+        "late_ticks": report["late_ticks"],
+        "dropped_steps": report["dropped_steps"],
+        "snapshot_avg_b": sum(r["snapshot_bytes"] for r in results) / snapshots if snapshots else 0,
+        "snapshot_max_b": max(r["snapshot_max"] for r in results),
+        "kb_s_per_client": sum(r["bytes"] for r in results) / elapsed / max(1, bots) / 1024,
+        "msgs_s_per_client": sum(r["sent"] for r in results) / elapsed / max(1, bots),
+        "server_cpu_pct": cpu_share * 100,
+        "cpu_ms_per_room_s": report["cpu"] / report["wall"] * 1e3 / max(1, report["rooms"]),
+        "phase_ms_per_room_s": report["phase_ms_per_room_s"],
+        "ok": ok
+    }
+
+
+def print_row(row):
+    print(f"{row['rooms']:>6} {row['bots']:>5} {row['joined']:>6} "
+          f"{row['tick_p50_ms']:>8.2f} {row['tick_p99_ms']:>8.2f} {row['tick_max_ms']:>8.2f} "
+          f"{row['late_ticks']:>5} {row['dropped_steps']:>5} "
+          f"{row['snapshot_avg_b']:>8.0f} {row['kb_s_per_client']:>8.1f} "
+          f"{row['server_cpu_pct']:>6.1f} {row['cpu_ms_per_room_s']:>8.1f}  {'ok' if row['ok'] else 'OVER'}",
+          flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive a local GameServer with synthetic clients and report capacity.")
+    parser.add_argument("--steps", default="1,5,10,25,50",
+                        help="comma separated room counts to run, each with a fresh server")
+    parser.add_argument("--room-size", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds before measuring")
+    parser.add_argument("--bot-procs", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="processes the bots are spread over")
+    parser.add_argument("--encoding", choices=("json", "binary"), default="json")
+    parser.add_argument("--ack", action="store_true", help="acknowledge snapshots to get deltas")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cpu-budget", type=float, default=0.8,
+                        help="server CPU share above which a step counts as over capacity")
+    parser.add_argument("--json", metavar="FILE", help="also write the rows to FILE")
+    args = parser.parse_args()
+
+    print(f"{'rooms':>6} {'bots':>5} {'joined':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'late':>5} {'drop':>5} {'snap B':>8} {'KB/s/c':>8} {'cpu%':>6} {'ms/room':>8}")
+    rows = []
+    for rooms in (int(s) for s in args.steps.split(",")):
+        row = run_step(rooms, args)
+        rows.append(row)
+        print_row(row)
+
+    capacity = max((row["rooms"] for row in rows if row["ok"]), default=0)
+    print(f"capacity: {capacity} rooms ({capacity * args.room_size} clients) "
+          f"within {args.cpu_budget:.0%} of one core and the tick budget")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "rows": rows, "capacity_rooms": capacity}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Game"))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Network"))
+
+import argparse
+import json
+import multiprocessing
+import random
+import time
+import numpy as np
+from Game.game import Game
+from Game.map_registry import map_registry
+from Game.replay import InputLog, state_checksum
+from Utils.logger import Logger, LogLevel
+from Utils.profiler import Histogram
+from server import STOCK_MAP_PLATFORMS
+
+
+# Tick maliyeti maçın bu kadar eşit dilimine ayrı ayrı ölçülür
+PHASES = 4
+# Son dilim ilk dilimden bu kadar yavaşsa uyarı verilir
+CLIFF_RATIO = 1.5
+
+
+_stock_map = None
+
+
+def stock_map():
+    """Stock map compiled once per process and shared by its matches."""
+    global _stock_map
+    if _stock_map is None:
+        _, _stock_map = map_registry.acquire_platforms(STOCK_MAP_PLATFORMS)
+    return _stock_map
+
+
+class SimBot:
+    """
+    Scripted player fed to a Game once per tick, without a client.
+
+    "random" plays like the bot_swarm Bot: runs left/right/stops at random
+    intervals, jumps now and then and shoots left or right on a cooldown.
+    "hunter" walks towards the nearest living enemy, jumps when it is above
+    and shoots at it once it is roughly level. Both ask for a respawn a
+    second after dying. All decisions come from the bot's own seeded RNG.
+    """
+    SHOT_COOLDOWN = 0.5
+    RESPAWN_DELAY = 1.0
+    POLICIES = ("random", "hunter")
+
+    def __init__(self, player_id, policy, rng):
+        self.player_id = player_id
+        self.policy = policy
+        self.rng = rng
+        self.dir_x = 0
+        self.last_sent = (0, 0)
+        self.next_turn = 0.0
+        self.next_shot = rng.uniform(0, 1)
+        self.dead_since = None
+        self.respawns = 0
+
+    def act(self, game, now, delta_time):
+        """
+        Sends this tick's inputs to the game.
+
+        Parameters:
+            game (Game): Game the bot plays in.
+            now (float): Seconds since the match started.
+            delta_time (float): Simulation step, used for per-frame odds.
+        """
+        player = game.players[self.player_id]
+        if not player.is_alive:
+            if self.dead_since is None:
+                self.dead_since = now
+            elif now - self.dead_since > self.RESPAWN_DELAY:
+                game.respawn_player(self.player_id)
+                self.dead_since = None
+                self.respawns += 1
+            return
+
+        if self.policy == "hunter":
+            dir_x, dir_y, shoot = self.hunt(game, player)
+        else:
+            if now >= self.next_turn:
+                self.dir_x = self.rng.choice((-1, 0, 1))
+                self.next_turn = now + self.rng.uniform(0.3, 2.0)
+            dir_x = self.dir_x
+            dir_y = -1 if self.rng.random() < delta_time / 2 else 0
+            shoot = 1 if self.rng.random() < 0.5 else -1
+
+        # İstemci gibi: tuş basılıyken ya da değiştiğinde MOVE gönder
+        if dir_x != 0 or dir_y != 0 or (dir_x, dir_y) != self.last_sent:
+            game.update_player_position(self.player_id, (dir_x, dir_y))
+            self.last_sent = (dir_x, dir_y)
+        if shoot and now >= self.next_shot:
+            game.fire_bullet(self.player_id, (player.x, player.y - 20), (shoot, 0))
+            self.next_shot = now + self.SHOT_COOLDOWN + self.rng.uniform(0, 1.0)
+
+    def hunt(self, game, player):
+        """
+        Returns:
+            tuple: (dir_x, dir_y, shoot) towards the nearest living enemy;
+                shoot is the horizontal direction or 0 to hold fire.
+        """
+        target, best = None, None
+        for other in game.players.values():
+            if other.id == self.player_id or not other.is_alive:
+                continue
+            distance = abs(other.x - player.x) + abs(other.y - player.y)
+            if best is None or distance < best:
+                target, best = other, distance
+        if target is None:
+            return 0, 0, 0
+        dx = target.x - player.x
+        dy = target.y - player.y
+        dir_x = 0 if abs(dx) < 40 else (1 if dx > 0 else -1)
+        dir_y = -1 if dy < -60 and player.is_on_ground and self.rng.random() < 0.1 else 0
+        shoot = (1 if dx >= 0 else -1) if abs(dy + 20) < 25 else 0
+        return dir_x, dir_y, shoot
+
+
+def count_percentile(counts, p):
+    """p-th percentile (0-100) of the values whose occurrences are counts[value]."""
+    total = int(counts.sum())
+    if not total:
+        return 0
+    return int(np.searchsorted(np.cumsum(counts), p / 100 * total))
+
+
+def simulate_match(task):
+    """
+    Plays one full match headless: bots act, Game.tick runs until
+    check_win_condition reports a result (or max_ticks is reached).
+
+    Parameters:
+        task (tuple): (index, seed, players, policy, tick_rate, duration,
+            max_ticks, record_dir), a tuple so it can be sent to a pool.
+
+    Returns:
+        dict: Tick cost histograms per match phase, bullets alive per tick
+            (bincount), and the match outcome.
+    """
+    index, seed, players, policy, tick_rate, duration, max_ticks, record_dir = task
+    delta_time = 1 / tick_rate
+    game = Game()
+    game.make_deterministic(seed)
+    if duration is not None:
+        game.GAME_DURATION = duration
+    if record_dir:
+        game.recorder = InputLog(os.path.join(record_dir, f"match{index}_{seed}.k2log"), seed, delta_time,
+                                 game_duration=duration)
+    game.set_map(stock_map())
+
+    rng = random.Random(seed)
+    bots = []
+    for player_id in range(1, players + 1):
+        game.add_player(player_id, f"sim{player_id}", None)
+        bot_policy = rng.choice(SimBot.POLICIES) if policy == "mixed" else policy
+        bots.append(SimBot(player_id, bot_policy, random.Random(rng.getrandbits(64))))
+    game.assign_starting_positions()
+    game.start_game()
+
+    expected_ticks = max(1, round(game.GAME_DURATION * tick_rate))
+    phases = [Histogram() for _ in range(PHASES)]
+    bullets_alive = []
+    pool = game.bullets
+    clock = time.perf_counter
+    ticks = 0
+    started = clock()
+    while game.winner_info is None and ticks < max_ticks:
+        now = ticks * delta_time
+        for bot in bots:
+            bot.act(game, now, delta_time)
+        start = clock()
+        game.tick(delta_time)
+        phases[min(PHASES - 1, ticks * PHASES // expected_ticks)].record(clock() - start)
+        bullets_alive.append(int(np.count_nonzero(pool.alive[:pool.high])))
+        ticks += 1
+    wall_time = clock() - started
+
+    if game.recorder is not None:
+        game.recorder.close(state_checksum(game))
+        game.recorder = None
+
+    scores = [player.score for player in game.players.values()]
+    winner = game.winner_info or {"result": "unfinished"}
+    tick_max = max(h.max for h in phases)
+    return {
+        "index": index,
+        "seed": seed,
+        "ticks": ticks,
+        "wall_time": wall_time,
+        "phases": phases,
+        "tick_max": tick_max,
+        "bullets": np.bincount(np.asarray(bullets_alive, dtype=np.int64), minlength=1),
+        "result": winner["result"],
+        "winner_slot": winner.get("winner_id"),
+        "top_score": max(scores, default=0),
+        "kills": sum(scores),
+        "respawns": sum(bot.respawns for bot in bots),
+        "policies": [bot.policy for bot in bots],
+        "pool": pool.stats()
+    }
+
+
+def init_worker():
+    # Oyun logları ölçümü bozmasın
+    Logger.configure(level=LogLevel.ERROR)
+
+
+def run(args):
+    """
+    Runs args.matches matches over args.workers processes.
+
+    Returns:
+        dict: Aggregated report, see print_report().
+    """
+    tasks = [
+        (i, args.seed * 1000003 + i, args.players, args.policy, args.tick_rate,
+         args.duration, args.max_ticks, args.record)
+        for i in range(args.matches)
+    ]
+    started = time.perf_counter()
+    if args.workers <= 1:
+        init_worker()
+        results = map(simulate_match, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.get_context("fork").Pool(args.workers, initializer=init_worker)
+        chunksize = max(1, args.matches // (args.workers * 8))
+        results = pool.imap_unordered(simulate_match, tasks, chunksize)
+
+    phases = [Histogram() for _ in range(PHASES)]
+    bullets = np.zeros(1, dtype=np.int64)
+    matches = []
+    step = max(1, args.matches // 10)
+    try:
+        for done, result in enumerate(results, 1):
+            for total, histogram in zip(phases, result.pop("phases")):
+                total.merge(histogram)
+            counts = result.pop("bullets")
+            if counts.size > bullets.size:
+                counts[:bullets.size] += bullets
+                bullets = counts
+            else:
+                bullets[:counts.size] += counts
+            matches.append(result)
+            if not args.json_only and done % step == 0:
+                print(f"  {done}/{args.matches} matches", flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    wall_time = time.perf_counter() - started
+    return aggregate(args, phases, bullets, matches, wall_time)
+
+
+def aggregate(args, phases, bullets, matches, wall_time):
+    tick = Histogram()
+    for histogram in phases:
+        tick.merge(histogram)
+    ticks = np.array([m["ticks"] for m in matches])
+    kills = np.array([m["kills"] for m in matches])
+    results = [m["result"] for m in matches]
+    wins_by_slot = {}
+    for m in matches:
+        if m["result"] == "win":
+            wins_by_slot[m["winner_slot"]] = wins_by_slot.get(m["winner_slot"], 0) + 1
+    phase_means = [h.total / h.count * 1e3 if h.count else 0.0 for h in phases]
+    late_ratio = phase_means[-1] / phase_means[0] if phase_means[0] else 0.0
+    bullet_total = int(bullets.sum())
+    slowest = sorted(matches, key=lambda m: m["tick_max"], reverse=True)[:3]
+    return {
+        "matches": len(matches),
+        "workers": args.workers,
+        "wall_time": wall_time,
+        "matches_per_s": len(matches) / wall_time if wall_time else 0.0,
+        "ticks_per_s": int(ticks.sum()) / wall_time if wall_time else 0.0,
+        "tick": tick.to_dict(),
+        "tick_p90_ms": tick.percentile(90) * 1e3,
+        "phases": [dict(h.to_dict(), phase=i) for i, h in enumerate(phases)],
+        "late_to_early": late_ratio,
+        "bullets_alive": {
+            "mean": float(np.dot(np.arange(bullets.size), bullets) / bullet_total) if bullet_total else 0.0,
+            "p50": count_percentile(bullets, 50),
+            "p99": count_percentile(bullets, 99),
+            "max": int(bullets.size - 1),
+        },
+        "outcomes": {
+            "win": results.count("win"),
+            "tie": results.count("tie"),
+            "unfinished": results.count("unfinished"),
+            "wins_by_slot": {str(slot): count for slot, count in sorted(wins_by_slot.items())},
+            "ticks_mean": float(ticks.mean()) if len(matches) else 0.0,
+            "kills_mean": float(kills.mean()) if len(matches) else 0.0,
+            "kills_min": float(kills.min()) if len(matches) else 0.0,
+            "kills_max": float(kills.max()) if len(matches) else 0.0,
+            "top_score_mean": float(np.mean([m["top_score"] for m in matches])) if matches else 0.0,
+            "respawns_mean": float(np.mean([m["respawns"] for m in matches])) if matches else 0.0,
+        },
+        "bullet_slots_max": max((m["pool"]["capacity"] for m in matches), default=0),
+        "slowest": [
+            {"index": m["index"], "seed": m["seed"], "tick_max_ms": m["tick_max"] * 1e3, "policies": m["policies"]}
+            for m in slowest
+        ]
+    }
+
+
+def print_report(report):
+    tick = report["tick"]
+    outcomes = report["outcomes"]
+    bullets = report["bullets_alive"]
+    print(f"{report['matches']} matches on {report['workers']} worker(s) in {report['wall_time']:.1f} s: "
+          f"{report['matches_per_s']:.2f} matches/s, {report['ticks_per_s']:.0f} ticks/s")
+    print(f"tick cost: mean {tick['mean_ms']:.3f} ms, p50 {tick['p50_ms']:.3f} ms, "
+          f"p90 {report['tick_p90_ms']:.3f} ms, p99 {tick['p99_ms']:.3f} ms, max {tick['max_ms']:.3f} ms")
+    for phase in report["phases"]:
+        print(f"  phase {phase['phase'] + 1}/{PHASES}: mean {phase['mean_ms']:.3f} ms, "
+              f"p99 {phase['p99_ms']:.3f} ms, max {phase['max_ms']:.3f} ms")
+    if report["late_to_early"] > CLIFF_RATIO:
+        print(f"  warning: the last phase is {report['late_to_early']:.2f}x slower than the first")
+    print(f"bullets alive per tick: mean {bullets['mean']:.1f}, p50 {bullets['p50']}, "
+          f"p99 {bullets['p99']}, max {bullets['max']} (pool grew to {report['bullet_slots_max']} slots)")
+    print(f"outcomes: {outcomes['win']} wins, {outcomes['tie']} ties, {outcomes['unfinished']} unfinished; "
+          f"wins by slot {outcomes['wins_by_slot']}")
+    print(f"  per match: {outcomes['ticks_mean']:.0f} ticks, {outcomes['kills_mean']:.1f} kills "
+          f"({outcomes['kills_min']:.0f}-{outcomes['kills_max']:.0f}), top score {outcomes['top_score_mean']:.1f}, "
+          f"{outcomes['respawns_mean']:.1f} respawns")
+    for m in report["slowest"]:
+        print(f"  slow tick {m['tick_max_ms']:.2f} ms in match {m['index']} (seed {m['seed']}, {'/'.join(m['policies'])})")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play many complete matches headless with scripted players, spread over a process pool.")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--policy", choices=SimBot.POLICIES + ("mixed",), default="mixed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1, help="match i is played with seed * 1000003 + i")
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--duration", type=float, help="match length in seconds, Game.GAME_DURATION by default")
+    parser.add_argument("--max-ticks", type=int, default=10 ** 7, help="give up on a match after this many ticks")
+    parser.add_argument("--record", metavar="DIR",
+                        help="write every match's input log to DIR (replay with Tools/replay.py)")
+    parser.add_argument("--json", metavar="FILE", help="also write the report to FILE")
+    parser.add_argument("--json-only", action="store_true", help="print the report as JSON only")
+    args = parser.parse_args()
+
+    Logger.configure(level=LogLevel.ERROR)
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+
+    report = run(args)
+    if args.json_only:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "report": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Game"))
+
+import argparse
+import json
+from Game.replay import Replayer
+from Utils.logger import Logger, LogLevel
+from Utils.profiler import TickProfiler
+
+
+def replay(path, repeat=1, profile=False):
+    """
+    Replays one input log repeat times and keeps the fastest run.
+
+    Returns:
+        dict: Replayer.run() result of the fastest run, with the profiler
+            report of that run under "profile" when profile is set.
+    """
+    replayer = Replayer(path)
+    best = None
+    for _ in range(repeat):
+        game = replayer.new_game()
+        profiler = None
+        if profile:
+            profiler = TickProfiler()
+            game.profiler = profiler
+            game.profile_id = 0
+        result = replayer.run(game)
+        if profiler is not None:
+            result["profile"] = profiler.report()
+        if best is None or result["wall_time"] < best["wall_time"]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-simulate matches recorded with server.py --record, headless and as fast as possible.")
+    parser.add_argument("logs", nargs="+", metavar="LOG")
+    parser.add_argument("--repeat", type=int, default=1, help="replays per log, the fastest one is reported")
+    parser.add_argument("--profile", action="store_true", help="include per-phase tick histograms")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    # Oyun logları ölçümü bozmasın
+    Logger.configure(level=LogLevel.ERROR)
+
+    results = {}
+    mismatches = 0
+    for path in args.logs:
+        result = replay(path, max(1, args.repeat), args.profile)
+        results[path] = result
+        if result["checksum_match"] is False:
+            mismatches += 1
+        if args.json:
+            continue
+        match = {True: "ok", False: "MISMATCH", None: "no END record"}[result["checksum_match"]]
+        print(f"{path}: {result['ticks']} ticks ({result['sim_time']:.1f} s simulated) in "
+              f"{result['wall_time']:.3f} s, {result['ticks_per_second']:.0f} ticks/s, "
+              f"{result['speedup']:.1f}x real time, checksum {match}")
+        print(f"  scores: {result['scores']}")
+        if result["errors"]:
+            print(f"  {result['errors']} record(s) rejected by the replayed game")
+        if args.profile:
+            print(json.dumps(result["profile"], indent=2))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if mismatches:
+        print(f"{mismatches} replay(s) diverged from the recording")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
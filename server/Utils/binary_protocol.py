@@ -0,0 +1,116 @@
+import math
+import struct
+
+
+class BinaryProtocol:
+    """
+    Compact fixed-layout binary encoding for the high-frequency messages.
+
+    Every frame starts with a one byte message code. All numbers are
+    little-endian, positions and vectors are float32.
+
+        MOVE        <B f f f f I>   code, x, y, dir_x, dir_y, player_id
+        SHOOT       <B f f f f>     code, dir_x, dir_y, pos_x, pos_y
+        GAME_STATE  <B I I H H f>   code, seq, tick, player_count, bullet_count, remaining_time
+                    player_count x PLAYER, then bullet_count x BULLET
+        PLAYER      <I f f f f f f B f f>
+                    id, x, y, dir_x, dir_y, health, score, flags, vel_x, vel_y
+                    flags: bit 0 is_alive, bit 1 is_on_ground
+        BULLET      <I I f f f f B> id, owner, x, y, dir_x, dir_y, alive
+
+    Usernames are not part of GAME_STATE, clients get them from the JSON
+    join/game_start messages. A remaining_time of NaN means unknown. tick is
+    the room's simulation step the snapshot was taken at (see sim_rate in
+    game_start).
+    """
+    VERSION = 2
+
+    MOVE = 1
+    SHOOT = 2
+    GAME_STATE = 3
+
+    MOVE_STRUCT = struct.Struct("<BffffI")
+    SHOOT_STRUCT = struct.Struct("<Bffff")
+    STATE_HEADER = struct.Struct("<BIIHHf")
+    PLAYER_STRUCT = struct.Struct("<IffffffBff")
+    BULLET_STRUCT = struct.Struct("<IIffffB")
+
+    # player_count ve bullet_count uint16; BulletPool.MAX_SLOTS buna göre
+    MAX_COUNT = 0xFFFF
+
+    ALIVE_FLAG = 1
+    ON_GROUND_FLAG = 2
+
+    def decode(self, raw_message):
+        """
+        Decodes a binary frame into the same dict decode_message() returns for JSON.
+
+        Returns:
+            dict or None: { "type": ..., "data": {...} }, None for unknown or
+                malformed frames.
+        """
+        if not raw_message:
+            return None
+        code = raw_message[0]
+        try:
+            if code == self.MOVE:
+                _, x, y, dir_x, dir_y, player_id = self.MOVE_STRUCT.unpack(raw_message)
+                return {
+                    "type": "move",
+                    "data": {"x": x, "y": y, "direction": [dir_x, dir_y], "player_id": player_id}
+                }
+            if code == self.SHOOT:
+                _, dir_x, dir_y, pos_x, pos_y = self.SHOOT_STRUCT.unpack(raw_message)
+                return {
+                    "type": "shoot",
+                    "data": {"direction": [dir_x, dir_y], "position": [pos_x, pos_y]}
+                }
+        except struct.error:
+            return None
+        return None
+
+    def encode_move(self, x, y, direction, player_id):
+        return self.MOVE_STRUCT.pack(self.MOVE, x, y, direction[0], direction[1], player_id)
+
+    def encode_shoot(self, direction, position):
+        return self.SHOOT_STRUCT.pack(self.SHOOT, direction[0], direction[1], position[0], position[1])
+
+    def encode_game_state(self, game_state, seq=0, tick=0):
+        """
+        Encodes a Game.get_game_state() dict into one GAME_STATE frame.
+
+        Args:
+            game_state (dict): { "players": [...], "bullets": [...], "remaining_time": ... }
+            seq (int): Snapshot sequence number.
+            tick (int): Simulation step of the snapshot.
+
+        Returns:
+            bytes: The encoded frame.
+        """
+        players = game_state["players"]
+        bullets = game_state["bullets"]
+        remaining_time = game_state.get("remaining_time")
+        if remaining_time is None:
+            remaining_time = math.nan
+
+        assert len(players) <= self.MAX_COUNT and len(bullets) <= self.MAX_COUNT, \
+            "GAME_STATE counts are uint16"
+        pack_player = self.PLAYER_STRUCT.pack
+        pack_bullet = self.BULLET_STRUCT.pack
+        parts = [self.STATE_HEADER.pack(self.GAME_STATE, seq, tick, len(players), len(bullets), remaining_time)]
+        for p in players:
+            position = p["player_position"]
+            direction = p["player_direction"]
+            velocity = p["player_velocity"]
+            flags = ((self.ALIVE_FLAG if p["player_is_alive"] else 0) |
+                     (self.ON_GROUND_FLAG if p["is_on_ground"] else 0))
+            parts.append(pack_player(
+                p["player_id"], position[0], position[1], direction[0], direction[1],
+                p["player_health"], p["player_score"], flags, velocity[0], velocity[1]
+            ))
+        for b in bullets:
+            parts.append(pack_bullet(
+                b["id"], b["owner"], b["pos"]["x"], b["pos"]["y"],
+                b["dir"]["x"], b["dir"]["y"], 1 if b["alive"] else 0
+            ))
+        return b"".join(parts)
@@ -1,16 +1,224 @@
-from enum import Enum
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+from enum import Enum, IntEnum
 from time import time
 
+
 class LogType(Enum):
     CLIENT_INFO = "client_info"
     GAME_INFO = "game_info"
+    ERROR = "error"
+    DEBUG = "debug"
+
+
+class LogLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+
+class _CallSite:
+    """Rate limit and sampling state of one log call site."""
+    __slots__ = ("window", "emitted", "suppressed", "counter")
+
+    def __init__(self):
+        self.window = 0
+        self.emitted = 0
+        self.suppressed = 0
+        self.counter = 0
+
+
 class Logger:
+    """
+    Structured, queue-backed logger.
+
+    send_log() only checks the level, applies the call site's rate limit or
+    sampling and puts a tuple on a queue; a background thread formats the
+    records and writes them out. A filtered-out call returns after one set
+    lookup, so pass variable parts as keyword fields instead of formatting
+    them into the message, they are only formatted by the writer thread:
+
+        Logger.send_log(LogType.DEBUG, "bullet spawned", player_id=pid, pos=position)
+        Logger.send_log(LogType.GAME_INFO, "score update", rate=5, player_id=pid)
+        Logger.send_log(LogType.CLIENT_INFO, "move", level=LogLevel.DEBUG, sample=100)
+
+    Call sites are identified by (log_type, message), so keep messages constant.
+    Per-event debug logs on the tick path can skip even the call by checking
+    Logger.debug_enabled first.
+
+    Usage:
+        Logger.configure(level=LogLevel.DEBUG, json_output=True)
+    """
+    level = LogLevel.INFO
+    debug_enabled = False
+    json_output = False
+    stream = None
+
+    # Varsayılan seviyeler; level= ile çağrı bazında değiştirilebilir
+    TYPE_LEVELS = {
+        LogType.CLIENT_INFO: LogLevel.INFO,
+        LogType.GAME_INFO: LogLevel.INFO,
+        LogType.ERROR: LogLevel.ERROR,
+        LogType.DEBUG: LogLevel.DEBUG,
+    }
+
+    _queue = queue.SimpleQueue()
+    _thread = None
+    _lock = threading.Lock()
+    _call_sites = {}
+    # level'dan türetilir: yazılan LogType değerleri (enum hash'i yavaş)
+    _enabled_types = frozenset(t.value for t, l in TYPE_LEVELS.items() if l >= LogLevel.INFO)
+
+    @classmethod
+    def configure(cls, level=None, json_output=None, stream=None):
+        """
+        Args:
+            level (LogLevel): Lowest level that is written.
+            json_output (bool): One JSON object per line instead of text.
+            stream: File object written to, sys.stdout by default.
+        """
+        if level is not None:
+            cls.level = LogLevel(level)
+            cls.debug_enabled = cls.level <= LogLevel.DEBUG
+            cls._enabled_types = frozenset(t.value for t, l in cls.TYPE_LEVELS.items() if l >= cls.level)
+        if json_output is not None:
+            cls.json_output = json_output
+        if stream is not None:
+            cls.stream = stream
+
+    @classmethod
+    def is_enabled(cls, level):
+        return level >= cls.level
+
     @staticmethod
-    def send_log(log_type,message):
-        if log_type not in LogType:
-            print("[Error] Log type not found in LogType")
+    def send_log(log_type, message, level=None, rate=None, sample=None, **fields):
+        """
+        Queues a log record.
+
+        Args:
+            log_type (LogType): Category of the record.
+            message (str): Constant event text.
+            level (LogLevel): Overrides the log type's default level.
+            rate (int): Most records per second from this call site; the
+                number suppressed is added to the next record written.
+            sample (int): Only every sample-th record from this call site is written.
+            **fields: Structured data, formatted by the writer thread.
+        """
+        if level is None:
+            if log_type.__class__ is not LogType:
+                print("[Error] Log type not found in LogType")
+                return
+            if log_type._value_ not in Logger._enabled_types:
+                return
+            level = Logger.TYPE_LEVELS[log_type]
+        elif level < Logger.level:
             return
-        print(f"[{log_type}] - {time()} - {message}")
-        
-        
-        
\ No newline at end of file
+
+        now = time()
+        if rate is not None or sample is not None:
+            key = (log_type, message)
+            site = Logger._call_sites.get(key)
+            if site is None:
+                site = Logger._call_sites[key] = _CallSite()
+            if sample is not None:
+                site.counter += 1
+                if sample > 1 and site.counter % sample != 1:
+                    return
+            if rate is not None:
+                window = int(now)
+                if window != site.window:
+                    site.window = window
+                    site.emitted = 0
+                if site.emitted >= rate:
+                    site.suppressed += 1
+                    return
+                site.emitted += 1
+            if site.suppressed:
+                fields["suppressed"] = site.suppressed
+                site.suppressed = 0
+
+        Logger._queue.put((now, level, log_type, message, fields))
+        if Logger._thread is None:
+            Logger._start()
+
+    @classmethod
+    def _start(cls):
+        with cls._lock:
+            if cls._thread is not None:
+                return
+            cls._thread = threading.Thread(target=cls._run, name="logger", daemon=True)
+            cls._thread.start()
+
+    @classmethod
+    def _run(cls):
+        while True:
+            record = cls._queue.get()
+            if record is None:
+                break
+            cls._write([record] + cls._drain())
+
+    @classmethod
+    def _drain(cls, keep_sentinel=True):
+        records = []
+        try:
+            while True:
+                record = cls._queue.get_nowait()
+                if record is None:
+                    if keep_sentinel:
+                        # _run bir sonraki get'te dursun
+                        cls._queue.put(None)
+                        break
+                    continue
+                records.append(record)
+        except queue.Empty:
+            pass
+        return records
+
+    @classmethod
+    def _write(cls, records):
+        stream = cls.stream or sys.stdout
+        lines = []
+        for created, level, log_type, message, fields in records:
+            if cls.json_output:
+                entry = {"time": created, "level": level.name, "type": log_type.value, "message": message}
+                entry.update(fields)
+                lines.append(json.dumps(entry, default=str))
+            elif fields:
+                extra = " ".join(f"{k}={v}" for k, v in fields.items())
+                lines.append(f"[{log_type}] - {created} - {message} {extra}")
+            else:
+                lines.append(f"[{log_type}] - {created} - {message}")
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def flush(cls):
+        """Writes everything queued so far from the calling thread, and stops the writer."""
+        thread = cls._thread
+        if thread is not None and thread.is_alive():
+            cls._queue.put(None)
+            thread.join(timeout=2)
+            cls._thread = None
+        records = cls._drain(keep_sentinel=False)
+        if records:
+            cls._write(records)
+
+    @classmethod
+    def _after_fork(cls):
+        # Çocuk süreçte yazıcı thread yok, ilk kayıtta yeniden başlar
+        cls._thread = None
+        cls._lock = threading.Lock()
+        cls._queue = queue.SimpleQueue()
+
+
+atexit.register(Logger.flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=Logger._after_fork)
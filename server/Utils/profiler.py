@@ -0,0 +1,171 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+
+
+class Histogram:
+    """
+    Fixed-bucket duration histogram. Bucket bounds are in microseconds and
+    never change, so recording is a short bisect over a constant list and
+    histograms of different rooms or runs can be added up bucket by bucket.
+    """
+    # Üst sınırlar (µs); son bucket bunların hepsinden uzun süreler
+    BOUNDS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(self.BOUNDS_US, seconds * 1e6)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        """Adds another histogram's samples to this one."""
+        for bucket, count in enumerate(other.counts):
+            self.counts[bucket] += count
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+        return self
+
+    def percentile(self, p):
+        """
+        Returns:
+            float: Upper bound in seconds of the bucket holding the p-th
+                percentile (0-100), capped at the largest recorded sample so
+                it is never above max; the max for the overflow bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if bucket < len(self.BOUNDS_US):
+                    return min(self.BOUNDS_US[bucket] / 1e6, self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+            "buckets_us": list(self.BOUNDS_US),
+            "counts": list(self.counts)
+        }
+
+
+class TickProfiler:
+    """
+    Per-room, per-phase timing of the tick.
+
+    Phases: "input", "physics", "bullets" (Game.tick), "snapshot", "encode",
+    "broadcast" (GameRoom) and "tick" for a room's whole fixed step
+    (GameServer.game_loop).
+
+    Instrumented code holds a reference that is None while profiling is off
+    and only reads the clock behind an `if profiler` check, so a disabled
+    profiler costs one attribute test per phase:
+
+        profiler = self.profiler
+        start = profiler.now() if profiler else 0.0
+        ...
+        if profiler:
+            start = profiler.record(room_id, "physics", start)
+
+    With trace=True every recorded phase is also kept as a Chrome trace
+    event (one track per room) in a bounded buffer; export_chrome_trace()
+    writes it for chrome://tracing or Perfetto.
+    """
+    now = staticmethod(time.perf_counter)
+
+    def __init__(self, trace=False, trace_limit=200000):
+        """
+        Args:
+            trace (bool): Keep a per-tick timeline as well as the histograms.
+            trace_limit (int): Most trace events kept, oldest are dropped first.
+        """
+        self.histograms = {}
+        self.trace = deque(maxlen=trace_limit) if trace else None
+        self.pid = os.getpid()
+
+    def record(self, room_id, phase, start, end=None):
+        """
+        Records one phase that started at start (a now() value) and ends now.
+
+        Returns:
+            float: The end time, which is the start of the next phase when
+                phases are measured back to back.
+        """
+        if end is None:
+            end = time.perf_counter()
+        histograms = self.histograms.get(room_id)
+        if histograms is None:
+            histograms = self.histograms[room_id] = {}
+        histogram = histograms.get(phase)
+        if histogram is None:
+            histogram = histograms[phase] = Histogram()
+        histogram.record(end - start)
+        if self.trace is not None:
+            self.trace.append((phase, room_id, start, end - start))
+        return end
+
+    def report(self):
+        """
+        Returns:
+            dict: { room_id: { phase: Histogram.to_dict() } }
+        """
+        return {
+            room_id: {phase: h.to_dict() for phase, h in phases.items()}
+            for room_id, phases in self.histograms.items()
+        }
+
+    def merged(self, phase):
+        """
+        Returns:
+            Histogram: The phase's samples of all rooms together.
+        """
+        histogram = Histogram()
+        for phases in self.histograms.values():
+            if phase in phases:
+                histogram.merge(phases[phase])
+        return histogram
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the recorded timeline in Chrome trace event format.
+
+        Args:
+            path (str): Output .json file.
+
+        Returns:
+            int: Number of events written.
+        """
+        events = []
+        if self.trace is not None:
+            for phase, room_id, start, duration in self.trace:
+                events.append({
+                    "name": phase,
+                    "cat": "tick",
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": self.pid,
+                    "tid": room_id
+                })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
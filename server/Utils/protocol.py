@@ -5,6 +5,16 @@ from enum import Enum
 import time
 import json
 from validation import Validation
+from binary_protocol import BinaryProtocol
+from Utils.logger import Logger, LogType
+
+# orjson kuruluysa daha hızlı JSON parse için onu kullan
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
 
 class MessageType(Enum):
     MOVE = "move"
@@ -23,6 +33,13 @@ class MessageType(Enum):
     JOIN = "join"
     MAP = "map_data"
     REMAINING_TIME = "remaining_time"
+    GAME_STATE_DELTA = "game_state_delta"
+    ACK = "ack"
+
+
+MESSAGE_TYPES = frozenset(msg_type.value for msg_type in MessageType)
+# Input rate'inde gelen mesajlar, genel validasyonu atlar
+FAST_PATH_TYPES = frozenset((MessageType.MOVE.value, MessageType.SHOOT.value))
     
 
 class Protocol:
@@ -31,9 +48,17 @@ class Protocol:
     between clients and server.
     """
 
+    # MOVE direction bileşenleri: istemci -1, 0 veya 1 gönderir
+    MAX_MOVE_INPUT = 1
+
+    JSON_ENCODING = "json"
+    BINARY_ENCODING = "binary"
+    ENCODINGS = (JSON_ENCODING, BINARY_ENCODING)
+
     def __init__(self):
         # Example: could hold protocol version or other configurations
-        self.version = "1.0"
+        self.version = "1.1"
+        self.binary = BinaryProtocol()
 
     # ------------------------------
     # General-purpose methods
@@ -44,37 +69,35 @@ class Protocol:
         Deserialize raw incoming data into a Python dict.
 
         Args:
-            raw_message (bytes/str): Raw network data.
+            raw_message (bytes/str): Raw network data. Binary frames are
+                decoded with BinaryProtocol, text frames as JSON.
 
         Returns:
             dict: Decoded message { "type": "MOVE", "data": {...} }
         """
+        if isinstance(raw_message, (bytes, bytearray)):
+            return self.binary.decode(raw_message)
         try:
-            message = json.loads(raw_message)
-            
-            if not isinstance(message,dict):
-                raise ValueError("Message must be dict")
-            if "type" not in message:
-                raise ValueError("Message must include type")
-            if "data" not in message:
-                raise ValueError("Message must include data")
-            
-            message_type = message.get("type")
-            if not any(message_type == msg_type.value for msg_type in MessageType):
-                raise ValueError("Message type is invalid")
-            
-            return message
-        
-        except json.JSONDecodeError as e:
-            print(f"JSON parse hatası: {e}")
-            return None
+            message = json_loads(raw_message)
         except ValueError as e:
-            print(f"Mesaj format hatası: {e}")
+            Logger.send_log(LogType.ERROR, "JSON parse hatası", rate=5, error=e)
             return None
-        except Exception as e:
-            print(f"Beklenmeyen hata: {e}")
+
+        if type(message) is not dict:
+            Logger.send_log(LogType.ERROR, "Mesaj format hatası: Message must be dict", rate=5)
+            return None
+
+        message_type = message.get("type")
+        # Fast path: MOVE/SHOOT data alanını deserialize_move/deserialize_shoot doğrular
+        if message_type in FAST_PATH_TYPES:
+            return message
+
+        if message_type not in MESSAGE_TYPES or "data" not in message:
+            Logger.send_log(LogType.ERROR, "Mesaj format hatası: invalid message type or missing data", rate=5, message_type=message_type)
             return None
 
+        return message
+
     def create_error_response(self, error_type, details=""):
         """
         Create a standardized error message.
@@ -95,7 +118,7 @@ class Protocol:
         return {
                     "player_id" : player.id,
                     "username" : player.username,
-                    "player_position" : player.position,
+                    "player_position" : (player.x, player.y),
                     "player_direction" : player.direction,
                     "player_health" : player.health,
                     "player_is_alive" : player.is_alive,
@@ -131,38 +154,95 @@ class Protocol:
         """
         Parse MOVE message data.
 
+        MOVE skips the generic checks of decode_message(), so this is where
+        its payload is validated: the direction must be two finite numbers
+        in [-1, 1], anything else is rejected before it reaches the input
+        buffer and the game tick.
+
         Args:
             data (dict): The 'data' field from MOVE message.
 
         Returns:
-            tuple: (x, y, direction,player_id)
+            tuple: (x, y, direction,player_id), None if the message is malformed
         """
         if message and message.get("type") == MessageType.MOVE.value:
-            data = message.get("data",{})
+            data = message.get("data")
+            if type(data) is not dict:
+                return None
+            direction = Validation.validate_vector(data.get("direction"), limit=self.MAX_MOVE_INPUT)
+            if direction is None:
+                return None
             return (
                 data.get("x"),
                 data.get("y"),
-                data.get("direction"),
+                direction,
                 data.get("player_id")
                 )
         return None
     # SHOOT message
-    def serialize_shoot(self, bullet):
+    def serialize_shoot(self, bullet_pool):
         """
-        Create a SHOOT message structure.
+        Serialize every bullet of a BulletPool for the game state.
+
+        The pool's tombstones, bullets freed since the last snapshot before
+        it could report them dead, follow the live rows with alive False.
 
         Args:
-            target_id (str/int): ID of the target.
-            weapon_type (str): Weapon type (e.g., 'laser', 'bullet').
+            bullet_pool (BulletPool): Bullets of the game, read column-wise.
 
         Returns:
-            dict: { "type": "SHOOT", "data": { "target_id": ..., "weapon": ... } }
+            list: [{ "id": ..., "owner": ..., "pos": {"x", "y"}, "dir": {"x", "y"}, "alive": ... }, ...]
+        """
+        tombstones = bullet_pool.tombstones
+        if len(bullet_pool) == 0:
+            bullets = []
+        else:
+            rows = bullet_pool.rows()
+            bullets = [
+                {
+                    "id": bullet_id,
+                    "owner": owner,
+                    "pos": {"x": x, "y": y},
+                    "dir": {"x": dx, "y": dy},
+                    "alive": alive
+                }
+                for bullet_id, owner, x, y, dx, dy, alive in zip(
+                    bullet_pool.ids[rows].tolist(),
+                    bullet_pool.owner[rows].tolist(),
+                    bullet_pool.x[rows].tolist(),
+                    bullet_pool.y[rows].tolist(),
+                    bullet_pool.dx[rows].tolist(),
+                    bullet_pool.dy[rows].tolist(),
+                    bullet_pool.alive[rows].tolist()
+                )
+            ]
+        if tombstones:
+            # Binary GAME_STATE en fazla MAX_SLOTS mermi taşır
+            room = bullet_pool.MAX_SLOTS - len(bullets)
+            bullets.extend(
+                {
+                    "id": bullet_id,
+                    "owner": owner,
+                    "pos": {"x": x, "y": y},
+                    "dir": {"x": dx, "y": dy},
+                    "alive": False
+                }
+                for bullet_id, owner, x, y, dx, dy in tombstones[:room]
+            )
+        return bullets
+
+    def serialize_bullet(self, bullet):
+        """
+        Serialize a single Bullet object like one row of serialize_shoot().
+
+        Returns:
+            dict: { "id": ..., "owner": ..., "pos": {"x", "y"}, "dir": {"x", "y"}, "alive": ... }
         """
         return {
             "id": bullet.id,
             "owner": bullet.owner_id,
-            "pos": bullet.pos,
-            "dir": bullet.dir,
+            "pos": {"x": bullet.x, "y": bullet.y},
+            "dir": {"x": bullet.dx, "y": bullet.dy},
             "alive": bullet.alive
         }
 
@@ -170,18 +250,29 @@ class Protocol:
         """
         Parse SHOOT message data.
 
+        Like deserialize_move() this is the validation of the fast path:
+        direction and position must both be two finite numbers.
+
         Args:
             message (dict): The 'data' field from SHOOT message.
 
         Returns:
-            tuple: (muzzle_dir_x,muzzle_dir_y, muzzle_pos_x, muzzle_pos_y)
+            tuple: ((muzzle_dir_x, muzzle_dir_y), (muzzle_pos_x, muzzle_pos_y)),
+                None if the message is malformed
         """
         if message and message.get("type") == MessageType.SHOOT.value:
             data = message.get("data")
+            if type(data) is not dict:
+                return None
+            direction = Validation.validate_vector(data.get("direction"))
+            position = Validation.validate_vector(data.get("position"))
+            if direction is None or position is None:
+                return None
             return (
-                data.get("direction"),
-                data.get("position")
+                direction,
+                position
             )
+        return None
 
     # CHAT message
     def serialize_chat(self, sender_id, text):
@@ -284,15 +375,43 @@ class Protocol:
         Args:
             player_id (int): 
         Returns:
-            dict: {"type": "CONNECT", "data": {"player_id": ...}}
+            dict: {"type": "CONNECT", "data": {"player_id": ..., "protocol_version": ..., "encodings": [...]}}
+            A client picks one of the encodings by sending it as "encoding"
+            in its join data, see negotiate_encoding().
         """
         return json.dumps({"type":"connect",
                 "data": {
                     "player_id" : player_id,
-                    "status" : "CONNECTED"
+                    "status" : "CONNECTED",
+                    "protocol_version" : self.version,
+                    "binary_version" : BinaryProtocol.VERSION,
+                    "encodings" : list(self.ENCODINGS)
                     }
                 })
 
+    def negotiate_encoding(self, requested):
+        """
+        Picks the outbound encoding for a client.
+
+        Args:
+            requested (str): "encoding" field of the client's join data, may be None.
+
+        Returns:
+            str: The requested encoding if supported, JSON otherwise.
+        """
+        if requested in self.ENCODINGS:
+            return requested
+        return self.JSON_ENCODING
+
+    def serialize_game_state_binary(self, game_state, seq=0, tick=0):
+        """
+        Create a binary GAME_STATE frame, see BinaryProtocol for the layout.
+
+        Returns:
+            bytes: Encoded frame.
+        """
+        return self.binary.encode_game_state(game_state, seq, tick)
+
     
     def serialize_game_state(self,game_state):
         return json.dumps(
@@ -336,15 +455,53 @@ class Protocol:
             }
             
         except Exception as e:
-            print(f"Map data deserialization error: {e}")
+            Logger.send_log(LogType.ERROR, "Map data deserialization error", error=e)
             return None
     
-    def serialize_game_state(self,players_data,bullets_data):
+    def serialize_game_state(self,players_data,bullets_data,remaining_time=None):
         return {
             "players" : players_data,
-            "bullets" : bullets_data
+            "bullets" : bullets_data,
+            "remaining_time" : remaining_time
         }
     
+    def serialize_game_state_delta(self, seq, base_seq, delta):
+        """
+        Create a GAME_STATE_DELTA message structure.
+
+        Args:
+            seq (int): Sequence number of the snapshot this delta produces.
+            base_seq (int): Snapshot the delta applies to (the client's last ack).
+            delta (dict): Output of SnapshotHistory.delta().
+
+        Returns:
+            dict: { "type": "game_state_delta", "data": { "seq", "base", "players", "bullets",
+                "removed_players", "removed_bullets" } }
+        """
+        data = {"seq": seq, "base": base_seq}
+        data.update(delta)
+        return {
+            "type": MessageType.GAME_STATE_DELTA.value,
+            "data": data
+        }
+
+    def deserialize_ack(self, message):
+        """
+        Parse ACK message data.
+
+        Args:
+            message (dict): ACK message, data { "seq": n }. A missing or null seq
+                asks for a full snapshot (e.g. after the client lost one).
+
+        Returns:
+            int or None: Acknowledged snapshot sequence number.
+        """
+        if message and message.get("type") == MessageType.ACK.value:
+            seq = (message.get("data") or {}).get("seq")
+            if isinstance(seq, int) and not isinstance(seq, bool):
+                return seq
+        return None
+
     def serialize_remaining_time(self, game):
          
             remaining_time = game.get_remaining_time()
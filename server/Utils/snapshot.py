@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+
+class SnapshotHistory:
+    """
+    Keeps the last few game state snapshots of a room, indexed by sequence
+    number, so a delta can be computed against whatever snapshot a client
+    acknowledged last.
+
+    Only the room holds snapshots; each client only remembers the sequence
+    number of its acknowledged baseline.
+    """
+    PLAYER_KEY = "player_id"
+    BULLET_KEY = "id"
+
+    def __init__(self, size=32):
+        """
+        Args:
+            size (int): Number of snapshots kept. A client whose baseline is
+                older than this gets a full snapshot again.
+        """
+        self.size = size
+        self.seq = 0
+        self.snapshots = OrderedDict()
+        # seq -> snapshot'ın alındığı simülasyon tick'i
+        self.ticks = {}
+
+    def push(self, game_state, tick=None):
+        """
+        Stores a snapshot built by Game.get_game_state().
+
+        Args:
+            tick: Simulation tick the snapshot was taken at, see tick_of().
+
+        Returns:
+            int: Sequence number assigned to the snapshot.
+        """
+        self.seq += 1
+        self.snapshots[self.seq] = (
+            {p[self.PLAYER_KEY]: p for p in game_state["players"]},
+            {b[self.BULLET_KEY]: b for b in game_state["bullets"]}
+        )
+        self.ticks[self.seq] = tick
+        while len(self.snapshots) > self.size:
+            old_seq, _ = self.snapshots.popitem(last=False)
+            self.ticks.pop(old_seq, None)
+        return self.seq
+
+    def __contains__(self, seq):
+        return seq in self.snapshots
+
+    def tick_of(self, seq):
+        """Tick the snapshot seq was taken at, None if unknown or evicted."""
+        return self.ticks.get(seq)
+
+    def delta(self, base_seq, seq=None, base_visible=None, visible=None):
+        """
+        Computes the changes from snapshot base_seq to snapshot seq.
+
+        Args:
+            base_seq (int): Snapshot the client acknowledged.
+            seq (int): Target snapshot, defaults to the latest.
+            base_visible (tuple): (player_ids, bullet_ids) the client saw in
+                base_seq, None for everything (see InterestFilter).
+            visible (tuple): (player_ids, bullet_ids) the client sees in seq.
+
+        Returns:
+            dict: Changed entities holding only their id and changed fields,
+                plus the ids of removed entities; None if either snapshot is
+                no longer in the history.
+        """
+        if seq is None:
+            seq = self.seq
+        if base_seq not in self.snapshots or seq not in self.snapshots:
+            return None
+
+        base_players, base_bullets = self._visible(self.snapshots[base_seq], base_visible)
+        players, bullets = self._visible(self.snapshots[seq], visible)
+        return {
+            "players": self._diff(base_players, players, self.PLAYER_KEY),
+            "bullets": self._diff(base_bullets, bullets, self.BULLET_KEY),
+            "removed_players": [k for k in base_players if k not in players],
+            "removed_bullets": [k for k in base_bullets if k not in bullets]
+        }
+
+    @staticmethod
+    def _visible(snapshot, visible):
+        if visible is None:
+            return snapshot
+        players, bullets = snapshot
+        player_ids, bullet_ids = visible
+        # Görüş alanından çıkanlar client için "removed" olur
+        return (
+            {k: v for k, v in players.items() if k in player_ids},
+            {k: v for k, v in bullets.items() if k in bullet_ids}
+        )
+
+    @staticmethod
+    def _diff(base, current, id_key):
+        changes = []
+        for entity_id, entity in current.items():
+            old = base.get(entity_id)
+            if old is None:
+                changes.append(entity)
+                continue
+            changed = {k: v for k, v in entity.items() if old.get(k) != v}
+            if changed:
+                changed[id_key] = entity_id
+                changes.append(changed)
+        return changes
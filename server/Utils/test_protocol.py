@@ -0,0 +1,122 @@
+"""
+MOVE/SHOOT skip the generic checks of decode_message(); these tests pin down
+that deserialize_move/deserialize_shoot reject every malformed payload, for
+JSON text frames and binary frames alike.
+
+Run from server/: python -m pytest -q Utils/test_protocol.py
+"""
+
+import sys, os
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import pytest
+from protocol import Protocol
+from validation import Validation
+from Utils.logger import Logger, LogLevel
+
+# JSON'da gelebilecek bozuk vektörler
+BAD_VECTORS = [
+    None,
+    "1,0",
+    ["1", 0],
+    [1],
+    [1, 0, 0],
+    [],
+    {"x": 1, "y": 0},
+    [True, 0],
+    [None, 0],
+    [[1], 0],
+    [10 ** 400, 0],
+]
+
+
+def setup_module():
+    Logger.configure(level=LogLevel.ERROR)
+
+
+def move(direction, **extra):
+    data = {"x": 10, "y": 20, "direction": direction, "player_id": 1}
+    data.update(extra)
+    return json.dumps({"type": "move", "data": data})
+
+
+def shoot(direction, position):
+    return json.dumps({"type": "shoot", "data": {"direction": direction, "position": position}})
+
+
+@pytest.mark.parametrize("value", ([0, 0], [1, -1], (0.5, 0), [-1.0, 1]))
+def test_validate_vector_accepts_numbers(value):
+    assert Validation.validate_vector(value, limit=1) == tuple(value)
+
+
+@pytest.mark.parametrize("value", BAD_VECTORS + [[float("nan"), 0], [0, float("inf")], [0, -float("inf")]])
+def test_validate_vector_rejects_malformed(value):
+    assert Validation.validate_vector(value) is None
+
+
+def test_validate_vector_limit():
+    assert Validation.validate_vector([2, 0], limit=1) is None
+    assert Validation.validate_vector([2, 0]) == (2, 0)
+
+
+@pytest.mark.parametrize("direction", ([1, 0], [-1, -1], [0, 0], [0.0, 1.0]))
+def test_move_accepts_client_directions(direction):
+    protocol = Protocol()
+    x, y, parsed, player_id = protocol.deserialize_move(protocol.decode_message(move(direction)))
+    assert (x, y, parsed, player_id) == (10, 20, tuple(direction), 1)
+
+
+@pytest.mark.parametrize("direction", BAD_VECTORS + [[2, 0], [0, -5]])
+def test_move_rejects_malformed_direction(direction):
+    protocol = Protocol()
+    assert protocol.deserialize_move(protocol.decode_message(move(direction))) is None
+
+
+def test_move_rejects_non_finite_json():
+    protocol = Protocol()
+    # Python'un json'u NaN/Infinity kabul eder, orjson etmez; her ikisi de reddedilmeli
+    for raw in ('{"type": "move", "data": {"direction": [NaN, 0]}}',
+                '{"type": "move", "data": {"direction": [Infinity, 0]}}'):
+        message = protocol.decode_message(raw)
+        assert message is None or protocol.deserialize_move(message) is None
+
+
+@pytest.mark.parametrize("data", (None, [], "move", 5))
+def test_move_and_shoot_reject_non_dict_data(data):
+    protocol = Protocol()
+    assert protocol.deserialize_move(protocol.decode_message(json.dumps({"type": "move", "data": data}))) is None
+    assert protocol.deserialize_shoot(protocol.decode_message(json.dumps({"type": "shoot", "data": data}))) is None
+
+
+def test_shoot_accepts_direction_and_position():
+    protocol = Protocol()
+    parsed = protocol.deserialize_shoot(protocol.decode_message(shoot([0.6, -0.8], [100, 250.5])))
+    assert parsed == ((0.6, -0.8), (100, 250.5))
+
+
+@pytest.mark.parametrize("vector", BAD_VECTORS)
+def test_shoot_rejects_malformed_vectors(vector):
+    protocol = Protocol()
+    assert protocol.deserialize_shoot(protocol.decode_message(shoot(vector, [100, 200]))) is None
+    assert protocol.deserialize_shoot(protocol.decode_message(shoot([1, 0], vector))) is None
+
+
+@pytest.mark.parametrize("bad", (float("nan"), float("inf"), -float("inf")))
+def test_binary_frames_reject_non_finite(bad):
+    protocol = Protocol()
+    frame = protocol.binary.encode_move(0.0, 0.0, (bad, 0.0), 1)
+    assert protocol.deserialize_move(protocol.decode_message(frame)) is None
+    frame = protocol.binary.encode_shoot((1.0, 0.0), (bad, 200.0))
+    assert protocol.deserialize_shoot(protocol.decode_message(frame)) is None
+
+
+def test_binary_frames_round_trip():
+    protocol = Protocol()
+    frame = protocol.binary.encode_move(0.0, 0.0, (-1.0, 0.0), 7)
+    assert protocol.deserialize_move(protocol.decode_message(frame))[2:] == ((-1.0, 0.0), 7)
+    frame = protocol.binary.encode_shoot((0.5, -0.5), (64.0, 32.0))
+    assert protocol.deserialize_shoot(protocol.decode_message(frame)) == ((0.5, -0.5), (64.0, 32.0))
+    # Aralık dışı yön binary'de de reddedilir
+    frame = protocol.binary.encode_move(0.0, 0.0, (3.0, 0.0), 7)
+    assert protocol.deserialize_move(protocol.decode_message(frame)) is None
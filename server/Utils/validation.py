@@ -1,3 +1,7 @@
+import math
+from Utils.logger import Logger, LogType
+
+
 class Validation:
     @staticmethod
     def validate_platform_data(platform):
@@ -15,7 +19,7 @@ class Validation:
             required_fields = ["x", "y", "width", "height"]
             for field in required_fields:
                 if field not in platform:
-                    print(f"Missing required field: {field}")
+                    Logger.send_log(LogType.ERROR, "Missing required platform field", field=field)
                     return None
             
             # Numeric değerleri float'a çevir
@@ -28,7 +32,7 @@ class Validation:
             
             # Minimum boyut kontrolü
             if validated["width"] <= 0 or validated["height"] <= 0:
-                print(f"Invalid platform dimensions: {validated}")
+                Logger.send_log(LogType.ERROR, "Invalid platform dimensions", platform=validated)
                 return None
             
             # Optional fields
@@ -38,5 +42,34 @@ class Validation:
             return validated
             
         except (ValueError, TypeError) as e:
-            print(f"Platform validation error: {e}")
-            return None
\ No newline at end of file
+            Logger.send_log(LogType.ERROR, "Platform validation error", error=e)
+            return None
+
+    @staticmethod
+    def validate_vector(value, limit=None):
+        """
+        İstemciden gelen 2 boyutlu vektörü (MOVE/SHOOT direction, position) kontrol eder
+
+        Args:
+            value: Decoded JSON value or binary frame field.
+            limit (float): Largest absolute value allowed per component, None
+                for no bound.
+
+        Returns:
+            tuple: (x, y) as received, None unless value is a list or tuple of
+                exactly two finite int/float numbers (bool is not a number here).
+        """
+        if type(value) is not list and type(value) is not tuple or len(value) != 2:
+            return None
+        for component in value:
+            kind = type(component)
+            if kind is not int and kind is not float:
+                return None
+            try:
+                if not math.isfinite(component):
+                    return None
+            except OverflowError:
+                return None
+            if limit is not None and abs(component) > limit:
+                return None
+        return (value[0], value[1])